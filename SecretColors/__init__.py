@@ -4,7 +4,17 @@
 #  Author: Rohit Suratekar
 #  Website: https://github.com/secretBiology/SecretColors
 #
-#
-from SecretColors.models.palette import Palette
-from SecretColors.cmaps.parent import ColorMap
-from SecretColors.models.objects import ColorWheel
+#  Public classes are imported lazily (PEP 562) on their first use, so that
+#  `import SecretColors` does not load any color data.
+
+from SecretColors.helpers.lazy import lazy_attributes
+
+_LAZY = {
+    "Palette": "SecretColors.models.palette",
+    "ColorMap": "SecretColors.cmaps.parent",
+    "ColorWheel": "SecretColors.models.objects",
+}
+
+__all__ = list(_LAZY)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY)
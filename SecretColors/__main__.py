@@ -0,0 +1,44 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Command line interface
+#
+#  python -m SecretColors convert --from hex --to hsl < colors.txt
+
+import argparse
+import sys
+
+
+def _convert(argv: list) -> int:
+    # Bulk conversion needs NumPy; it is imported only for this command
+    try:
+        from SecretColors.helpers import bulk
+    except ImportError:
+        print("python -m SecretColors convert: error: this command requires "
+              "NumPy (pip install numpy)", file=sys.stderr)
+        return 2
+    parser = argparse.ArgumentParser(
+        prog="python -m SecretColors convert",
+        description="Bulk conversion of line-delimited, CSV or JSON-lines "
+                    "colors")
+    bulk.add_arguments(parser)
+    return bulk.run(parser.parse_args(argv))
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m SecretColors")
+    commands = parser.add_subparsers(dest="command", required=True)
+    # Arguments of the command are parsed by the command itself
+    commands.add_parser("convert", add_help=False,
+                        help="Convert colors from file or stdin")
+    args, rest = parser.parse_known_args(argv)
+    if args.command == "convert":
+        return _convert(rest)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
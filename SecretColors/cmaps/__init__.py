@@ -4,7 +4,16 @@
 #  Author: Rohit Suratekar
 #  Website: https://github.com/secretBiology/SecretColors
 #
+#  Colormap classes are imported lazily (PEP 562) on their first use
 
-from SecretColors.cmaps.brewer import BrewerMap
-from SecretColors.cmaps.tableau import TableauMap
-from SecretColors.cmaps.parent import ColorMap
+from SecretColors.helpers.lazy import lazy_attributes
+
+_LAZY = {
+    "BrewerMap": "SecretColors.cmaps.brewer",
+    "TableauMap": "SecretColors.cmaps.tableau",
+    "ColorMap": "SecretColors.cmaps.parent",
+}
+
+__all__ = list(_LAZY)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY)
@@ -6,9 +6,9 @@
 #
 #  CMap implementation for Brewer
 
-from SecretColors.data.cmaps.brewer import BREWER_DATA
 from SecretColors.data.constants import PALETTE_BREWER
 from SecretColors.cmaps.parent import ColorMapParent
+from SecretColors.data.cmaps import packed
 from SecretColors.models.palette import Palette
 from SecretColors.helpers.decorators import cmap_docs
 
@@ -93,14 +93,18 @@ class BrewerMap(ColorMapParent):
 
     """
 
-    def __init__(self, matplotlib):
+    def __init__(self, matplotlib=None):
         super().__init__(matplotlib)
         self.palette = Palette(PALETTE_BREWER)
         self.no_of_colors = 9
 
     @property
     def data(self):
-        return BREWER_DATA
+        return packed.source_data("brewer")
+
+    @property
+    def packed(self):
+        return packed.load("brewer")
 
     def greens(self, *, starting_shade: float = None,
                ending_shade: float = None,
@@ -0,0 +1,264 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Colormap implementation which does not need matplotlib. LUT and mapping
+#  behaviour mimics matplotlib's LinearSegmentedColormap.from_list and
+#  ListedColormap so that both give the same colors. Needs NumPy.
+
+NORM_LINEAR = "linear"
+NORM_LOG = "log"
+NORM_SYMLOG = "symlog"
+
+ALL_NORMS = [NORM_LINEAR, NORM_LOG, NORM_SYMLOG]
+
+DEFAULT_RESOLUTION = 256
+
+
+def _normalize(np, data, vmin, vmax, norm, linthresh, base=10):
+    data = np.asarray(data, dtype=np.float64)
+    norm = norm.strip().lower()
+    if norm not in ALL_NORMS:
+        raise ValueError(f"Unknown norm '{norm}'. Currently available "
+                         f"norms: {ALL_NORMS}")
+
+    if norm == NORM_LOG:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            data = np.where(data > 0, data, np.nan)
+    if vmin is None:
+        vmin = np.nanmin(data)
+    if vmax is None:
+        vmax = np.nanmax(data)
+    if vmin > vmax:
+        raise ValueError("vmin should be less than or equal to vmax")
+
+    if norm == NORM_LOG:
+        if vmin <= 0:
+            raise ValueError("vmin should be positive for 'log' norm")
+        transform = np.log10
+    elif norm == NORM_SYMLOG:
+        if linthresh <= 0:
+            raise ValueError("linthresh should be positive")
+        # Same as matplotlib.colors.SymLogNorm with linscale=1
+        scale = 1 / (1 - 1 / base)
+
+        def transform(x):
+            x = np.asarray(x, dtype=np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out = np.sign(x) * linthresh * (
+                        scale + np.log(np.abs(x) / linthresh) / np.log(base))
+            return np.where(np.abs(x) <= linthresh, x * scale, out)
+    else:
+        def transform(x):
+            return x
+
+    low, high = transform(vmin), transform(vmax)
+    if high == low:
+        return np.where(np.isnan(data), np.nan, 0.0)
+    return (transform(data) - low) / (high - low)
+
+
+def _interpolate(np, nodes, resolution):
+    # Same arithmetic as matplotlib.colors._create_lookup_table so that
+    # uint8 (truncated) LUTs match bit by bit
+    if resolution == 1:
+        return nodes[-1:].copy()
+    x = np.linspace(0, 1, len(nodes)) * (resolution - 1)
+    xind = (resolution - 1) * np.linspace(0, 1, resolution)
+    ind = np.searchsorted(x, xind)[1:-1]
+    distance = (xind[1:-1] - x[ind - 1]) / (x[ind] - x[ind - 1])
+    inner = distance[:, None] * (nodes[ind] - nodes[ind - 1]) + nodes[ind - 1]
+    table = np.concatenate([nodes[:1], inner, nodes[-1:]], axis=0)
+    return np.clip(table, 0, 1)
+
+
+class NativeColormap:
+    """
+    Matplotlib-free colormap. This is returned by all colormap classes
+    when they are created without matplotlib module (e.g. `BrewerMap()`).
+
+    .. code-block:: python
+
+        from SecretColors.cmaps import BrewerMap
+        cmap = BrewerMap().spectral()
+        cmap.lut(512)  # (512, 4) float32 lookup table
+        cmap.lut(dtype="uint8")  # (256, 4) uint8 lookup table
+        cmap.apply(data, vmin=0, vmax=10)  # NumPy array -> RGBA
+        cmap.apply(data, norm="log", bytes=True)  # uint8 RGBA
+        cmap.to_matplotlib(matplotlib)  # Usual matplotlib colormap
+
+    :class:`~SecretColors.cmaps.native.NativeColormap` requires NumPy.
+    """
+
+    def __init__(self, colors: list, is_qualitative: bool = False,
+                 name: str = "secret_color"):
+        """
+        :param colors: List of colors (hex strings or RGB/RGBA tuples)
+        :param is_qualitative: If True, behaves like ListedColormap
+        :param name: Name of the colormap
+        """
+        if len(colors) == 0:
+            raise ValueError("At least one color is required")
+        self.colors = list(colors)
+        self.is_qualitative = is_qualitative
+        self.name = name
+        self._luts = {}
+
+    def __repr__(self):
+        kind = "listed" if self.is_qualitative else "linear"
+        return f"NativeColormap({self.name}, {kind}, {len(self.colors)})"
+
+    def __len__(self):
+        return len(self.colors)
+
+    @property
+    def default_resolution(self) -> int:
+        if self.is_qualitative:
+            return len(self.colors)
+        return DEFAULT_RESOLUTION
+
+    def _nodes(self):
+        from SecretColors.models.array import ColorArray
+        return ColorArray(self.colors, dtype="float64").rgba
+
+    def lut(self, resolution: int = None, dtype: str = "float32"):
+        """
+        :param resolution: Number of entries in the LUT (default: 256 for
+            linear maps and number of colors for qualitative maps)
+        :param dtype: 'float32', 'float64' (values between 0-1) or 'uint8'
+            (values between 0-255)
+        :return: Read-only (resolution, 4) RGBA NumPy array
+        """
+        import numpy as np
+        resolution = resolution or self.default_resolution
+        if resolution < 1:
+            raise ValueError("LUT resolution should be at least 1")
+        dtype = np.dtype(dtype)
+        key = (resolution, dtype.str)
+        if key not in self._luts:
+            from SecretColors.helpers import diskcache
+            disk = diskcache.default_cache()
+            if disk is None:
+                table = self._create_lut(np, resolution, dtype)
+            else:
+                table = disk.get_or_create(
+                    "cmap.lut", (self.colors, self.is_qualitative) + key,
+                    lambda: self._create_lut(np, resolution, dtype))
+            table.flags.writeable = False
+            self._luts[key] = table
+        return self._luts[key]
+
+    def _create_lut(self, np, resolution, dtype):
+        nodes = self._nodes()
+        if self.is_qualitative:
+            # Same as ListedColormap(colors, N=resolution)
+            idx = np.arange(resolution) % len(nodes)
+            table = nodes[idx]
+        elif len(nodes) == 1:
+            table = np.repeat(nodes, resolution, axis=0)
+        else:
+            table = _interpolate(np, nodes, resolution)
+        if dtype == np.uint8:
+            # Truncation (not rounding) to match matplotlib
+            table = table * 255
+        return np.ascontiguousarray(table, dtype=dtype)
+
+    def __call__(self, values, bytes: bool = False,
+                 resolution: int = None):
+        """
+        Maps values between 0-1 to colors (same as matplotlib colormaps)
+
+        :param values: Scalar or array of values between 0-1
+        :param bytes: If True, uint8 colors will be returned
+        :param resolution: LUT resolution
+        :return: RGBA array
+        """
+        import numpy as np
+        return self._lookup(np, np.asarray(values, dtype=np.float64),
+                            bytes, resolution)
+
+    def _lookup(self, np, normalized, as_bytes, resolution):
+        table = self.lut(resolution, "uint8" if as_bytes else "float32")
+        n = table.shape[0]
+        bad = np.isnan(normalized)
+        with np.errstate(invalid="ignore"):
+            idx = np.clip(np.where(bad, 0, normalized) * n, -1, n)
+        idx = np.clip(idx.astype(np.intp), 0, n - 1)
+        out = table[idx]
+        if bad.any():
+            out[bad] = 0
+        return out
+
+    def apply(self, data, vmin: float = None, vmax: float = None,
+              norm: str = NORM_LINEAR, *, linthresh: float = 1,
+              bytes: bool = False, resolution: int = None):
+        """
+        Maps NumPy array of any shape directly to RGBA colors
+
+        :param data: Array of values
+        :param vmin: Value mapped to first color (default: minimum of data)
+        :param vmax: Value mapped to last color (default: maximum of data)
+        :param norm: 'linear', 'log' or 'symlog'
+        :param linthresh: Range (-linthresh, linthresh) which will be linear
+            in 'symlog' norm
+        :param bytes: If True, uint8 colors will be returned
+        :param resolution: LUT resolution (default: 256)
+        :return: Array of shape data.shape + (4,). NaN (and non-positive
+            values for 'log') will be transparent.
+        """
+        import numpy as np
+        normalized = _normalize(np, data, vmin, vmax, norm, linthresh)
+        return self._lookup(np, normalized, bytes, resolution)
+
+    def stream(self, source, vmin: float = None, vmax: float = None,
+               norm: str = NORM_LINEAR, **kwargs):
+        """
+        Same as :meth:`apply` but for data which does not fit in the memory.
+        See :func:`~SecretColors.helpers.chunked.stream_colors` for all
+        options.
+
+        :param source: Path to .npy file, NumPy array or iterable of arrays
+        :param vmin: Value mapped to first color (default: from pre-pass)
+        :param vmax: Value mapped to last color (default: from pre-pass)
+        :param norm: 'linear', 'log' or 'symlog'
+        :return: Generator of color chunks
+        """
+        from SecretColors.helpers.chunked import stream_colors
+        return stream_colors(self, source, vmin, vmax, norm, **kwargs)
+
+    def apply_to_file(self, source, destination, vmin: float = None,
+                      vmax: float = None, norm: str = NORM_LINEAR, **kwargs):
+        """
+        Writes colors of all values from source into memory mapped .npy
+        file chunk by chunk. See
+        :func:`~SecretColors.helpers.chunked.write_colors` for all options.
+
+        :param source: Path to .npy file or NumPy array
+        :param destination: Path of output .npy file or preallocated array
+        :param vmin: Value mapped to first color (default: from pre-pass)
+        :param vmax: Value mapped to last color (default: from pre-pass)
+        :param norm: 'linear', 'log' or 'symlog'
+        :return: Destination array
+        """
+        from SecretColors.helpers.chunked import write_colors
+        return write_colors(self, source, destination, vmin, vmax, norm,
+                            **kwargs)
+
+    def reversed(self) -> "NativeColormap":
+        """
+        :return: New colormap with reversed colors
+        """
+        return NativeColormap(list(reversed(self.colors)),
+                              self.is_qualitative, f"{self.name}_r")
+
+    def to_matplotlib(self, matplotlib):
+        """
+        :param matplotlib: matplotlib module
+        :return: `ListedColormap` or `LinearSegmentedColormap`
+        """
+        if self.is_qualitative:
+            return matplotlib.colors.ListedColormap(self.colors)
+        return matplotlib.colors.LinearSegmentedColormap.from_list(
+            self.name, self.colors)
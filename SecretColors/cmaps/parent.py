@@ -8,12 +8,41 @@
 
 import random
 
+from SecretColors import metrics
+from SecretColors.cmaps.native import NativeColormap
+from SecretColors.cmaps.resample import resample
+from SecretColors.data.cmaps.packed import CMAP_DIVERGENT
 from SecretColors.data.constants import DIV_COLOR_PAIRS
+from SecretColors.helpers.cache import LRUCache
 from SecretColors.helpers.logging import Log
 from SecretColors.models.palette import Palette
 from typing import List
 
 
+def _resample(store, kind: str, name: str, no_of_colors: int) -> list:
+    # Resampled colors are kept in the disk cache (if enabled) as RGB bytes
+    from SecretColors.helpers import diskcache
+    disk = diskcache.default_cache()
+    if disk is None:
+        return resample(store, name, no_of_colors)
+    from SecretColors.helpers import vectorized as vc
+    colors = None
+
+    def _create():
+        nonlocal colors
+        colors = resample(store, name, no_of_colors)
+        return vc.hex_to_rgba255(colors)[:, :3]
+
+    rgb = disk.get_or_create("cmap.resampled", (kind, name, no_of_colors),
+                             _create)
+    cached = vc.rgba255_to_hex(rgb)
+    # Hex strings which do not survive the round trip (e.g. upper case in
+    # the data) are returned as they were created
+    if colors is not None and cached != colors:
+        return colors
+    return cached
+
+
 class ColorMapParent:
     """
 
@@ -26,16 +55,29 @@ class ColorMapParent:
         general purpose use, you should use
         :class:`~SecretColors.cmaps.ColorMap` instead.
 
+    Colormaps are cached (shared between all instances) with the request
+    parameters as the key. Hence calling `BrewerMap(matplotlib).spectral()`
+    repeatedly returns the same colormap object. Do not modify returned
+    colormap in-place (e.g. `set_bad`); use its `copy()` instead. You can
+    inspect the cache with :func:`cache_info` and empty it with
+    :func:`clear_cache`.
+
     """
 
-    def __init__(self, matplotlib,
+    _cache = LRUCache(maxsize=256)
+    _resampled = LRUCache(maxsize=512)
+
+    def __init__(self, matplotlib=None,
                  palette: Palette = None,
                  log: Log = None,
                  seed=None):
         """
         Initializing of any ColorMap.
 
-        :param matplotlib: matplotlib object from matplotlib library
+        :param matplotlib: matplotlib object from matplotlib library. If
+            not provided, colormaps will be returned as
+            :class:`~SecretColors.cmaps.native.NativeColormap` which
+            do not need matplotlib (but need NumPy).
 
         :param palette: Palette from which you want colors
         :type palette: Palette
@@ -51,14 +93,51 @@ class ColorMapParent:
         self.log = log
         if palette is None:
             palette = Palette()
-            self.log.info(f"ColorMap will use '{palette.name}' palette")
+            self.log.info("ColorMap will use '%s' palette", palette.name)
         self._palette = palette
         self._seed = seed
         if seed is not None:
             random.seed(seed)
-            self.log.info(f"Random seed set for : {seed}")
+            self.log.info("Random seed set for : %s", seed)
         self.no_of_colors = 10
 
+    @classmethod
+    def clear_cache(cls):
+        """Removes all cached colormaps (and resampled colors) and resets
+        the cache statistics
+        """
+        ColorMapParent._cache.clear()
+        ColorMapParent._resampled.clear()
+
+    @classmethod
+    def cache_info(cls) -> dict:
+        """
+        :return: Hits, misses, evictions, current size and maximum size of
+            the colormap cache
+        :rtype: dict
+        """
+        return ColorMapParent._cache.stats()
+
+    @classmethod
+    def set_cache_size(cls, size: int):
+        """
+        :param size: Maximum number of colormaps to keep (0 disables cache)
+        """
+        ColorMapParent._cache.maxsize = size
+
+    def _cache_key(self, name, backup, no_of_colors, kwargs) -> tuple:
+        # Module name instead of id(), which can be reused after the object
+        # is garbage collected
+        backend = None
+        if self._mat is not None:
+            backend = getattr(self._mat, "__name__",
+                              type(self._mat).__qualname__)
+        return (type(self), name, backup, no_of_colors,
+                kwargs['starting_shade'], kwargs['ending_shade'],
+                bool(kwargs['is_qualitative']), bool(kwargs['is_reversed']),
+                type(self.palette), self.palette.name,
+                self.palette.color_mode, backend)
+
     @property
     def data(self) -> dict:
         """Returns all available ColorMap data. This is valid ONLY for
@@ -69,6 +148,14 @@ class ColorMapParent:
         """
         raise NotImplementedError
 
+    @property
+    def packed(self):
+        """Same data as :attr:`data` in the compact binary form (see
+        :class:`~SecretColors.data.cmaps.packed.PackedCmapData`). It will
+        return None for 'ColorMap' class.
+        """
+        return None
+
     @property
     def seed(self):
         return self._seed
@@ -82,7 +169,7 @@ class ColorMapParent:
         """
         self._seed = value
         random.seed(value)
-        self.log.info(f"Random seed set for : {value}")
+        self.log.info("Random seed set for : %s", value)
 
     @property
     def palette(self) -> Palette:
@@ -104,7 +191,7 @@ class ColorMapParent:
 
         """
         self._palette = palette
-        self.log.info(f"ColorMap is now using '{palette.name}' palette")
+        self.log.info("ColorMap is now using '%s' palette", palette.name)
 
     @property
     def get_all(self) -> list:
@@ -114,16 +201,18 @@ class ColorMapParent:
         :return: List of colormap names
         :rtype: List[str]
         """
-        if self.data is None:
+        if self.packed is None:
             return []
         else:
-            return list(self.data.keys())
+            return self.packed.names
 
     def _get_linear_segment(self, color_list: list):
         """
         :param color_list: List of colors
         :return: LinearSegmentedColormap
         """
+        if self._mat is None:
+            return NativeColormap(color_list)
         try:
             return self._mat.colors.LinearSegmentedColormap.from_list(
                 "secret_color", color_list)
@@ -135,6 +224,8 @@ class ColorMapParent:
         :param color_list: List of colors
         :return: ListedColormap
         """
+        if self._mat is None:
+            return NativeColormap(color_list, is_qualitative=True)
         try:
             return self._mat.colors.ListedColormap(color_list)
         except AttributeError:
@@ -150,6 +241,7 @@ class ColorMapParent:
         :return: Colormap which can be directly used with matplotlib
         """
 
+        metrics.incr("cmap.created")
         if is_reversed:
             color_list = [x for x in reversed(color_list)]
         if is_qualitative:
@@ -157,8 +249,48 @@ class ColorMapParent:
         else:
             return self._get_linear_segment(color_list)
 
+    def resample(self, name: str, no_of_colors: int) -> list:
+        """
+        Gets any number of colors from the special colormap, even if the
+        original data does not have that many colors.
+
+        .. code-block:: python
+
+            bm = BrewerMap()
+            bm.resample("Spectral", 11) # Same as original data
+            bm.resample("Spectral", 500) # Interpolated in OKLab space
+            bm.resample("Set1", 20) # Set1 colors with lightness steps
+
+        Non-qualitative maps are interpolated (in perceptual OKLab space)
+        from the densest available variant. Qualitative maps are never
+        interpolated; their colors are cycled with different lightness.
+        Results are cached for each (map, no_of_colors).
+
+        :param name: Name of the special colormap
+        :type name: str
+        :param no_of_colors: Number of colors (at least 2)
+        :type no_of_colors: int
+        :return: List of colors
+        :rtype: List[str]
+        """
+        if self.packed is None:
+            self.log.error("Resampling is only available for special "
+                           "colormaps (e.g. BrewerMap)", exception=ValueError)
+        if name not in self.packed:
+            self.log.error(f"'{name}' is not available in current "
+                           f"colormap. Following are allowed arguments "
+                           f"here: {self.get_all}", exception=KeyError)
+        if no_of_colors < 2:
+            self.log.error("Minimum of 2 colors are required for generating "
+                           "Colormap", exception=ValueError)
+        key = (type(self), name, no_of_colors)
+        colors = self._resampled.get_or_create(
+            key, lambda: _resample(self.packed, type(self).__name__, name,
+                                   no_of_colors))
+        return list(colors)
+
     def _get_colors(self, key: str, no_of_colors: int, backup: str,
-                    staring_shade, ending_shade):
+                    staring_shade, ending_shade, allow_resample=False):
 
         if no_of_colors < 2:
             self.log.error("Minimum of 2 colors are required for generating "
@@ -166,11 +298,16 @@ class ColorMapParent:
         colors = None
         # First check if for given combinations of parameters, colors are
         # available
-        if self.data is not None:
-            if key in self.data:
-                if str(no_of_colors) in self.data[key]:
-                    colors = self.data[key][str(no_of_colors)]
+        if self.packed is not None:
+            if key in self.packed:
+                if self.packed.has(key, no_of_colors):
+                    colors = self.packed.hex(key, no_of_colors)
                     self.log.info("Colormap for given combination found")
+                elif allow_resample and (staring_shade is None and
+                                         ending_shade is None):
+                    colors = self.resample(key, no_of_colors)
+                    self.log.info("Colormap resampled for given number of "
+                                  "colors")
 
         if colors is None:
             self.log.info("Colormap for given combination not found.")
@@ -198,7 +335,8 @@ class ColorMapParent:
 
         return colors
 
-    def get_colors(self, name: str, no_of_colors: int) -> list:
+    def get_colors(self, name: str, no_of_colors: int,
+                   as_array: bool = False) -> list:
         """
         This is easy way to get the available colors in current colormap
 
@@ -208,49 +346,41 @@ class ColorMapParent:
             cm.get_colors('Spectral', 9) # Returns 9 'Spectral' colors from BrewerMap colormap
 
 
-        .. warning::
+        .. note::
 
-            Be careful in using `no_of_colors` argument. It actually
-            points
-            to number of colors available in given colormap. For example,
-            'Tableau' map from :class:`~SecretColors.cmaps.TableauMap`
-            contains two list of colors, 10 and 20. So you need to enter
-            either 10 or 20. Any other number will raise ValueError. You can
-            check which all options are available by :attr:`get_all`
-            property. More about this can be read in documentation of
-            :func:`~SecretColors.cmaps.parent.ColorMapParent.get` function.
+            `no_of_colors` usually points to number of colors available in
+            given colormap. For example, 'Tableau' map from
+            :class:`~SecretColors.cmaps.TableauMap` contains two list of
+            colors, 10 and 20. Any other number will give resampled colors
+            (see :func:`~SecretColors.cmaps.parent.ColorMapParent.resample`).
 
         :param name: Name of the special colormap
         :type name: str
-        :param no_of_colors: Number of colors (see warning above)
+        :param no_of_colors: Number of colors (see note above)
         :type no_of_colors: int
+        :param as_array: If True, colors will be returned as
+            :class:`~SecretColors.models.array.ColorArray` (requires NumPy)
+        :type as_array: bool
         :return: List of colors
         :rtype: List[str]
 
-        :raises: ValueError (if used on
-            :class:`~SecretColors.cmaps.ColorMap` or wrong
-            `no_of_colors` provided)
+        :raises: KeyError (if colormap is not available) or ValueError (if
+            `no_of_colors` is less than 2)
         """
-        if self.data is not None:
-            if name not in self.data.keys():
-                self.log.error(f"'{name}' is not available in current "
-                               f"colormap. Following are allowed arguments "
-                               f"here: {self.get_all}")
-            if str(no_of_colors) not in self.data[name].keys():
-                n = list(self.data[name].keys())
-                if "type" in n:
-                    n.remove("type")
-                n = [int(x) for x in n]
-                self.log.error(f"Currently following number of colors are "
-                               f"allowed for {name}. : {n}")
-            if str(no_of_colors) in self.data[name]:
-                return self.data[name][str(no_of_colors)]
-            else:
-                raise KeyError(
-                    f"This palette did not have this key '{no_of_colors}'")
-        return []
-
-    def _default(self, name, backup, kwargs):
+        if self.packed is None:
+            colors = []
+        elif as_array and self.packed.has(name, no_of_colors):
+            # Directly from packed RGB bytes, without hex parsing
+            from SecretColors.models.array import ColorArray
+            return ColorArray(self.packed.rgb255(name, no_of_colors))
+        else:
+            colors = self.resample(name, no_of_colors)
+        if as_array:
+            from SecretColors.models.array import ColorArray
+            return ColorArray(colors)
+        return colors
+
+    def _default(self, name, backup, kwargs, allow_resample=False):
         if "self" in kwargs:
             del kwargs['self']
         if "starting_shade" not in kwargs:
@@ -261,32 +391,39 @@ class ColorMapParent:
         no_of_colors = kwargs['no_of_colors'] or self.no_of_colors
         bak_name = backup or name
 
-        colors = self._get_colors(key=name,
-                                  no_of_colors=no_of_colors,
-                                  backup=bak_name,
-                                  staring_shade=kwargs['starting_shade'],
-                                  ending_shade=kwargs['ending_shade'])
+        def _create():
+            with metrics.timer("cmap.create_seconds"):
+                return _build()
+
+        def _build():
+            colors = self._get_colors(key=name,
+                                      no_of_colors=no_of_colors,
+                                      backup=bak_name,
+                                      staring_shade=kwargs['starting_shade'],
+                                      ending_shade=kwargs['ending_shade'],
+                                      allow_resample=allow_resample)
 
-        return self._derive_map(colors,
-                                is_qualitative=kwargs['is_qualitative'],
-                                is_reversed=kwargs['is_reversed'])
+            return self._derive_map(colors,
+                                    is_qualitative=kwargs['is_qualitative'],
+                                    is_reversed=kwargs['is_reversed'])
+
+        key = self._cache_key(name, bak_name, no_of_colors, kwargs)
+        return self._cache.get_or_create(key, _create)
 
     def _special_maps(self, name, backup, kwargs):
-        if name not in self.data.keys():
+        if name not in self.packed:
             self.log.error(f"There is no '{name}' colormap in our "
                            f"database. Following special colormaps are"
                            f" available in current class :"
-                           f" {list(self.data.keys())}")
+                           f" {self.packed.names}")
         no_of_colors = kwargs['no_of_colors'] or self.no_of_colors
-        cols = list(self.data[name].keys())
-        if 'type' in cols:
-            cols.remove('type')
-        cols = [int(x) for x in cols]
-        if no_of_colors not in cols:
+        if no_of_colors < 2:
             self.log.error(f"Sorry, for {name} colormap, 'no_of_colors' "
-                           f"argument can "
-                           f"only take these values: {cols}.")
-        return self._default(name, backup, kwargs)
+                           f"should be at least 2. Following number of "
+                           f"colors are available without resampling:"
+                           f" {list(self.packed.sizes(name))}.",
+                           exception=ValueError)
+        return self._default(name, backup, kwargs, allow_resample=True)
 
     def from_list(self, color_list: list, is_qualitative: bool = False,
                   is_reversed=False):
@@ -322,6 +459,9 @@ class ColorMapParent:
 
         >>> YourMap().get('map_name',no_of_colors=10) # Returns [c1, c2 ...c10]
 
+        If `no_of_colors` is not available in the data, colors are resampled
+        with :func:`~SecretColors.cmaps.parent.ColorMapParent.resample`.
+
         You can check which all colormaps are
         available by :attr:`~SecretColors.cmaps.parent.ColorMapParent.get_all` property
 
@@ -343,7 +483,7 @@ class ColorMapParent:
         :return: Colormap object
         :rtype: :class:`matplotlib.colors.ListedColormap` or :class:`matplotlib.colors.LinearSegmentedColormap`
         """
-        if self.data is None:
+        if self.packed is None:
             self.log.error(f"This method can only be used with special "
                            f"colormap. If you are using 'ColorMap' class "
                            f"directly. You can only use standard maps. or "
@@ -394,18 +534,17 @@ class ColorMapParent:
 
     def random_divergent(self, is_qualitative=False, is_reversed=False):
         names = []
-        if self.data is not None:
-            for k in self.data:
-                if self.data[k]["type"] == "div":
+        if self.packed is not None:
+            for k in self.packed.names:
+                if self.packed.type_id(k) == CMAP_DIVERGENT:
                     names.append(k)
 
         if len(names) > 0:
             random.shuffle(names)
-            keys = list(self.data[names[0]].keys())
-            keys.remove("type")
+            keys = list(self.packed.sizes(names[0]))
             random.shuffle(keys)
             kwargs = locals()
-            kwargs["no_of_colors"] = int(keys[0])
+            kwargs["no_of_colors"] = keys[0]
             return self._special_maps(names[0], None, kwargs)
         else:
             names = [x for x in DIV_COLOR_PAIRS]
@@ -513,6 +652,10 @@ class ColorMap(ColorMapParent):
         return None
 
 
+metrics.register_cache("cmap.cache", ColorMapParent._cache.stats)
+metrics.register_cache("cmap.resampled", ColorMapParent._resampled.stats)
+
+
 def run():
     from SecretColors.data.cmaps.brewer import BREWER_DATA
 
@@ -0,0 +1,118 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Resampling of predefined colormap data (Brewer, Tableau, colorblind) to
+#  any number of colors. Works on the packed data store. Pure python, does
+#  not need NumPy.
+
+import math
+
+from SecretColors.utils import hex_to_rgb, oklab_to_rgb, rgb_to_hex, \
+    rgb_to_oklab
+
+# Types of colormap data which hold unrelated (categorical) colors
+QUALITATIVE_TYPES = ["qual", "regular"]
+
+# Maximum lightness (OKLab) change between extended rounds of qualitative
+# colors and maximum total change
+_LIGHTNESS_STEP = 0.12
+_LIGHTNESS_RANGE = 0.3
+
+
+def is_qualitative(kind: str) -> bool:
+    """
+    :param kind: Type of the colormap ('seq', 'div', 'qual' ...)
+    :return: True if colors are categorical (should not be interpolated)
+    """
+    return kind in QUALITATIVE_TYPES
+
+
+def interpolate(colors: list, no_of_colors: int) -> list:
+    """
+    Evenly resamples colors in OKLab (perceptual) space. First and last
+    colors are kept as they are.
+
+    :param colors: List of hex colors (at least 2)
+    :param no_of_colors: Number of colors needed
+    :return: List of hex colors
+    """
+    if no_of_colors == 1 or len(colors) == 1:
+        return [colors[0]] * no_of_colors
+    nodes = [rgb_to_oklab(*hex_to_rgb(x)) for x in colors]
+    last = len(nodes) - 1
+    output = []
+    for i in range(no_of_colors):
+        position = i * last / (no_of_colors - 1)
+        k = min(int(position), last - 1)
+        t = position - k
+        lab = [p + (q - p) * t for p, q in zip(nodes[k], nodes[k + 1])]
+        output.append(rgb_to_hex(*oklab_to_rgb(*lab)))
+    return output
+
+
+def _lightness_offset(k: int, rounds: int) -> float:
+    # Round 0 is the original colors, then alternately darker and lighter
+    # with increasing steps: 0, -d, +d, -2d, +2d ...
+    if k == 0:
+        return 0
+    delta = min(_LIGHTNESS_STEP,
+                _LIGHTNESS_RANGE / math.ceil((rounds - 1) / 2))
+    offset = math.ceil(k / 2) * delta
+    return -offset if k % 2 == 1 else offset
+
+
+def extend(colors: list, no_of_colors: int) -> list:
+    """
+    Cycles through qualitative colors. Every new cycle gets different
+    lightness so that colors stay distinguishable.
+
+    :param colors: List of hex colors
+    :param no_of_colors: Number of colors needed
+    :return: List of hex colors
+    """
+    size = len(colors)
+    rounds = math.ceil(no_of_colors / size)
+    nodes = [rgb_to_oklab(*hex_to_rgb(x)) for x in colors]
+    output = []
+    for i in range(no_of_colors):
+        k, index = divmod(i, size)
+        if k == 0:
+            output.append(colors[index])
+            continue
+        l, a, b = nodes[index]
+        l = min(1, max(0, l + _lightness_offset(k, rounds)))
+        output.append(rgb_to_hex(*oklab_to_rgb(l, a, b)))
+    return output
+
+
+def resample(store, name: str, no_of_colors: int) -> list:
+    """
+    Gets any number of colors from colormap data.
+
+    * If data for `no_of_colors` is already present, it is returned as it is
+    * Qualitative maps: first colors from the smallest variant which has
+      enough colors. If no variant is large enough, colors of the largest
+      variant are cycled with lightness steps.
+    * Other maps: largest (densest) variant is interpolated in OKLab space
+
+    :param store: :class:`~SecretColors.data.cmaps.packed.PackedCmapData`
+    :param name: Name of the colormap
+    :param no_of_colors: Number of colors needed
+    :return: List of hex colors
+    """
+    if no_of_colors < 1:
+        raise ValueError("Number of colors should be at least 1")
+    if store.has(name, no_of_colors):
+        return store.hex(name, no_of_colors)
+    sizes = store.sizes(name)
+    if len(sizes) == 0:
+        raise ValueError("Colormap data does not have any colors")
+    if is_qualitative(store.type(name)):
+        for size in sizes:
+            if size >= no_of_colors:
+                return store.hex(name, size)[:no_of_colors]
+        return extend(store.hex(name, sizes[-1]), no_of_colors)
+    return interpolate(store.hex(name, sizes[-1]), no_of_colors)
@@ -8,7 +8,7 @@
 
 
 from SecretColors.cmaps.parent import ColorMapParent
-from SecretColors.data.cmaps.tableau import TABLEAU_DATA
+from SecretColors.data.cmaps import packed
 from SecretColors.data.constants import PALETTE_TABLEAU
 from SecretColors.helpers.decorators import cmap_docs
 from SecretColors.models.palette import Palette
@@ -100,13 +100,17 @@ class TableauMap(ColorMapParent):
 
     """
 
-    def __init__(self, matplotlib):
+    def __init__(self, matplotlib=None):
         super().__init__(matplotlib)
         self.palette = Palette(PALETTE_TABLEAU)
 
     @property
     def data(self):
-        return TABLEAU_DATA
+        return packed.source_data("tableau")
+
+    @property
+    def packed(self):
+        return packed.load("tableau")
 
         # Other special maps
 
@@ -5,4 +5,16 @@
 #  Website: https://github.com/secretBiology/SecretColors
 #
 #
+#  Colormap data are imported lazily (PEP 562) on their first use
 
+from SecretColors.helpers.lazy import lazy_attributes
+
+_LAZY = {
+    "BREWER_DATA": "SecretColors.data.cmaps.brewer",
+    "TABLEAU_DATA": "SecretColors.data.cmaps.tableau",
+    "CB_DATA": "SecretColors.data.cmaps.colorblind",
+}
+
+__all__ = list(_LAZY)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY)
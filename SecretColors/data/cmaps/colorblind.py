@@ -58,7 +58,7 @@ CB_DATA = {
     },
     "tol_bu_rd": {
         "9": ["#2166ac", "#4393c3", "#92c5de", "#d1e5f0", "#f7f7f7",
-              "#fddbc7", "#f4a582", "#d6604d", "#b2118sb"],
+              "#fddbc7", "#f4a582", "#d6604d", "#b2182b"],
         "type": "div"
     },
     "tol_pr_gn": {
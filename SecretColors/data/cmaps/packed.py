@@ -0,0 +1,343 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Compact binary store for the colormap data (BREWER_DATA, TABLEAU_DATA
+#  and CB_DATA). Colors are stored as one uint8 RGB blob with an index of
+#  (map, number of colors) -> offset, so lookups use integer keys and do not
+#  need any hex parsing.
+#
+#  The binary files (*.bin next to this module) are generated from the
+#  python data modules with
+#
+#       python -m SecretColors.data.cmaps.packed
+#
+#  and shipped with the package (instead of compiling them during the
+#  installation). Each file stores the content hash of its python data
+#  module. If a file is missing, has an older format or does not match the
+#  python data (e.g. data edited without re-running the command above), the
+#  store is built in the memory from the python data instead (with a
+#  warning for the stale file). If the python source is not available (e.g.
+#  installations with only .pyc files), the packed file is trusted.
+#
+#  File layout (little-endian):
+#       header  : magic (4s), version (H), maps (H), entries (I),
+#                 names length (I), colors length (I), source hash (16s)
+#       maps    : name offset (I), name length (H), type (B), pad (x),
+#                 first entry (I), number of entries (H)   x maps
+#       entries : number of colors (H), pad (xx), offset in colors (I)
+#                 x entries (sorted by number of colors within the map)
+#       names   : utf-8 names of all maps
+#       colors  : RGB bytes
+
+import hashlib
+import importlib
+import mmap
+import os
+import struct
+
+from SecretColors.helpers.logging import Log
+
+MAGIC = b"SCCM"
+FORMAT_VERSION = 2
+
+CMAP_SEQUENTIAL = 0
+CMAP_DIVERGENT = 1
+CMAP_QUALITATIVE = 2
+CMAP_REGULAR = 3
+
+# Enum value -> 'type' used in the python data
+CMAP_TYPES = {CMAP_SEQUENTIAL: "seq", CMAP_DIVERGENT: "div",
+              CMAP_QUALITATIVE: "qual", CMAP_REGULAR: "regular"}
+_TYPE_IDS = {v: k for k, v in CMAP_TYPES.items()}
+
+# Dataset name -> (module, variable)
+DATASETS = {
+    "brewer": ("SecretColors.data.cmaps.brewer", "BREWER_DATA"),
+    "tableau": ("SecretColors.data.cmaps.tableau", "TABLEAU_DATA"),
+    "colorblind": ("SecretColors.data.cmaps.colorblind", "CB_DATA"),
+}
+
+_HEADER = struct.Struct("<4sHHIII16s")
+_MAP = struct.Struct("<IHBxIH")
+_ENTRY = struct.Struct("<HxxI")
+
+_loaded = {}
+
+
+def compile_data(data: dict, digest: bytes = bytes(16)) -> bytes:
+    """
+    :param data: Colormap data in the python format, i.e.
+        {name: {'3': [hex colors], ..., 'type': 'seq'}}
+    :param digest: Content hash of the source (see :func:`source_digest`)
+    :return: Binary representation of the data
+    """
+    maps, entries = [], []
+    names, colors = bytearray(), bytearray()
+    for name, value in data.items():
+        encoded = name.encode("utf-8")
+        sizes = sorted(int(x) for x in value if x != "type")
+        maps.append(_MAP.pack(len(names), len(encoded),
+                              _TYPE_IDS[value["type"]], len(entries),
+                              len(sizes)))
+        names.extend(encoded)
+        for size in sizes:
+            hex_colors = value[str(size)]
+            if len(hex_colors) != size:
+                raise ValueError(f"'{name}' has {len(hex_colors)} colors "
+                                 f"under key '{size}'")
+            entries.append(_ENTRY.pack(size, len(colors) // 3))
+            for h in hex_colors:
+                colors.extend(bytes.fromhex(h.lstrip("#")))
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(maps), len(entries),
+                          len(names), len(colors), digest)
+    return b"".join([header, *maps, *entries, bytes(names), bytes(colors)])
+
+
+class PackedCmapData:
+    """
+    Read-only view over the packed colormap data. All numbers of colors are
+    integers and colors are available as raw RGB bytes, NumPy arrays or hex
+    strings.
+
+    >>> store = load("brewer")
+    >>> store.sizes("Spectral")  # (3, 4, 5, ..., 11)
+    >>> store.type("Spectral")  # 'div'
+    >>> store.rgb255("Spectral", 5)  # (5, 3) uint8 array (no copy)
+    >>> store.hex("Spectral", 5)  # ['#d7191c', ...]
+    """
+
+    def __init__(self, buffer):
+        """
+        :param buffer: bytes, mmap or any object supporting buffer protocol
+        """
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < 6:
+            raise ValueError("Not a packed colormap data")
+        magic, version = struct.unpack_from("<4sH", view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a packed colormap data")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported packed data version '{version}'")
+        _, _, n_maps, n_entries, n_names, n_colors, self.digest = \
+            _HEADER.unpack_from(view, 0)
+
+        entry_start = _HEADER.size + n_maps * _MAP.size
+        name_start = entry_start + n_entries * _ENTRY.size
+        color_start = name_start + n_names
+        entries = [_ENTRY.unpack_from(view, entry_start + i * _ENTRY.size)
+                   for i in range(n_entries)]
+        self._colors = view[color_start:color_start + n_colors]
+        self._maps = {}
+        for i in range(n_maps):
+            offset, length, kind, first, count = _MAP.unpack_from(
+                view, _HEADER.size + i * _MAP.size)
+            name = bytes(view[name_start + offset:
+                              name_start + offset + length]).decode("utf-8")
+            index = {size: start * 3 for size, start in
+                     entries[first:first + count]}
+            self._maps[name] = (kind, index)
+
+    def __len__(self):
+        return len(self._maps)
+
+    def __contains__(self, name):
+        return name in self._maps
+
+    def __repr__(self):
+        return f"PackedCmapData( maps : {len(self)} )"
+
+    @property
+    def names(self) -> list:
+        return list(self._maps)
+
+    def _entry(self, name: str):
+        try:
+            return self._maps[name]
+        except KeyError:
+            raise KeyError(f"'{name}' is not available. Following are "
+                           f"available: {self.names}") from None
+
+    def type_id(self, name: str) -> int:
+        """
+        :param name: Name of the colormap
+        :return: One of CMAP_SEQUENTIAL, CMAP_DIVERGENT, CMAP_QUALITATIVE or
+            CMAP_REGULAR
+        """
+        return self._entry(name)[0]
+
+    def type(self, name: str) -> str:
+        """
+        :param name: Name of the colormap
+        :return: Type as used in the python data ('seq', 'div', ...)
+        """
+        return CMAP_TYPES[self.type_id(name)]
+
+    def sizes(self, name: str) -> tuple:
+        """
+        :param name: Name of the colormap
+        :return: Sorted available number of colors
+        """
+        return tuple(self._entry(name)[1])
+
+    def has(self, name: str, no_of_colors: int) -> bool:
+        return name in self._maps and no_of_colors in self._maps[name][1]
+
+    def raw(self, name: str, no_of_colors: int) -> memoryview:
+        """
+        :param name: Name of the colormap
+        :param no_of_colors: Number of colors
+        :return: RGB bytes (3 bytes per color) without copying
+        """
+        index = self._entry(name)[1]
+        if no_of_colors not in index:
+            raise KeyError(f"'{name}' does not have {no_of_colors} colors. "
+                           f"Available: {list(index)}")
+        start = index[no_of_colors]
+        return self._colors[start:start + no_of_colors * 3]
+
+    def rgb255(self, name: str, no_of_colors: int):
+        """
+        :param name: Name of the colormap
+        :param no_of_colors: Number of colors
+        :return: Read-only (N, 3) uint8 NumPy array (requires NumPy)
+        """
+        import numpy as np
+        return np.frombuffer(self.raw(name, no_of_colors),
+                             dtype=np.uint8).reshape(-1, 3)
+
+    def hex(self, name: str, no_of_colors: int) -> list:
+        """
+        :param name: Name of the colormap
+        :param no_of_colors: Number of colors
+        :return: List of hex colors
+        """
+        raw = self.raw(name, no_of_colors).hex()
+        return ["#" + raw[i:i + 6] for i in range(0, len(raw), 6)]
+
+    def to_dict(self) -> dict:
+        """
+        :return: Data in the original python format
+        """
+        output = {}
+        for name, (kind, index) in self._maps.items():
+            value = {str(size): self.hex(name, size) for size in index}
+            value["type"] = CMAP_TYPES[kind]
+            output[name] = value
+        return output
+
+
+def data_path(dataset: str) -> str:
+    """
+    :param dataset: Name of the dataset (brewer, tableau or colorblind)
+    :return: Path of the compiled binary file
+    """
+    return os.path.join(os.path.dirname(__file__), f"{dataset}.bin")
+
+
+def _check_dataset(dataset: str):
+    if dataset not in DATASETS:
+        raise KeyError(f"Unknown dataset '{dataset}'. Following are "
+                       f"available: {list(DATASETS)}")
+
+
+def source_data(dataset: str) -> dict:
+    """
+    :param dataset: Name of the dataset
+    :return: Original python data of the dataset
+    """
+    _check_dataset(dataset)
+    module, variable = DATASETS[dataset]
+    return getattr(importlib.import_module(module), variable)
+
+
+def source_path(dataset: str) -> str:
+    """
+    :param dataset: Name of the dataset
+    :return: Path of the python data module of the dataset
+    """
+    _check_dataset(dataset)
+    module = DATASETS[dataset][0].rsplit(".", 1)[-1]
+    return os.path.join(os.path.dirname(__file__), f"{module}.py")
+
+
+def source_digest(dataset: str) -> bytes:
+    """
+    :param dataset: Name of the dataset
+    :return: Content hash (16 bytes) of the python data module or None if
+        the source file is not available. Line endings are normalized, so
+        that checkouts with CRLF give the same hash
+    """
+    try:
+        with open(source_path(dataset), "rb") as f:
+            content = f.read().replace(b"\r\n", b"\n")
+    except OSError:
+        return None
+    return hashlib.sha256(content).digest()[:16]
+
+
+def compile_dataset(dataset: str) -> bytes:
+    """
+    :param dataset: Name of the dataset
+    :return: Binary representation of the dataset (with its source hash)
+    """
+    return compile_data(source_data(dataset), source_digest(dataset))
+
+
+def _open(dataset: str) -> PackedCmapData:
+    path = data_path(dataset)
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        store = PackedCmapData(buffer)
+    except (OSError, ValueError, struct.error):
+        # Missing, empty or older format
+        return PackedCmapData(compile_data(source_data(dataset)))
+    digest = source_digest(dataset)
+    if digest is not None and store.digest != digest:
+        Log(show_log=True).warn(
+            "'%s' does not match the python data in '%s'. Rebuild it with "
+            "'python -m SecretColors.data.cmaps.packed'", path,
+            source_path(dataset))
+        return PackedCmapData(compile_data(source_data(dataset), digest))
+    return store
+
+
+def load(dataset: str) -> PackedCmapData:
+    """
+    Loads (once per process) the packed data of given dataset.
+
+    :param dataset: Name of the dataset (brewer, tableau or colorblind)
+    :return: :class:`PackedCmapData`
+    """
+    if dataset not in _loaded:
+        _check_dataset(dataset)
+        _loaded[dataset] = _open(dataset)
+    return _loaded[dataset]
+
+
+def build(folder: str = None) -> list:
+    """
+    Compiles all datasets into binary files
+
+    :param folder: Output folder (default: next to this module)
+    :return: List of written files
+    """
+    written = []
+    for dataset in DATASETS:
+        path = data_path(dataset)
+        if folder is not None:
+            path = os.path.join(folder, os.path.basename(path))
+        with open(path, "wb") as f:
+            f.write(compile_dataset(dataset))
+        written.append(path)
+    return written
+
+
+if __name__ == "__main__":
+    for p in build():
+        print(f"Written {p}")
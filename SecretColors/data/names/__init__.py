@@ -5,4 +5,15 @@
 #  Website: https://github.com/secretBiology/SecretColors
 #
 #
+#  Name tables are imported lazily (PEP 562) on their first use
 
+from SecretColors.helpers.lazy import lazy_attributes
+
+_LAZY = {
+    "W3_DATA": "SecretColors.data.names.w3",
+    "X11_DATA": "SecretColors.data.names.x11",
+}
+
+__all__ = list(_LAZY)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY)
@@ -8,9 +8,21 @@
 #  examples of such design systems can be found on following URL
 #  https://designsystemsrepo.com/design-systems
 
-from SecretColors.data.palettes.parent import ParentPalette
-from SecretColors.data.palettes.ibm import IBMPalette
-from SecretColors.data.palettes.material import MaterialPalette, MaterialAccentPalette
-from SecretColors.data.palettes.clarity import ClarityPalette
-from SecretColors.data.palettes.brewer import ColorBrewer
-from SecretColors.data.palettes.tableau import TableauPalette
+#
+#  Palette classes are imported lazily (PEP 562) on their first use
+
+from SecretColors.helpers.lazy import lazy_attributes
+
+_LAZY = {
+    "ParentPalette": "SecretColors.data.palettes.parent",
+    "IBMPalette": "SecretColors.data.palettes.ibm",
+    "MaterialPalette": "SecretColors.data.palettes.material",
+    "MaterialAccentPalette": "SecretColors.data.palettes.material",
+    "ClarityPalette": "SecretColors.data.palettes.clarity",
+    "ColorBrewer": "SecretColors.data.palettes.brewer",
+    "TableauPalette": "SecretColors.data.palettes.tableau",
+}
+
+__all__ = list(_LAZY)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY)
@@ -168,3 +168,26 @@ RX_DATA = {
                                    'b': [0.0349342, -0.096893, 1.2884099]}}}
 
 }
+
+# Companding (transfer curve) of each RGB space from the same source.
+# Numbers are simple gamma, 'srgb' is the sRGB curve and 'l_star' is the
+# CIE L* curve. First white reference of each space in RX_DATA is its native
+# white.
+RX_COMPANDING = {
+    "adobe": 2.2,
+    "apple": 1.8,
+    "best": 2.2,
+    "beta": 2.2,
+    "bruce": 2.2,
+    "cie": 2.2,
+    "color_match": 1.8,
+    "don4": 2.2,
+    "eci": "l_star",
+    "ekta_space_ps5": 2.2,
+    "ntsc": 2.2,
+    "pal_secam": 2.2,
+    "pro_photo": 1.8,
+    "smptec": 2.2,
+    "srgb": "srgb",
+    "wide_gamut": 2.2,
+}
@@ -0,0 +1,381 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Color difference (Delta E) between CIELAB colors: CIE76, CIE94 (graphic
+#  arts) and CIEDE2000.
+#
+#  Single Lab tuples are handled in pure Python. NumPy arrays with Lab on
+#  the last axis are handled in a vectorized pass (with broadcasting).
+#  Pairwise functions work on blocks of rows and columns so that the full
+#  N x M matrix is never created unless you ask for it.
+#
+#  CIEDE2000 formula and test data: Sharma, Wu and Dalal (2005)
+#  http://www2.ece.rochester.edu/~gsharma/ciede2000/
+
+import math
+
+from SecretColors.utils import hex_to_rgb, rgb_to_lab
+
+METRIC_CIE76 = "cie76"
+METRIC_CIE94 = "cie94"
+METRIC_CIEDE2000 = "ciede2000"
+
+ALL_METRICS = [METRIC_CIE76, METRIC_CIE94, METRIC_CIEDE2000]
+
+DEFAULT_BLOCK_SIZE = 512
+
+
+def _is_array(value) -> bool:
+    return hasattr(value, "__array_interface__")
+
+
+def _check_metric(metric: str) -> str:
+    metric = metric.strip().lower()
+    if metric not in ALL_METRICS:
+        raise ValueError(f"Unknown Delta E metric '{metric}'. Currently "
+                         f"available metrics: {ALL_METRICS}")
+    return metric
+
+
+# ---------------------------------------------------------------- scalar
+
+def _cie76(lab1, lab2) -> float:
+    return math.sqrt(sum((x - y) ** 2 for x, y in zip(lab1, lab2)))
+
+
+def _cie94(lab1, lab2) -> float:
+    l1, a1, b1 = lab1
+    l2, a2, b2 = lab2
+    c1 = math.hypot(a1, b1)
+    c2 = math.hypot(a2, b2)
+    dl, dc = l1 - l2, c1 - c2
+    dh2 = max(0.0, (a1 - a2) ** 2 + (b1 - b2) ** 2 - dc ** 2)
+    sc = 1 + 0.045 * c1
+    sh = 1 + 0.015 * c1
+    return math.sqrt(dl ** 2 + (dc / sc) ** 2 + dh2 / sh ** 2)
+
+
+def _ciede2000(lab1, lab2) -> float:
+    l1, a1, b1 = lab1
+    l2, a2, b2 = lab2
+    c_mean = (math.hypot(a1, b1) + math.hypot(a2, b2)) / 2
+    g = 0.5 * (1 - math.sqrt(c_mean ** 7 / (c_mean ** 7 + 25 ** 7)))
+    a1, a2 = a1 * (1 + g), a2 * (1 + g)
+    c1, c2 = math.hypot(a1, b1), math.hypot(a2, b2)
+    h1 = math.degrees(math.atan2(b1, a1)) % 360 if c1 else 0
+    h2 = math.degrees(math.atan2(b2, a2)) % 360 if c2 else 0
+
+    dl = l2 - l1
+    dc = c2 - c1
+    # Exactly opposite hues: |h2 - h1| is 180 (Sharma et al.), no matter how
+    # atan2 rounds the hue angles
+    opposite = a1 * b2 == b1 * a2 and a1 * a2 + b1 * b2 < 0
+    if c1 * c2 == 0:
+        dh = 0
+    elif opposite:
+        dh = 180 if h2 > h1 else -180
+    elif abs(h2 - h1) <= 180:
+        dh = h2 - h1
+    elif h2 - h1 > 180:
+        dh = h2 - h1 - 360
+    else:
+        dh = h2 - h1 + 360
+    dh = 2 * math.sqrt(c1 * c2) * math.sin(math.radians(dh / 2))
+
+    l_mean = (l1 + l2) / 2
+    c_mean = (c1 + c2) / 2
+    if c1 * c2 == 0:
+        h_mean = h1 + h2
+    elif opposite or abs(h1 - h2) <= 180:
+        h_mean = (h1 + h2) / 2
+    elif h1 + h2 < 360:
+        h_mean = (h1 + h2 + 360) / 2
+    else:
+        h_mean = (h1 + h2 - 360) / 2
+
+    t = (1 - 0.17 * math.cos(math.radians(h_mean - 30))
+         + 0.24 * math.cos(math.radians(2 * h_mean))
+         + 0.32 * math.cos(math.radians(3 * h_mean + 6))
+         - 0.20 * math.cos(math.radians(4 * h_mean - 63)))
+    d_theta = 30 * math.exp(-((h_mean - 275) / 25) ** 2)
+    rc = 2 * math.sqrt(c_mean ** 7 / (c_mean ** 7 + 25 ** 7))
+    sl = 1 + 0.015 * (l_mean - 50) ** 2 / math.sqrt(20 + (l_mean - 50) ** 2)
+    sc = 1 + 0.045 * c_mean
+    sh = 1 + 0.015 * c_mean * t
+    rt = -math.sin(math.radians(2 * d_theta)) * rc
+    return math.sqrt((dl / sl) ** 2 + (dc / sc) ** 2 + (dh / sh) ** 2
+                     + rt * (dc / sc) * (dh / sh))
+
+
+# ---------------------------------------------------------------- arrays
+
+def _split(np, lab):
+    lab = np.asarray(lab, dtype=np.float64)
+    return lab[..., 0], lab[..., 1], lab[..., 2]
+
+
+def _cie76_array(np, lab1, lab2):
+    l1, a1, b1 = _split(np, lab1)
+    l2, a2, b2 = _split(np, lab2)
+    return np.sqrt((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2)
+
+
+def _cie94_array(np, lab1, lab2):
+    l1, a1, b1 = _split(np, lab1)
+    l2, a2, b2 = _split(np, lab2)
+    c1 = np.hypot(a1, b1)
+    dc = c1 - np.hypot(a2, b2)
+    dh2 = np.maximum(0, (a1 - a2) ** 2 + (b1 - b2) ** 2 - dc ** 2)
+    return np.sqrt((l1 - l2) ** 2 + (dc / (1 + 0.045 * c1)) ** 2
+                   + dh2 / (1 + 0.015 * c1) ** 2)
+
+
+def _ciede2000_array(np, lab1, lab2):
+    # Same formula and same hue conventions as _ciede2000 (branches are
+    # replaced by np.where)
+    l1, a1, b1 = _split(np, lab1)
+    l2, a2, b2 = _split(np, lab2)
+    c_mean = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2
+    c7 = c_mean ** 7
+    g = 0.5 * (1 - np.sqrt(c7 / (c7 + 25 ** 7)))
+    a1, a2 = a1 * (1 + g), a2 * (1 + g)
+    c1, c2 = np.hypot(a1, b1), np.hypot(a2, b2)
+    h1 = np.where(c1 == 0, 0, np.degrees(np.arctan2(b1, a1)) % 360)
+    h2 = np.where(c2 == 0, 0, np.degrees(np.arctan2(b2, a2)) % 360)
+    achromatic = c1 * c2 == 0
+    opposite = (a1 * b2 == b1 * a2) & (a1 * a2 + b1 * b2 < 0)
+
+    diff = h2 - h1
+    dh = np.where(diff > 180, diff - 360, np.where(diff < -180, diff + 360,
+                                                   diff))
+    dh = np.where(opposite, np.where(h2 > h1, 180.0, -180.0), dh)
+    dh = np.where(achromatic, 0.0, dh)
+    dh = 2 * np.sqrt(c1 * c2) * np.sin(np.radians(dh / 2))
+
+    total = h1 + h2
+    h_mean = np.where(total < 360, (total + 360) / 2, (total - 360) / 2)
+    h_mean = np.where(opposite | (np.abs(diff) <= 180), total / 2, h_mean)
+    h_mean = np.where(achromatic, total, h_mean)
+
+    t = (1 - 0.17 * np.cos(np.radians(h_mean - 30))
+         + 0.24 * np.cos(np.radians(2 * h_mean))
+         + 0.32 * np.cos(np.radians(3 * h_mean + 6))
+         - 0.20 * np.cos(np.radians(4 * h_mean - 63)))
+    d_theta = 30 * np.exp(-((h_mean - 275) / 25) ** 2)
+    c_mean = (c1 + c2) / 2
+    c7 = c_mean ** 7
+    rc = 2 * np.sqrt(c7 / (c7 + 25 ** 7))
+    l50 = ((l1 + l2) / 2 - 50) ** 2
+    sl = 1 + 0.015 * l50 / np.sqrt(20 + l50)
+    sc = 1 + 0.045 * c_mean
+    sh = 1 + 0.015 * c_mean * t
+    rt = -np.sin(np.radians(2 * d_theta)) * rc
+    dl, dc, dh = (l2 - l1) / sl, (c2 - c1) / sc, dh / sh
+    return np.sqrt(dl ** 2 + dc ** 2 + dh ** 2 + rt * dc * dh)
+
+
+_SCALAR = {METRIC_CIE76: _cie76, METRIC_CIE94: _cie94,
+           METRIC_CIEDE2000: _ciede2000}
+_ARRAY = {METRIC_CIE76: _cie76_array, METRIC_CIE94: _cie94_array,
+          METRIC_CIEDE2000: _ciede2000_array}
+
+
+def delta_e(lab1, lab2, metric: str = METRIC_CIEDE2000):
+    """
+    Color difference between CIELAB colors
+
+    >>> delta_e((50, 2.6772, -79.7751), (50, 0, -82.7485)) # 2.0425
+    >>> delta_e(lab_array1, lab_array2, metric="cie76") # Element-wise
+
+    Note: CIE94 is not symmetric; `lab1` is the reference color.
+
+    :param lab1: Lab tuple or NumPy array with Lab on the last axis
+    :param lab2: Lab tuple or NumPy array (broadcast against lab1)
+    :param metric: One of 'cie76', 'cie94' or 'ciede2000'
+    :return: Delta E (float or array)
+    """
+    metric = _check_metric(metric)
+    if _is_array(lab1) or _is_array(lab2):
+        import numpy as np
+        return _ARRAY[metric](np, lab1, lab2)
+    return _SCALAR[metric](tuple(lab1), tuple(lab2))
+
+
+def _to_lab(color) -> tuple:
+    if hasattr(color, "rgb"):
+        color = tuple(color.rgb)
+    elif isinstance(color, str):
+        color = hex_to_rgb(color)
+    if not isinstance(color, (tuple, list)) or len(color) not in [3, 4]:
+        raise TypeError(f"Expected hex string, ColorOutput or RGB tuple but "
+                        f"got {type(color)}")
+    return rgb_to_lab(*color[:3])
+
+
+def color_difference(color1, color2, metric: str = METRIC_CIEDE2000) -> float:
+    """
+    >>> color_difference("#fb4b53", "#ff0000") # CIEDE2000 difference
+
+    :param color1: Hex string, ColorOutput or RGB tuple (0-1)
+    :param color2: Hex string, ColorOutput or RGB tuple (0-1)
+    :param metric: One of 'cie76', 'cie94' or 'ciede2000'
+    :return: Delta E between the colors (sRGB, D65)
+    """
+    return delta_e(_to_lab(color1), _to_lab(color2), metric)
+
+
+# ---------------------------------------------------------------- pairwise
+
+def _prepare(a, b):
+    import numpy as np
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 3)
+    if b is None:
+        return np, a, a, True
+    return np, a, np.asarray(b, dtype=np.float64).reshape(-1, 3), False
+
+
+def iter_pairwise(a, b=None, metric: str = METRIC_CIEDE2000,
+                  block_size: int = DEFAULT_BLOCK_SIZE):
+    """
+    Yields the pairwise Delta E matrix block by block
+
+    >>> for row, column, block in iter_pairwise(lab_a, lab_b):
+    >>>     # block[i, j] is difference between lab_a[row + i] and
+    >>>     # lab_b[column + j]
+
+    :param a: (N, 3) Lab array
+    :param b: (M, 3) Lab array (default: same as a)
+    :param metric: One of 'cie76', 'cie94' or 'ciede2000'
+    :param block_size: Maximum number of rows and columns in a block
+    :return: Generator of (row start, column start, block)
+    """
+    metric = _check_metric(metric)
+    np, a, b, _ = _prepare(a, b)
+    return _blocks(np, a, b, metric, block_size, upper=False)
+
+
+def _blocks(np, a, b, metric, block_size, upper):
+    # If upper is True, blocks which are completely below the diagonal
+    # (column < row for all elements) are skipped
+    func = _ARRAY[_check_metric(metric)]
+    if block_size < 1:
+        raise ValueError("Block size should be at least 1")
+    for i in range(0, len(a), block_size):
+        rows = a[i:i + block_size, None, :]
+        for j in range(0, len(b), block_size):
+            if upper and j + block_size <= i + 1:
+                continue
+            yield i, j, func(np, rows, b[None, j:j + block_size, :])
+
+
+def pairwise_delta_e(a, b=None, metric: str = METRIC_CIEDE2000,
+                     block_size: int = DEFAULT_BLOCK_SIZE, out=None):
+    """
+    Full Delta E matrix, computed block by block. For very large inputs,
+    pass a memory-mapped `out` array (e.g. `np.lib.format.open_memmap`) or
+    use :func:`iter_pairwise`, :func:`top_k` or :func:`within` instead.
+
+    :param a: (N, 3) Lab array
+    :param b: (M, 3) Lab array (default: same as a)
+    :param metric: One of 'cie76', 'cie94' or 'ciede2000'
+    :param block_size: Maximum number of rows and columns in a block
+    :param out: Optional (N, M) output array
+    :return: (N, M) float array
+    """
+    np, a_, b_, _ = _prepare(a, b)
+    shape = (len(a_), len(b_))
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError(f"Output should have shape {shape} but got "
+                         f"{out.shape}")
+    for i, j, block in iter_pairwise(a_, b_, metric, block_size):
+        out[i:i + block.shape[0], j:j + block.shape[1]] = block
+    return out
+
+
+def _mask_self(np, block, i, j):
+    # Sets distance of each color with itself to inf (when b is a)
+    rows = np.arange(i, i + block.shape[0])[:, None]
+    columns = np.arange(j, j + block.shape[1])[None, :]
+    return np.where(rows == columns, np.inf, block)
+
+
+def top_k(a, b=None, k: int = 1, metric: str = METRIC_CIEDE2000,
+          block_size: int = DEFAULT_BLOCK_SIZE):
+    """
+    Nearest k colors of b for every color of a
+
+    >>> index, distance = top_k(lab_a, lab_palette, k=3)
+
+    :param a: (N, 3) Lab array
+    :param b: (M, 3) Lab array. If not provided, nearest other colors from
+        a are returned (color itself is excluded).
+    :param k: Number of nearest colors
+    :param metric: One of 'cie76', 'cie94' or 'ciede2000'
+    :param block_size: Maximum number of rows and columns in a block
+    :return: (N, k) indices in b and (N, k) Delta E, sorted by distance
+    """
+    metric = _check_metric(metric)
+    np, a, b, same = _prepare(a, b)
+    available = len(b) - 1 if same else len(b)
+    if not 1 <= k <= available:
+        raise ValueError(f"k should be between 1 and {available} but got {k}")
+    func = _ARRAY[metric]
+    indices = np.empty((len(a), k), dtype=np.intp)
+    distances = np.empty((len(a), k))
+    for i in range(0, len(a), block_size):
+        rows = a[i:i + block_size, None, :]
+        best_d = np.full((rows.shape[0], 0), np.inf)
+        best_i = np.empty((rows.shape[0], 0), dtype=np.intp)
+        for j in range(0, len(b), block_size):
+            block = func(np, rows, b[None, j:j + block_size, :])
+            if same:
+                block = _mask_self(np, block, i, j)
+            cand_d = np.concatenate([best_d, block], axis=1)
+            cand_i = np.concatenate(
+                [best_i, np.broadcast_to(np.arange(j, j + block.shape[1]),
+                                         block.shape)], axis=1)
+            if cand_d.shape[1] > k:
+                keep = np.argpartition(cand_d, k - 1, axis=1)[:, :k]
+                cand_d = np.take_along_axis(cand_d, keep, axis=1)
+                cand_i = np.take_along_axis(cand_i, keep, axis=1)
+            best_d, best_i = cand_d, cand_i
+        order = np.argsort(best_d, axis=1, kind="stable")
+        distances[i:i + len(rows)] = np.take_along_axis(best_d, order, axis=1)
+        indices[i:i + len(rows)] = np.take_along_axis(best_i, order, axis=1)
+    return indices, distances
+
+
+def within(a, b=None, threshold: float = 1.0,
+           metric: str = METRIC_CIEDE2000,
+           block_size: int = DEFAULT_BLOCK_SIZE):
+    """
+    Streams all pairs which are closer than the threshold (e.g. to find
+    duplicate colors in a palette)
+
+    >>> for i, j, d in within(lab_palette, threshold=2.3):
+    >>>     # lab_palette[i[x]] and lab_palette[j[x]] differ by d[x]
+
+    :param a: (N, 3) Lab array
+    :param b: (M, 3) Lab array. If not provided, pairs within a are
+        returned (each pair only once, i < j).
+    :param threshold: Maximum Delta E (inclusive)
+    :param metric: One of 'cie76', 'cie94' or 'ciede2000'
+    :param block_size: Maximum number of rows and columns in a block
+    :return: Generator of (indices in a, indices in b, Delta E) arrays, one
+        per block with at least one pair
+    """
+    np, a, b, same = _prepare(a, b)
+    for i, j, block in _blocks(np, a, b, metric, block_size, upper=same):
+        mask = block <= threshold
+        if same:
+            rows = np.arange(i, i + block.shape[0])[:, None]
+            columns = np.arange(j, j + block.shape[1])[None, :]
+            mask &= columns > rows
+        r, c = np.nonzero(mask)
+        if len(r):
+            yield r + i, c + j, block[r, c]
@@ -0,0 +1,223 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Chromatic adaptation between white references (e.g. D50 print and D65
+#  screen) with Bradford, von Kries and CAT02 transforms.
+#
+#  Adaptation matrices are calculated once per (source white, destination
+#  white, method) and can be fused with the RGB <-> XYZ matrices from
+#  RX_DATA, so that linear RGB of one space/white is converted to another in
+#  a single 3x3 multiplication. Matrices are plain tuples; NumPy is needed
+#  only for the array functions.
+#
+#  Formula and cone response matrices: http://www.brucelindbloom.com and
+#  CIECAM02 (CIE 159:2004)
+
+import functools
+
+from SecretColors.helpers.rxutils import _get_matrix, white_reference
+
+METHOD_BRADFORD = "bradford"
+METHOD_VON_KRIES = "von_kries"
+METHOD_CAT02 = "cat02"
+
+ALL_METHODS = [METHOD_BRADFORD, METHOD_VON_KRIES, METHOD_CAT02]
+
+# XYZ -> cone response domain
+CONE_RESPONSE = {
+    METHOD_BRADFORD: ((0.8951, 0.2664, -0.1614),
+                      (-0.7502, 1.7135, 0.0367),
+                      (0.0389, -0.0685, 1.0296)),
+    METHOD_VON_KRIES: ((0.40024, 0.70760, -0.08081),
+                       (-0.22630, 1.16532, 0.04570),
+                       (0.0, 0.0, 0.91822)),
+    METHOD_CAT02: ((0.7328, 0.4296, -0.1624),
+                   (-0.7036, 1.6975, 0.0061),
+                   (0.0030, 0.0136, 0.9834)),
+}
+
+
+def _check_method(method: str) -> str:
+    method = method.strip().lower().replace("-", "_").replace(" ", "_")
+    if method not in ALL_METHODS:
+        raise ValueError(f"Unknown chromatic adaptation method '{method}'. "
+                         f"Currently available methods: {ALL_METHODS}")
+    return method
+
+
+def mat_mul(m1, m2) -> tuple:
+    """
+    :param m1: 3x3 matrix (nested sequence)
+    :param m2: 3x3 matrix
+    :return: m1 x m2
+    """
+    return tuple(tuple(sum(m1[i][k] * m2[k][j] for k in range(3))
+                       for j in range(3)) for i in range(3))
+
+
+def mat_vec(m, v) -> tuple:
+    """
+    :param m: 3x3 matrix
+    :param v: Vector of 3 values
+    :return: m x v
+    """
+    return tuple(sum(m[i][k] * v[k] for k in range(3)) for i in range(3))
+
+
+def mat_inv(m) -> tuple:
+    """
+    :param m: 3x3 matrix
+    :return: Inverse of the matrix
+    """
+    (a, b, c), (d, e, f), (g, h, i) = m
+    det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+    if det == 0:
+        raise ValueError("Matrix is not invertible")
+    return (((e * i - f * h) / det, (c * h - b * i) / det,
+             (b * f - c * e) / det),
+            ((f * g - d * i) / det, (a * i - c * g) / det,
+             (c * d - a * f) / det),
+            ((d * h - e * g) / det, (b * g - a * h) / det,
+             (a * e - b * d) / det))
+
+
+def _normalize_white(reference: str) -> str:
+    return reference.strip().upper()
+
+
+@functools.lru_cache(maxsize=None)
+def adaptation_matrix(source: str, destination: str,
+                      method: str = METHOD_BRADFORD) -> tuple:
+    """
+    XYZ (under source white) -> XYZ (under destination white)
+
+    >>> adaptation_matrix("D50", "D65") # Bradford D50 -> D65
+
+    :param source: Source white reference (e.g. D50)
+    :param destination: Destination white reference (e.g. D65)
+    :param method: One of 'bradford', 'von_kries' or 'cat02'
+    :return: 3x3 matrix (tuple of rows)
+    """
+    method = _check_method(method)
+    source = _normalize_white(source)
+    destination = _normalize_white(destination)
+    if source == destination:
+        return (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)
+    cone = CONE_RESPONSE[method]
+    src = mat_vec(cone, white_reference(source))
+    dst = mat_vec(cone, white_reference(destination))
+    scale = tuple(tuple(dst[i] / src[i] if i == j else 0.0 for j in range(3))
+                  for i in range(3))
+    return mat_mul(mat_inv(cone), mat_mul(scale, cone))
+
+
+def rgb_to_xyz_matrix(space: str, reference: str) -> tuple:
+    """
+    :param space: Name of the RGB space (as in RX_DATA)
+    :param reference: White reference of the space
+    :return: Linear RGB -> XYZ matrix
+    """
+    data = _get_matrix(space, reference)["xyz"]
+    return tuple(tuple(data[k]) for k in "xyz")
+
+
+def xyz_to_rgb_matrix(space: str, reference: str) -> tuple:
+    """
+    :param space: Name of the RGB space (as in RX_DATA)
+    :param reference: White reference of the space
+    :return: XYZ -> linear RGB matrix
+    """
+    data = _get_matrix(space, reference)["rgb"]
+    return tuple(tuple(data[k]) for k in "rgb")
+
+
+@functools.lru_cache(maxsize=None)
+def fused_matrix(source_space: str, source: str, destination_space: str,
+                 destination: str, method: str = METHOD_BRADFORD) -> tuple:
+    """
+    Single matrix for linear RGB (source space, source white) -> XYZ ->
+    adaptation -> linear RGB (destination space, destination white)
+
+    :param source_space: RGB space of the input (e.g. 'srgb')
+    :param source: White reference of the input (e.g. D50)
+    :param destination_space: RGB space of the output
+    :param destination: White reference of the output (e.g. D65)
+    :param method: One of 'bradford', 'von_kries' or 'cat02'
+    :return: 3x3 matrix
+    """
+    return mat_mul(xyz_to_rgb_matrix(destination_space, destination),
+                   mat_mul(adaptation_matrix(source, destination, method),
+                           rgb_to_xyz_matrix(source_space, source)))
+
+
+def adapt(x, y, z, *, source: str, destination: str,
+          method: str = METHOD_BRADFORD) -> tuple:
+    """
+    Adapts single CIE-XYZ color
+
+    :param x: CIE-X
+    :param y: CIE-Y
+    :param z: CIE-Z
+    :param source: Source white reference
+    :param destination: Destination white reference
+    :param method: One of 'bradford', 'von_kries' or 'cat02'
+    :return: Adapted X, Y, Z
+    """
+    return mat_vec(adaptation_matrix(source, destination, method), (x, y, z))
+
+
+@functools.lru_cache(maxsize=None)
+def _array(matrix: tuple):
+    import numpy as np
+    array = np.array(matrix, dtype=np.float64).T  # For values @ matrix.T
+    array.setflags(write=False)
+    return array
+
+
+def apply_matrix(values, matrix: tuple):
+    """
+    :param values: Array with channels on the last axis, e.g. (N, 3) or
+        (H, W, 3)
+    :param matrix: 3x3 matrix (tuple of rows)
+    :return: Transformed float64 array
+    """
+    import numpy as np
+    return np.asarray(values, dtype=np.float64) @ _array(matrix)
+
+
+def adapt_xyz(values, source: str, destination: str,
+              method: str = METHOD_BRADFORD):
+    """
+    :param values: CIE-XYZ array (channels on the last axis)
+    :param source: Source white reference
+    :param destination: Destination white reference
+    :param method: One of 'bradford', 'von_kries' or 'cat02'
+    :return: Adapted XYZ array
+    """
+    return apply_matrix(values, adaptation_matrix(source, destination,
+                                                  method))
+
+
+def adapt_linear_rgb(values, source: str, destination: str,
+                     method: str = METHOD_BRADFORD, space: str = "srgb",
+                     destination_space: str = None):
+    """
+    Converts linear RGB of one white reference to another in one matmul
+    (values are not clipped)
+
+    >>> adapt_linear_rgb(rgb, "D50", "D65") # sRGB D50 -> sRGB D65
+
+    :param values: Linear RGB array (channels on the last axis)
+    :param source: White reference of the input
+    :param destination: White reference of the output
+    :param method: One of 'bradford', 'von_kries' or 'cat02'
+    :param space: RGB space of the input
+    :param destination_space: RGB space of the output (default: same)
+    :return: Linear RGB array
+    """
+    matrix = fused_matrix(space, source, destination_space or space,
+                          destination, method)
+    return apply_matrix(values, matrix)
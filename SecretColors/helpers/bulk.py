@@ -0,0 +1,357 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Bulk conversion of colors from line-delimited text, CSV or JSON-lines.
+#
+#  python -m SecretColors convert --from hex --to hsl < colors.txt
+#  python -m SecretColors convert --from hex --to rgb255 --format csv \
+#       --column color --input data.csv --output out.csv --errors bad.tsv
+#
+#  Input is read in chunks (constant memory) and each chunk is converted
+#  with the vectorized kernels. With `workers` > 1, chunks are converted in
+#  a process pool; output order is always same as input. Rows which can not
+#  be converted are written to the error file (line number, reason, row)
+#  and skipped. Requires NumPy.
+
+import csv
+import io
+import json
+import math
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from SecretColors.helpers import vectorized as vc
+
+FORMAT_LINES = "lines"
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+
+ALL_FORMATS = [FORMAT_LINES, FORMAT_CSV, FORMAT_JSONL]
+
+DEFAULT_CHUNK_SIZE = 10000
+
+_HEX = re.compile(r"#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+_SEPARATOR = re.compile(r"[\s,;]+")
+
+
+def _identity(values):
+    return values
+
+
+def _from255(values):
+    return values / 255
+
+
+def _to255(values):
+    return vc.rgb_to_rgb255(np.clip(values, 0, 1))
+
+
+# Name -> (number of channels, (min, max) of channels, to RGB, from RGB)
+SPACES = {
+    "hex": (None, None, _identity, _identity),
+    "rgb": (3, (0, 1), _identity, _identity),
+    "rgb255": (3, (0, 255), _from255, _to255),
+    "hsl": (3, (0, 1), vc.hsl_to_rgb, vc.rgb_to_hsl),
+    "cmyk": (4, (0, 1), vc.cmyk_to_rgb, vc.rgb_to_cmyk),
+    "lab": (3, None, vc.lab_to_rgb, vc.rgb_to_lab),
+    "lch": (3, None, vc.lch_to_rgb, vc.rgb_to_lch),
+    "oklab": (3, None, vc.oklab_to_rgb, vc.rgb_to_oklab),
+    "oklch": (3, None, vc.oklch_to_rgb, vc.rgb_to_oklch),
+}
+
+
+def _check_space(space: str) -> str:
+    space = space.strip().lower()
+    if space not in SPACES:
+        raise ValueError(f"Unknown color space '{space}'. Currently "
+                         f"available: {list(SPACES)}")
+    return space
+
+
+def _parse(value, space: str):
+    # Single value -> hex string or tuple of floats (raises ValueError)
+    if space == "hex":
+        if not isinstance(value, str) or not _HEX.fullmatch(value.strip()):
+            raise ValueError(f"Invalid hex color '{value}'")
+        return value.strip()
+    channels, limits = SPACES[space][:2]
+    if isinstance(value, str):
+        value = [x for x in _SEPARATOR.split(value.strip(" \t[]()")) if x]
+    try:
+        value = tuple(float(x) for x in value)
+    except TypeError:
+        raise ValueError(f"Expected {channels} values but got "
+                         f"'{value}'") from None
+    if not all(math.isfinite(x) for x in value):
+        raise ValueError("Values should be finite numbers")
+    if len(value) != channels:
+        raise ValueError(f"Expected {channels} values for '{space}' but got "
+                         f"{len(value)}")
+    if limits is not None and not all(
+            limits[0] <= x <= limits[1] for x in value):
+        raise ValueError(f"Values of '{space}' should be between "
+                         f"{limits[0]}-{limits[1]}")
+    return value
+
+
+def convert_chunk(values: list, source: str, destination: str,
+                  precision: int = 6) -> tuple:
+    """
+    Converts list of colors in one go. Invalid values do not stop the
+    conversion.
+
+    >>> convert_chunk(["#ff0000", "#ggg"], "hex", "hsl")
+    >>> # ([(0.0, 1.0, 0.5), None], [(1, "Invalid hex color '#ggg'")])
+
+    :param values: Hex strings, strings with channel values ('0.1, 0.2,
+        0.3') or sequences of numbers
+    :param source: Input space (one of SPACES)
+    :param destination: Output space
+    :param precision: Number of decimal places in the output
+    :return: Converted values (None for invalid values) and list of
+        (index, reason) of invalid values
+    """
+    source = _check_space(source)
+    destination = _check_space(destination)
+    parsed = []
+    valid = []
+    errors = []
+    for i, value in enumerate(values):
+        try:
+            parsed.append(_parse(value, source))
+            valid.append(i)
+        except ValueError as e:
+            errors.append((i, str(e)))
+    output = [None] * len(values)
+    if not parsed:
+        return output, errors
+    if source == "hex":
+        rgb = vc.hex_to_rgba255(parsed)[:, :3] / 255
+    else:
+        rgb = SPACES[source][2](np.array(parsed, dtype=np.float64))
+    if destination == "hex":
+        converted = vc.rgb_to_hex(np.clip(rgb, 0, 1))
+    else:
+        converted = SPACES[destination][3](rgb)
+        if converted.dtype.kind == "f":
+            converted = np.round(converted, precision) + 0.0  # No -0.0
+        converted = [tuple(x) for x in converted.tolist()]
+    for i, value in zip(valid, converted):
+        output[i] = value
+    return output, errors
+
+
+# -------------------------------------------------------------- input/output
+
+class _Records:
+    # Reads (line number, raw text, record, value or exception) from input
+
+    def __init__(self, stream, fmt: str, column: str = None):
+        self.stream = stream
+        self.format = fmt
+        self.column = column
+        self.header = None
+        if fmt == FORMAT_CSV:
+            if column is None:
+                raise ValueError("Column name is required for CSV input")
+            self._reader = csv.reader(stream)
+            self.header = next(self._reader, None) or []
+            if column not in self.header:
+                raise ValueError(f"Column '{column}' is not present in CSV "
+                                 f"header {self.header}")
+            self._index = self.header.index(column)
+
+    def __iter__(self):
+        if self.format == FORMAT_CSV:
+            for row in self._reader:
+                value = row[self._index] if len(row) > self._index else \
+                    ValueError(f"Row has no '{self.column}' column")
+                yield self._reader.line_num, ",".join(row), row, value
+            return
+        for number, line in enumerate(self.stream, 1):
+            raw = line.rstrip("\r\n")
+            if not raw.strip():
+                continue
+            if self.format == FORMAT_LINES:
+                yield number, raw, None, raw
+                continue
+            try:
+                record = json.loads(raw)
+                value = record
+                if isinstance(record, dict):
+                    if self.column is None:
+                        raise ValueError("Column name is required for JSON "
+                                         "objects")
+                    value = record[self.column]
+            except (ValueError, KeyError) as e:
+                record, value = None, ValueError(f"Invalid record ({e})")
+            yield number, raw, record, value
+
+
+def _text(value) -> str:
+    if isinstance(value, str):
+        return value
+    return ",".join(str(x) for x in value)
+
+
+def _chunks(records, size: int):
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _ordered(chunks, source, destination, precision, workers):
+    # Yields (chunk, converted values, errors) in the input order
+    def _values(chunk):
+        return [None if isinstance(x[3], Exception) else x[3] for x in chunk]
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield (chunk, *convert_chunk(_values(chunk), source, destination,
+                                         precision))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(
+                convert_chunk, _values(chunk), source, destination,
+                precision)))
+            # Bounded number of chunks in flight keeps memory constant
+            if len(pending) >= 2 * workers:
+                chunk, future = pending.popleft()
+                yield (chunk, *future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield (chunk, *future.result())
+
+
+def convert_stream(source_stream, destination_stream, source: str,
+                   destination: str, *, fmt: str = FORMAT_LINES,
+                   column: str = None, output_column: str = None,
+                   error_stream=None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   workers: int = 0, precision: int = 6) -> dict:
+    """
+    :param source_stream: Text stream with input
+    :param destination_stream: Text stream for output
+    :param source: Input color space (one of SPACES)
+    :param destination: Output color space
+    :param fmt: One of 'lines', 'csv' or 'jsonl'
+    :param column: Column (CSV) or key (JSON objects) with the color
+    :param output_column: Column/key for the output (default:
+        '<column>_<destination>'). Other columns are copied as they are
+    :param error_stream: Text stream for invalid rows (tab separated line
+        number, reason and row). If None, invalid rows are only counted
+    :param chunk_size: Number of rows converted in one go
+    :param workers: Number of worker processes (0 or 1: no pool)
+    :param precision: Number of decimal places in the output
+    :return: Dictionary with number of 'converted' and 'invalid' rows
+    """
+    source = _check_space(source)
+    destination = _check_space(destination)
+    if fmt not in ALL_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Currently available: "
+                         f"{ALL_FORMATS}")
+    if chunk_size < 1:
+        raise ValueError("Chunk size should be at least 1")
+    output_column = output_column or f"{column}_{destination}"
+    records = _Records(source_stream, fmt, column)
+    writer = None
+    if fmt == FORMAT_CSV:
+        writer = csv.writer(destination_stream, lineterminator="\n")
+        writer.writerow(records.header + [output_column])
+
+    summary = {"converted": 0, "invalid": 0}
+    for chunk, converted, errors in _ordered(
+            _chunks(records, chunk_size), source, destination, precision,
+            workers):
+        reasons = dict(errors)
+        for i, (number, raw, record, value) in enumerate(chunk):
+            result = converted[i]
+            if result is None:
+                summary["invalid"] += 1
+                if error_stream is not None:
+                    reason = str(value) if isinstance(value, Exception) \
+                        else reasons.get(i, "Invalid value")
+                    error_stream.write(f"{number}\t{reason}\t{raw}\n")
+                continue
+            summary["converted"] += 1
+            if fmt == FORMAT_LINES:
+                destination_stream.write(_text(result) + "\n")
+            elif fmt == FORMAT_CSV:
+                writer.writerow(record + [_text(result)])
+            else:
+                if isinstance(record, dict):
+                    record[output_column] = result
+                    result = record
+                destination_stream.write(json.dumps(result) + "\n")
+    return summary
+
+
+def _open(path: str, mode: str, default):
+    if path is None or path == "-":
+        return default, False
+    return io.open(path, mode, newline="", encoding="utf-8"), True
+
+
+def add_arguments(parser):
+    """
+    :param parser: argparse parser (or sub-parser) of 'convert' command
+    """
+    parser.add_argument("--from", dest="source", required=True,
+                        choices=list(SPACES), help="Input color space")
+    parser.add_argument("--to", dest="destination", required=True,
+                        choices=list(SPACES), help="Output color space")
+    parser.add_argument("--input", default="-",
+                        help="Input file (default: stdin)")
+    parser.add_argument("--output", default="-",
+                        help="Output file (default: stdout)")
+    parser.add_argument("--format", default=FORMAT_LINES,
+                        choices=ALL_FORMATS)
+    parser.add_argument("--column", help="CSV column or JSON key with color")
+    parser.add_argument("--output-column",
+                        help="Column/key for converted color")
+    parser.add_argument("--errors", help="File for invalid rows")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Worker processes (default: no pool)")
+    parser.add_argument("--precision", type=int, default=6)
+
+
+def run(args) -> int:
+    """
+    :param args: Parsed arguments (see :func:`add_arguments`)
+    :return: Exit code
+    """
+    source, close_source = _open(args.input, "r", sys.stdin)
+    destination, close_destination = _open(args.output, "w", sys.stdout)
+    errors, close_errors = _open(args.errors, "w", None)
+    try:
+        summary = convert_stream(
+            source, destination, args.source, args.destination,
+            fmt=args.format, column=args.column,
+            output_column=args.output_column, error_stream=errors,
+            chunk_size=args.chunk_size, workers=args.workers,
+            precision=args.precision)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        for stream, close in [(source, close_source),
+                              (destination, close_destination),
+                              (errors, close_errors)]:
+            if close:
+                stream.close()
+    print(f"Converted {summary['converted']} rows, {summary['invalid']} "
+          f"invalid", file=sys.stderr)
+    return 0
@@ -0,0 +1,434 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Chunked (streaming) value -> color mapping for datasets which do not fit
+#  in the memory. Peak memory is proportional to the chunk size and not to
+#  the size of the data. Requires NumPy.
+#
+#  `run_pipeline` applies a chain of conversion stages (e.g. RGB -> linear
+#  -> XYZ -> Lab -> Delta E) to memory mapped arrays in the same way.
+
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from SecretColors import metrics
+from SecretColors.cmaps.native import NORM_LINEAR, NORM_LOG, _normalize
+from SecretColors.helpers import vectorized as vc
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_SAMPLE_SIZE = 1 << 17
+
+OUTPUT_RGBA = "rgba"
+OUTPUT_BYTES = "bytes"
+OUTPUT_HEX = "hex"
+
+ALL_OUTPUTS = [OUTPUT_RGBA, OUTPUT_BYTES, OUTPUT_HEX]
+
+
+def _is_path(source) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def open_source(source):
+    """
+    :param source: Path to .npy file, NumPy array or iterable of arrays
+    :return: Memory mapped array (for .npy files) or the source itself
+    """
+    if _is_path(source):
+        return np.load(source, mmap_mode="r")
+    return source
+
+
+def is_reiterable(source) -> bool:
+    """
+    :param source: Source of the values
+    :return: True if values can be read more than once (i.e. source is not a
+        one-shot iterator or generator)
+    """
+    source = open_source(source)
+    return isinstance(source, np.ndarray) or iter(source) is not source
+
+
+def iter_chunks(source, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yields flat float64 chunks of values. Arrays (and memory mapped .npy
+    files) are sliced in C order, so only one chunk is in the memory at a
+    time. Iterables are expected to yield NumPy arrays (or lists) already.
+
+    Arrays which are not C contiguous (e.g. Fortran ordered .npy files) are
+    sliced along the leading axis instead (values are still yielded in C
+    order), hence a chunk has at least one full row of that axis.
+
+    :param source: Path to .npy file, NumPy array or iterable of arrays
+    :param chunk_size: Number of values per chunk (only for arrays)
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size should be at least 1")
+    source = open_source(source)
+    if isinstance(source, np.ndarray):
+        if source.ndim > 1 and not source.flags.c_contiguous:
+            # Flat view is not possible; reshape would copy whole array
+            row = max(1, int(np.prod(source.shape[1:])))
+            step = max(1, chunk_size // row)
+            for start in range(0, source.shape[0], step):
+                yield np.asarray(source[start:start + step],
+                                 dtype=np.float64).reshape(-1)
+            return
+        flat = source.reshape(-1)
+        for start in range(0, flat.shape[0], chunk_size):
+            yield np.asarray(flat[start:start + chunk_size], dtype=np.float64)
+    else:
+        for chunk in source:
+            yield np.asarray(chunk, dtype=np.float64).reshape(-1)
+
+
+def compute_limits(source, quantiles: tuple = None, *,
+                   positive_only: bool = False,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   sample_size: int = DEFAULT_SAMPLE_SIZE,
+                   seed: int = None) -> tuple:
+    """
+    Calculates normalization limits in a single pass over the data. NaN
+    values are ignored.
+
+    Minimum and maximum are exact. Quantiles are calculated on a uniform
+    random sample of at most `sample_size` values (exact if data has less
+    values than that).
+
+    :param source: Path to .npy file, NumPy array or iterable of arrays
+    :param quantiles: (low, high) quantiles between 0-1 (e.g. (0.01, 0.99)).
+        If not provided, minimum and maximum will be returned.
+    :param positive_only: If True, only positive values are used (for 'log'
+        norm)
+    :param chunk_size: Number of values per chunk
+    :param sample_size: Maximum number of values kept for quantiles
+    :param seed: Seed for the sampling
+    :return: (vmin, vmax)
+    """
+    if quantiles is not None:
+        low, high = quantiles
+        if not 0 <= low <= high <= 1:
+            raise ValueError(f"Quantiles should be between 0-1 and in "
+                             f"increasing order but got {quantiles}")
+    rng = np.random.default_rng(seed)
+    vmin, vmax = np.inf, -np.inf
+    sample = np.empty(0, dtype=np.float64)
+    keys = np.empty(0, dtype=np.float64)
+    for chunk in iter_chunks(source, chunk_size):
+        if positive_only:
+            chunk = chunk[chunk > 0]
+        else:
+            chunk = chunk[~np.isnan(chunk)]
+        if chunk.size == 0:
+            continue
+        vmin = min(vmin, float(chunk.min()))
+        vmax = max(vmax, float(chunk.max()))
+        if quantiles is None:
+            continue
+        # Keep values with the smallest random keys: uniform sample without
+        # replacement, independent of how the data is chunked
+        sample = np.concatenate([sample, chunk])
+        keys = np.concatenate([keys, rng.random(chunk.size)])
+        if sample.size > sample_size:
+            keep = np.argpartition(keys, sample_size - 1)[:sample_size]
+            sample, keys = sample[keep], keys[keep]
+
+    if vmin > vmax:
+        raise ValueError("No valid values found in the data")
+    if quantiles is None:
+        return vmin, vmax
+    low, high = np.quantile(sample, quantiles)
+    return float(low), float(high)
+
+
+def _convert(rgba: np.ndarray, output: str):
+    if output == OUTPUT_HEX:
+        return vc.rgba255_to_hex(rgba[:, :3])
+    return rgba
+
+
+def stream_colors(cmap, source, vmin: float = None, vmax: float = None,
+                  norm: str = NORM_LINEAR, *, output: str = OUTPUT_RGBA,
+                  quantiles: tuple = None, linthresh: float = 1,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Maps values to colors chunk by chunk.
+
+    If `vmin` or `vmax` is not provided, it is calculated with
+    :func:`compute_limits` in a pre-pass. This needs a source which can be
+    read twice (path, array or list of arrays).
+
+    :param cmap: Any colormap which maps values between 0-1 (NativeColormap
+        or matplotlib colormap)
+    :param source: Path to .npy file, NumPy array or iterable of arrays
+    :param vmin: Value mapped to first color
+    :param vmax: Value mapped to last color
+    :param norm: 'linear', 'log' or 'symlog'
+    :param output: 'rgba' (float32 (N, 4)), 'bytes' (uint8 (N, 4)) or
+        'hex' (list of hex colors)
+    :param quantiles: Quantiles used for limits in the pre-pass
+    :param linthresh: Linear range of 'symlog' norm
+    :param chunk_size: Number of values per chunk
+    :return: Generator of color chunks
+    """
+    output = output.strip().lower()
+    if output not in ALL_OUTPUTS:
+        raise ValueError(f"Unknown output '{output}'. Currently available "
+                         f"outputs: {ALL_OUTPUTS}")
+    source = open_source(source)
+    norm = norm.strip().lower()
+    if vmin is None or vmax is None:
+        if not is_reiterable(source):
+            raise ValueError("Limits can not be calculated on one-shot "
+                             "iterator. Provide 'vmin' and 'vmax' or use "
+                             "source which can be read twice.")
+        low, high = compute_limits(source, quantiles,
+                                   positive_only=norm == NORM_LOG,
+                                   chunk_size=chunk_size)
+        vmin = low if vmin is None else vmin
+        vmax = high if vmax is None else vmax
+    return _stream(cmap, source, vmin, vmax, norm, output, linthresh,
+                   chunk_size)
+
+
+def _stream(cmap, source, vmin, vmax, norm, output, linthresh, chunk_size):
+    as_bytes = output != OUTPUT_RGBA
+    for chunk in iter_chunks(source, chunk_size):
+        metrics.incr("stream.values", chunk.size)
+        normalized = _normalize(np, chunk, vmin, vmax, norm, linthresh)
+        rgba = cmap(normalized, bytes=as_bytes)
+        if not as_bytes:
+            rgba = rgba.astype(np.float32, copy=False)
+        yield _convert(rgba, output)
+
+
+def write_colors(cmap, source, destination, vmin: float = None,
+                 vmax: float = None, norm: str = NORM_LINEAR, *,
+                 bytes: bool = True, quantiles: tuple = None,
+                 linthresh: float = 1,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Maps values to colors and writes them into memory mapped .npy file
+    (or any preallocated array) chunk by chunk.
+
+    :param cmap: Any colormap which maps values between 0-1
+    :param source: Path to .npy file or NumPy array (or iterable of arrays
+        when destination is an array)
+    :param destination: Path of output .npy file or (N, 4) array
+    :param vmin: Value mapped to first color
+    :param vmax: Value mapped to last color
+    :param norm: 'linear', 'log' or 'symlog'
+    :param bytes: If True, uint8 colors will be written (else float32)
+    :param quantiles: Quantiles used for limits in the pre-pass
+    :param linthresh: Linear range of 'symlog' norm
+    :param chunk_size: Number of values per chunk
+    :return: Destination array (memory map if path was given). Its shape is
+        source.shape + (4,)
+    """
+    source = open_source(source)
+    if _is_path(destination):
+        if not isinstance(source, np.ndarray):
+            raise TypeError("Size of the output file is not known. Use .npy "
+                            "file or array as a source or provide "
+                            "preallocated destination array.")
+        destination = np.lib.format.open_memmap(
+            destination, mode="w+", shape=source.shape + (4,),
+            dtype=np.uint8 if bytes else np.float32)
+    if not destination.flags.c_contiguous:
+        raise ValueError("Destination array should be C contiguous")
+    flat = destination.reshape(-1, 4)
+    output = OUTPUT_BYTES if bytes else OUTPUT_RGBA
+    start = 0
+    for colors in stream_colors(cmap, source, vmin, vmax, norm,
+                                output=output, quantiles=quantiles,
+                                linthresh=linthresh, chunk_size=chunk_size):
+        if start + colors.shape[0] > flat.shape[0]:
+            raise ValueError("Destination is smaller than the source")
+        flat[start:start + colors.shape[0]] = colors
+        start += colors.shape[0]
+    if start != flat.shape[0]:
+        raise ValueError(f"Destination expected {flat.shape[0]} colors but "
+                         f"source had only {start} values")
+    if isinstance(destination, np.memmap):
+        destination.flush()
+    return destination
+
+
+# ------------------------------------------------------------- pipeline
+
+def _rgb255_to_rgb(values):
+    return values[..., :3] / 255
+
+
+# Stage name -> function (chunk array -> chunk array)
+PIPELINE_STAGES = {
+    "unpack_rgba255": vc.unpack_rgba255,
+    "rgb255_to_rgb": _rgb255_to_rgb,
+    "rgb_to_rgb255": vc.rgb_to_rgb255,
+    "srgb_to_linear": vc.srgb_to_linear,
+    "linear_to_srgb": vc.linear_to_srgb,
+    "linear_to_xyz": vc.linear_rgb_to_xyz,
+    "xyz_to_linear": vc.xyz_to_linear_rgb,
+    "xyz_to_lab": vc.xyz_to_lab,
+    "lab_to_xyz": vc.lab_to_xyz,
+    "lab_to_lch": vc.lab_to_lch,
+    "lch_to_lab": vc.lch_to_lab,
+    "rgb_to_lab": vc.rgb_to_lab,
+    "lab_to_rgb": vc.lab_to_rgb,
+    "rgb_to_oklab": vc.rgb_to_oklab,
+    "oklab_to_rgb": vc.oklab_to_rgb,
+    "rgb_to_hsl": vc.rgb_to_hsl,
+    "hsl_to_rgb": vc.hsl_to_rgb,
+}
+
+
+def delta_e_stage(reference, metric: str = "ciede2000"):
+    """
+    Stage which converts Lab chunk to Delta E from the reference color
+
+    >>> run_pipeline(src, dst, ["rgb_to_lab", delta_e_stage("#fb4b53")])
+
+    :param reference: Hex string, RGB tuple or ColorOutput (converted to
+        Lab) or Lab array
+    :param metric: One of 'cie76', 'cie94' or 'ciede2000'
+    :return: Function which can be used in :func:`run_pipeline`
+    """
+    from SecretColors.difference import _to_lab, delta_e
+    if isinstance(reference, np.ndarray):
+        lab = reference.astype(np.float64)
+    else:
+        lab = np.array(_to_lab(reference), dtype=np.float64)
+
+    def _delta_e(values):
+        return delta_e(values, lab, metric)
+
+    return _delta_e
+
+
+def _stages(stages) -> list:
+    functions = []
+    for item in stages:
+        if callable(item):
+            functions.append(item)
+        elif item in PIPELINE_STAGES:
+            functions.append(PIPELINE_STAGES[item])
+        else:
+            raise ValueError(f"Unknown pipeline stage '{item}'. Currently "
+                             f"available stages: {list(PIPELINE_STAGES)}")
+    if not functions:
+        raise ValueError("Pipeline needs at least one stage")
+    return functions
+
+
+def _rows(array: np.ndarray) -> np.ndarray:
+    # 1D arrays have scalar rows, others have channels on the last axis
+    if array.ndim == 1:
+        return array
+    if array.ndim > 2 and not array.flags.c_contiguous:
+        # Rows would be a copy of the whole (memory mapped) array
+        raise ValueError("Source array with more than 2 dimensions should "
+                         "be C contiguous")
+    return array.reshape(-1, array.shape[-1])
+
+
+def aligned_chunk_rows(chunk_size: int, row_bytes: int) -> int:
+    """
+    :param chunk_size: Requested number of rows per chunk
+    :param row_bytes: Size of one row in the bytes
+    :return: Number of rows (<= chunk_size when possible) so that every
+        chunk starts at the same offset within a memory page
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size should be at least 1")
+    page = mmap.PAGESIZE
+    step = page // np.gcd(page, row_bytes)
+    return max(step, chunk_size - chunk_size % step)
+
+
+def _apply(functions, chunk):
+    for function in functions:
+        chunk = function(chunk)
+    return chunk
+
+
+def run_pipeline(source, destination, stages: list, *,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 0,
+                 dtype=None):
+    """
+    Applies chain of conversion stages to a (memory mapped) array chunk by
+    chunk and writes result to preallocated (memory mapped) array.
+
+    >>> stages = ["unpack_rgba255", "rgb255_to_rgb", "srgb_to_linear",
+    >>>           "linear_to_xyz", "xyz_to_lab", delta_e_stage("#fb4b53")]
+    >>> run_pipeline("pixels.npy", "delta_e.npy", stages, workers=4)
+
+    Rows are taken along the leading axes (1D arrays: every value is a row,
+    others: last axis are channels). Output shape is the source shape
+    (without channel axis) + shape of the last stage output per row.
+
+    Peak memory is about chunk size x number of stages (x workers). NumPy
+    kernels release the GIL, hence `workers` threads convert different
+    chunks in parallel.
+
+    :param source: Path to .npy file or NumPy array
+    :param destination: Path of output .npy file or preallocated C
+        contiguous array
+    :param stages: Names from PIPELINE_STAGES or functions (chunk -> chunk)
+    :param chunk_size: Number of rows per chunk (adjusted to page alignment)
+    :param workers: Number of threads (0 or 1: no threads)
+    :param dtype: Output dtype for new file (default: dtype of last stage)
+    :return: Destination array (memory map if path was given)
+    """
+    functions = _stages(stages)
+    source = open_source(source)
+    if not isinstance(source, np.ndarray):
+        raise TypeError("Pipeline source should be .npy file or NumPy array")
+    rows = _rows(source)
+    leading = source.shape if source.ndim == 1 else source.shape[:-1]
+    if rows.shape[0] == 0:
+        raise ValueError("Source does not have any rows")
+    # Output shape and type per row from the first row
+    probe = np.asarray(_apply(functions, rows[:1]))
+    if _is_path(destination):
+        destination = np.lib.format.open_memmap(
+            destination, mode="w+", shape=leading + probe.shape[1:],
+            dtype=dtype or probe.dtype)
+    if not destination.flags.c_contiguous:
+        raise ValueError("Destination array should be C contiguous")
+    if destination.shape[:len(leading)] != leading:
+        raise ValueError(f"Destination shape {destination.shape} does not "
+                         f"match source rows {leading}")
+    output = destination.reshape((rows.shape[0],) + destination.shape[
+                                                     len(leading):])
+    step = aligned_chunk_rows(chunk_size, rows.itemsize * int(
+        np.prod(rows.shape[1:])))
+
+    def _run(start):
+        chunk = np.asarray(rows[start:start + step])
+        output[start:start + chunk.shape[0]] = _apply(functions, chunk)
+        metrics.incr("pipeline.rows", chunk.shape[0])
+
+    starts = range(0, rows.shape[0], step)
+    if workers <= 1:
+        for start in starts:
+            _run(start)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for start in starts:
+                # At most `workers` chunks are in the memory at a time
+                if len(pending) >= workers:
+                    pending.popleft().result()
+                pending.append(pool.submit(_run, start))
+            while pending:
+                pending.popleft().result()
+    if isinstance(destination, np.memmap):
+        destination.flush()
+    return destination
@@ -9,6 +9,8 @@
 import functools
 import warnings
 
+from SecretColors.helpers import tracing
+
 
 def deprecated(message: str = None):
     """
@@ -74,12 +76,7 @@ def color_docs(func):
     doc = _sample_color.__doc__
     doc = doc.replace("SECRET", func.__name__)
     func.__doc__ = doc
-
-    @functools.wraps(func)
-    def wrap(*args, **kwargs):
-        return func(*args, **kwargs)
-
-    return wrap
+    return tracing.register(func)
 
 
 def _sample_cmap(self, *, no_of_colors: int = None,
@@ -115,11 +112,6 @@ def cmap_docs(name, value):
         doc = doc.replace("SNAME", value)
         doc = doc.replace("METHOD_NAME", func.__name__)
         func.__doc__ = doc
-
-        @functools.wraps(func)
-        def wrap(*args, **kwargs):
-            return func(*args, **kwargs)
-
-        return wrap
+        return tracing.register(func)
 
     return decorator
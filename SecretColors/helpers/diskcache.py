@@ -0,0 +1,310 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Persistent on-disk cache for precomputed tables (e.g. colormap LUTs and
+#  resampled colormaps) shared between processes. Disabled by default;
+#  enable with `diskcache.enable()` or by setting SECRET_COLORS_DISK_CACHE
+#  environment variable to 1 (default location) or to a folder.
+#
+#  Default location is $XDG_CACHE_HOME/SecretColors (~/.cache/SecretColors).
+#  Entries are stored as .npy files in a folder named after the content
+#  hash of `SecretColors/data`, the source of the modules which create the
+#  tables (SOURCES) and the library version, so that changes in the data or
+#  in the code never return stale tables. The hash is stored in the cache
+#  under a key made of file sizes and modification times, so the files are
+#  hashed only once after they change. Files are written to a temporary
+#  file and renamed (atomic), hence concurrent processes can share the
+#  cache. Entries are loaded as read-only memory maps, so only the pages
+#  which are used are read from the disk. Requires NumPy.
+
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+# Bump when the layout of the cache entries or the algorithm which creates
+# them changes outside of SOURCES (their content is hashed already)
+CACHE_FORMAT = 1
+
+_ENV = "SECRET_COLORS_DISK_CACHE"
+_PACKAGE = os.path.dirname(os.path.dirname(__file__))
+_DATA_FOLDER = os.path.join(_PACKAGE, "data")
+
+# Modules which create the cached tables (relative to SecretColors)
+SOURCES = (os.path.join("cmaps", "native.py"),
+           os.path.join("cmaps", "resample.py"))
+
+_default = None
+_lock = threading.Lock()
+
+
+def default_root() -> str:
+    """
+    :return: $XDG_CACHE_HOME/SecretColors (or ~/.cache/SecretColors)
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "SecretColors")
+
+
+def _library_version() -> str:
+    # Slow (importlib.metadata); used only when the content is hashed
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:  # Python < 3.8
+        return "unknown"
+    try:
+        return version("SecretColors")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _files(folder: str, sources: tuple) -> list:
+    # (name, path) of all data files and sources which are present
+    files = []
+    for root, folders, names in os.walk(folder):
+        folders[:] = sorted(x for x in folders if x != "__pycache__")
+        for name in sorted(names):
+            if name.endswith((".py", ".bin")):
+                path = os.path.join(root, name)
+                files.append((os.path.relpath(path, folder), path))
+    files.extend((name, os.path.join(_PACKAGE, name)) for name in sources)
+    return files
+
+
+def _fingerprint(files: list) -> str:
+    # Sizes and modification times; cheap to compute on every start
+    stats = []
+    for name, path in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        stats.append((name, stat.st_size, stat.st_mtime_ns))
+    return hashlib.sha1(repr((CACHE_FORMAT, stats)).encode()).hexdigest()
+
+
+def _content_hash(files: list) -> str:
+    digest = hashlib.sha256(f"{CACHE_FORMAT}:{_library_version()}"
+                            .encode())
+    for name, path in files:
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            # e.g. installations without the python sources
+            continue
+        digest.update(name.encode())
+        digest.update(content)
+    return digest.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def data_version(folder: str = _DATA_FOLDER, sources: tuple = SOURCES,
+                 root: str = None) -> str:
+    """
+    Content hash of the data files and of the modules which create the
+    tables (calculated once per process).
+
+    With `root`, the hash is stored in the cache folder under a key made of
+    file sizes and modification times, hence files are read and hashed only
+    when they change (or after an update of the library).
+
+    :param folder: Data folder (default: SecretColors/data)
+    :param sources: Source files relative to SecretColors (default: SOURCES)
+    :param root: Cache folder where hashes are stored (default: not stored)
+    :return: Hex digest which changes with the data, source, library
+        version or cache format
+    """
+    files = _files(folder, sources)
+    if root is None:
+        return _content_hash(files)
+    stamp = os.path.join(root, "versions", _fingerprint(files))
+    try:
+        with open(stamp) as f:
+            version = f.read().strip()
+        if version:
+            return version
+    except OSError:
+        pass
+    version = _content_hash(files)
+    temp = None
+    try:
+        os.makedirs(os.path.dirname(stamp), exist_ok=True)
+        handle, temp = tempfile.mkstemp(dir=os.path.dirname(stamp),
+                                        suffix=".tmp")
+        with os.fdopen(handle, "w") as f:
+            f.write(version)
+        os.replace(temp, stamp)
+    except OSError:
+        # Read-only cache folder: hash again in the next process
+        if temp is not None and os.path.exists(temp):
+            os.remove(temp)
+    return version
+
+
+def _key_name(key) -> str:
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+def _load(path: str):
+    import numpy as np
+    return np.load(path, mmap_mode="r", allow_pickle=False)
+
+
+class DiskCache:
+    """
+    Versioned cache of NumPy arrays on the disk
+
+    >>> cache = DiskCache("/tmp/cache")
+    >>> lut = cache.get_or_create("cmap.lut", ("Spectral", 256), factory)
+    """
+
+    def __init__(self, root: str = None, version: str = None):
+        """
+        :param root: Cache folder (default: :func:`default_root`)
+        :param version: Version folder (default: :func:`data_version`)
+        """
+        self.root = os.fspath(root or default_root())
+        self.version = version or data_version(root=self.root)
+        self.folder = os.path.join(self.root, self.version)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def path(self, namespace: str, key) -> str:
+        """
+        :param namespace: Kind of the table (e.g. 'cmap.lut')
+        :param key: Any key with stable `repr` (e.g. tuple of str/int)
+        :return: Path of the .npy file of the entry
+        """
+        return os.path.join(self.folder, namespace, f"{_key_name(key)}.npy")
+
+    def get(self, namespace: str, key):
+        """
+        :param namespace: Kind of the table
+        :param key: Key of the entry
+        :return: Read-only memory mapped array or None if not present
+        """
+        path = self.path(namespace, key)
+        try:
+            value = _load(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            # Unreadable entry is treated as missing and rewritten
+            self.errors += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, namespace: str, key, value) -> str:
+        """
+        Writes the entry atomically (temporary file + rename)
+
+        :param namespace: Kind of the table
+        :param key: Key of the entry
+        :param value: NumPy array (no object dtype)
+        :return: Path of the entry
+        """
+        import numpy as np
+        path = self.path(namespace, key)
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        handle, temp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as f:
+                np.save(f, np.ascontiguousarray(value), allow_pickle=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, path)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+        self.writes += 1
+        return path
+
+    def get_or_create(self, namespace: str, key, factory):
+        """
+        :param namespace: Kind of the table
+        :param key: Key of the entry
+        :param factory: Function without arguments which creates the array
+        :return: Read-only memory mapped array. If the cache can not be
+            written (e.g. read-only file system), created array is returned
+        """
+        value = self.get(namespace, key)
+        if value is not None:
+            return value
+        value = factory()
+        try:
+            return _load(self.put(namespace, key, value))
+        except (OSError, ValueError):
+            self.errors += 1
+            return value
+
+    def clear(self, all_versions: bool = False):
+        """
+        :param all_versions: If True, entries of other data versions are
+            removed as well
+        """
+        target = self.root if all_versions else self.folder
+        shutil.rmtree(target, ignore_errors=True)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "errors": self.errors}
+
+
+def enable(root: str = None) -> DiskCache:
+    """
+    Enables the default disk cache used by the library
+
+    :param root: Cache folder (default: :func:`default_root`)
+    :return: The cache
+    """
+    global _default
+    import numpy  # noqa: F401 (fails early when NumPy is not available)
+    from SecretColors import metrics
+    with _lock:
+        _default = DiskCache(root)
+    metrics.register_cache("disk", _default.stats)
+    return _default
+
+
+def disable():
+    global _default
+    with _lock:
+        _default = None
+
+
+def default_cache():
+    """
+    :return: Default disk cache or None if it is disabled
+    """
+    return _default
+
+
+def _from_environment():
+    value = os.environ.get(_ENV, "").strip()
+    if value.lower() in ["", "0", "false", "no", "off"]:
+        return
+    try:
+        enable(None if value.lower() in ["1", "true", "yes", "on"]
+               else value)
+    except (ImportError, OSError):
+        # NumPy is missing or the cache folder can not be used
+        pass
+
+
+_from_environment()
@@ -0,0 +1,188 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Vectorized gamut mapping of out-of-gamut colors into sRGB.
+#
+#  Input is gamma encoded sRGB which may be outside 0-1 (e.g. output of
+#  `lab_to_rgb(..., clip=False)` or `convert_rgb_space(..., clip=False)`).
+#  Only out-of-gamut colors are processed; every function also returns a
+#  mask of the colors which were modified.
+#
+#  Strategies:
+#       clip    : Clips each channel (fast, but shifts the hue)
+#       chroma  : Keeps lightness and hue in OKLCh (or CIE-LCh) and reduces
+#                 chroma by binary search
+#       project : Moves color in linear RGB along the line towards a gray
+#                 anchor until it is in gamut
+#
+#  NumPy is an optional dependency of SecretColors. Import this module only
+#  when array input is expected.
+
+import numpy as np
+
+from SecretColors.helpers import vectorized as vc
+
+STRATEGY_CLIP = "clip"
+STRATEGY_CHROMA = "chroma"
+STRATEGY_PROJECT = "project"
+
+ALL_STRATEGIES = [STRATEGY_CLIP, STRATEGY_CHROMA, STRATEGY_PROJECT]
+
+SPACE_OKLCH = "oklch"
+SPACE_LCH = "lch"
+
+ANCHOR_MID = "mid"
+ANCHOR_LUMINANCE = "luminance"
+
+# Colors within this distance from 0-1 are considered in gamut
+TOLERANCE = 1e-6
+
+
+def _check(value: str, options: list, name: str) -> str:
+    value = value.strip().lower()
+    if value not in options:
+        raise ValueError(f"Unknown {name} '{value}'. Currently available "
+                         f"options: {options}")
+    return value
+
+
+def out_of_gamut(rgb, tolerance: float = TOLERANCE) -> np.ndarray:
+    """
+    :param rgb: sRGB array with channels on the last axis
+    :param tolerance: Allowed distance from 0-1
+    :return: Boolean mask (shape without the last axis)
+    """
+    rgb = vc.as_float_array(rgb)
+    return ((rgb < -tolerance) | (rgb > 1 + tolerance)).any(axis=-1)
+
+
+def _decode(rgb):
+    # Inverse of the sign-preserving encoding used by `vc.*_to_rgb`
+    return np.sign(rgb) * vc.srgb_to_linear(np.abs(rgb))
+
+
+def _chroma(rgb, space, steps):
+    if space == SPACE_OKLCH:
+        lch = vc.lab_to_lch(vc.linear_rgb_to_oklab(_decode(rgb)))
+        to_rgb = vc.oklch_to_rgb
+    else:
+        lch = vc.lab_to_lch(vc.xyz_to_lab(vc.linear_rgb_to_xyz(_decode(rgb))))
+        to_rgb = vc.lch_to_rgb
+    low = np.zeros(len(lch))
+    high = lch[:, 1].copy()
+    trial = lch.copy()
+    for _ in range(steps):
+        middle = (low + high) / 2
+        trial[:, 1] = middle
+        inside = ~out_of_gamut(to_rgb(trial, clip=False))
+        low = np.where(inside, middle, low)
+        high = np.where(inside, high, middle)
+    trial[:, 1] = low
+    # Lightness itself can be out of gamut (e.g. L > 1); clip the rest
+    return np.clip(to_rgb(trial, clip=False), 0, 1)
+
+
+def _check_anchor(anchor):
+    if isinstance(anchor, str):
+        anchor = _check(anchor, [ANCHOR_MID, ANCHOR_LUMINANCE], "anchor")
+        return 0.5 if anchor == ANCHOR_MID else anchor
+    try:
+        value = float(anchor)
+    except (TypeError, ValueError):
+        raise ValueError(f"Anchor should be '{ANCHOR_MID}', "
+                         f"'{ANCHOR_LUMINANCE}' or gray value between 0-1 "
+                         f"but got {anchor!r}") from None
+    if not 0 <= value <= 1:
+        raise ValueError(f"Anchor should be between 0-1 but got {anchor}")
+    return value
+
+
+def _anchor(linear, anchor):
+    if anchor == ANCHOR_LUMINANCE:
+        luminance = linear[:, :3] @ np.array([0.2126729, 0.7151522,
+                                              0.0721750])
+        return np.clip(luminance, 0, 1)[:, None]
+    return np.full((len(linear), 1), vc.srgb_to_linear(anchor))
+
+
+def _project(rgb, anchor):
+    linear = _decode(rgb)
+    gray = _anchor(linear, anchor)
+    direction = linear - gray
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(linear > 1, (1 - gray) / direction,
+                     np.where(linear < 0, -gray / direction, np.inf))
+    t = np.clip(t.min(axis=-1, keepdims=True), 0, 1)
+    return np.clip(vc.linear_to_srgb(gray + t * direction), 0, 1)
+
+
+def map_to_gamut(rgb, strategy: str = STRATEGY_CHROMA, *,
+                 space: str = SPACE_OKLCH, anchor=ANCHOR_MID, steps: int = 24,
+                 tolerance: float = TOLERANCE):
+    """
+    Maps out-of-gamut colors into sRGB gamut
+
+    >>> rgb = vc.lab_to_rgb(lab, clip=False)
+    >>> mapped, modified = map_to_gamut(rgb) # Chroma reduction in OKLCh
+    >>> mapped, modified = map_to_gamut(rgb, "project", anchor="luminance")
+
+    :param rgb: Gamma encoded sRGB (can be outside 0-1) with channels on the
+        last axis, e.g. (N, 3) or (H, W, 3)
+    :param strategy: One of 'clip', 'chroma' or 'project'
+    :param space: Space for 'chroma' strategy ('oklch' or 'lch')
+    :param anchor: Gray anchor for 'project' strategy: 'mid' (sRGB 0.5),
+        'luminance' (gray with same luminance as the color) or gray value
+        between 0-1
+    :param steps: Number of binary search steps for 'chroma' strategy
+    :param tolerance: Allowed distance from 0-1 for in-gamut colors
+    :return: Mapped RGB (between 0-1) and boolean mask of modified colors
+    """
+    strategy = _check(strategy, ALL_STRATEGIES, "strategy")
+    space = _check(space, [SPACE_OKLCH, SPACE_LCH], "space")
+    anchor = _check_anchor(anchor)
+    if steps < 1:
+        raise ValueError(f"Number of steps should be at least 1 but got "
+                         f"{steps}")
+    rgb = vc.as_float_array(rgb)
+    shape = rgb.shape
+    flat = rgb.reshape(-1, shape[-1])
+    mask = out_of_gamut(flat, tolerance)
+    output = np.clip(flat, 0, 1)
+    if mask.any():
+        outside = flat[mask, :3]
+        if strategy == STRATEGY_CHROMA:
+            output[mask, :3] = _chroma(outside, space, steps)
+        elif strategy == STRATEGY_PROJECT:
+            output[mask, :3] = _project(outside, anchor)
+    return output.reshape(shape), mask.reshape(shape[:-1])
+
+
+def lab_to_rgb(lab, strategy: str = STRATEGY_CHROMA, reference: str = "D65",
+               **kwargs):
+    """
+    CIELAB -> sRGB with gamut mapping (instead of per-channel clipping)
+
+    :param lab: CIELAB array
+    :param strategy: One of 'clip', 'chroma' or 'project'
+    :param reference: White reference
+    :param kwargs: Other arguments of :func:`map_to_gamut`
+    :return: RGB (between 0-1) and mask of modified colors
+    """
+    return map_to_gamut(vc.lab_to_rgb(lab, reference, clip=False), strategy,
+                        **kwargs)
+
+
+def oklab_to_rgb(oklab, strategy: str = STRATEGY_CHROMA, **kwargs):
+    """
+    OKLab -> sRGB with gamut mapping (instead of per-channel clipping)
+
+    :param oklab: OKLab array
+    :param strategy: One of 'clip', 'chroma' or 'project'
+    :param kwargs: Other arguments of :func:`map_to_gamut`
+    :return: RGB (between 0-1) and mask of modified colors
+    """
+    return map_to_gamut(vc.oklab_to_rgb(oklab, clip=False), strategy,
+                        **kwargs)
@@ -0,0 +1,40 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Lazy (PEP 562) attribute loading for package __init__ modules
+
+import importlib
+
+
+def lazy_attributes(module_name: str, attributes: dict):
+    """
+    Creates module level `__getattr__` and `__dir__` which import the
+    attributes on their first access.
+
+    .. code-block:: python
+
+        __getattr__, __dir__ = lazy_attributes(__name__, {
+            "Palette": "SecretColors.models.palette"})
+
+    :param module_name: Name of the module (i.e. `__name__`)
+    :param attributes: Attribute name -> name of the module which defines it
+    :return: `__getattr__` and `__dir__` functions
+    """
+    module_globals = importlib.import_module(module_name).__dict__
+
+    def __getattr__(name):
+        if name in attributes:
+            value = getattr(importlib.import_module(attributes[name]), name)
+            # Cache in the module so that __getattr__ is not called again
+            module_globals[name] = value
+            return value
+        raise AttributeError(f"module '{module_name}' has no attribute "
+                             f"'{name}'")
+
+    def __dir__():
+        return sorted(set(module_globals) | set(attributes))
+
+    return __getattr__, __dir__
@@ -5,19 +5,44 @@
 #  Website: https://github.com/secretBiology/SecretColors
 #
 #  Logging util class
+#
+#  Logging is called from the hot paths (e.g. Color.shade). Hence every
+#  method first checks if the record will be emitted at all. Messages accept
+#  lazy %-style arguments (formatted only when emitted) and the caller is
+#  found with sys._getframe only for emitted records. Handlers are attached
+#  once per process (per destination and format).
 
-import inspect
 import logging
 import os
+import sys
+import threading
 from typing import Type
 
+LOGGER_NAME = "SecretColors"
+DEFAULT_FORMAT = "%(asctime)s %(script)s [%(levelname)s] : %(message)s"
+
+_handlers = {}
+_handlers_lock = threading.Lock()
+
 
-class LogFilter(object):
-    def __init__(self, level):
-        self.__level = level
+def _get_logger() -> logging.Logger:
+    logger = logging.getLogger(LOGGER_NAME)
+    if logger.level == logging.NOTSET:
+        # Levels are checked by Log objects themselves
+        logger.setLevel(logging.DEBUG)
+    return logger
 
-    def filter(self, log_record):
-        return log_record.levelno > self.__level
+
+def _attach_handler(key: tuple, factory, logging_format: str):
+    # Same handler (console or same file with same format) is never attached
+    # twice, no matter how many Log objects are created
+    with _handlers_lock:
+        if key not in _handlers:
+            handler = factory()
+            handler.setFormatter(logging.Formatter(logging_format))
+            _get_logger().addHandler(handler)
+            _handlers[key] = handler
+        return _handlers[key]
 
 
 class Log:
@@ -27,10 +52,9 @@ class Log:
                  add_to_file: bool = False,
                  min_log_level: int = -1,
                  filename: str = "SecretColor.log",
-                 logging_format: str = "%(asctime)s %(script)s [%("
-                                       "levelname)s] : %(message)s"):
+                 logging_format: str = DEFAULT_FORMAT):
         self.show_log = show_log
-        self.formatter = logging.Formatter(logging_format)
+        self.logging_format = logging_format
         self.add_to_console = add_to_console
         self.add_to_file = add_to_file
         self.filename = filename
@@ -38,64 +62,61 @@ class Log:
         self.min_log_level = min_log_level
 
     @property
-    def log_object(self):
+    def formatter(self) -> logging.Formatter:
+        return logging.Formatter(self.logging_format)
+
+    @property
+    def log_object(self) -> logging.Logger:
         if self._log_object is None:
-            self._log_object = logging.getLogger("log")
             if self.add_to_console:
-                console = logging.StreamHandler()
-                console.setFormatter(self.formatter)
-                console.addFilter(LogFilter(self.min_log_level))
-                self._log_object.addHandler(console)
-
+                _attach_handler(("console", self.logging_format),
+                                logging.StreamHandler, self.logging_format)
             if self.add_to_file:
-                log_file = logging.FileHandler(self.filename)
-                log_file.setFormatter(self.formatter)
-                log_file.addFilter(LogFilter(self.min_log_level))
-                self._log_object.addHandler(log_file)
+                path = os.path.abspath(self.filename)
+                _attach_handler(("file", path, self.logging_format),
+                                lambda: logging.FileHandler(path),
+                                self.logging_format)
+            self._log_object = _get_logger()
         return self._log_object
 
-    def info(self, message):
-        if self.show_log:
-            self.log_object.setLevel(logging.INFO)
-            frame = inspect.stack()[1]
-            module = inspect.getmodule(frame[0])
-            filename = os.path.basename(module.__file__)
-            self.log_object.info(message, extra={"script": filename})
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        :param level: Logging level (e.g. logging.DEBUG)
+        :return: True if message with given level will be emitted
+        """
+        return self.show_log and level > self.min_log_level
+
+    def _emit(self, level: int, message, args):
+        # Frame 0: _emit, 1: Log method, 2: caller
+        filename = os.path.basename(sys._getframe(2).f_code.co_filename)
+        self.log_object.log(level, message, *args,
+                            extra={"script": filename})
+
+    def info(self, message, *args):
+        if self.show_log and logging.INFO > self.min_log_level:
+            self._emit(logging.INFO, message, args)
 
-    def error(self, message, raise_exception=True,
+    def error(self, message, *args, raise_exception=True,
               exception: Type[Exception] = None):
-        if self.show_log:
-            self.log_object.setLevel(logging.ERROR)
-            frame = inspect.stack()[1]
-            module = inspect.getmodule(frame[0])
-            filename = os.path.basename(module.__file__)
-            self.log_object.error(message, extra={"script": filename})
+        if self.show_log and logging.ERROR > self.min_log_level:
+            self._emit(logging.ERROR, message, args)
 
         if raise_exception:
+            if args:
+                message = message % args
             if exception is None:
                 raise Exception(message)
             else:
                 raise exception(message)
 
-    def warn(self, message):
-        if self.show_log:
-            self.log_object.setLevel(logging.WARN)
-            frame = inspect.stack()[1]
-            module = inspect.getmodule(frame[0])
-            filename = os.path.basename(module.__file__)
-            self.log_object.warning(message, extra={"script": filename})
-
-    def debug(self, message):
-        if self.show_log:
-            self.log_object.setLevel(logging.DEBUG)
-            frame = inspect.stack()[1]
-            module = inspect.getmodule(frame[0])
-            filename = os.path.basename(module.__file__)
-            self.log_object.debug(message, extra={"script": filename})
-
-    def deprecated(self, message):
-        self.log_object.setLevel(logging.WARN)
-        frame = inspect.stack()[1]
-        module = inspect.getmodule(frame[0])
-        filename = os.path.basename(module.__file__)
-        self.log_object.warning(message, extra={"script": filename})
+    def warn(self, message, *args):
+        if self.show_log and logging.WARNING > self.min_log_level:
+            self._emit(logging.WARNING, message, args)
+
+    def debug(self, message, *args):
+        if self.show_log and logging.DEBUG > self.min_log_level:
+            self._emit(logging.DEBUG, message, args)
+
+    def deprecated(self, message, *args):
+        # Deprecation warnings are shown even when logging is off
+        self._emit(logging.WARNING, message, args)
@@ -0,0 +1,151 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Memory footprint (retained size measured with tracemalloc) of the library
+#  objects and data modules.
+#
+#  python -m SecretColors.helpers.memory
+#
+#  Only the memory which is still referenced after the object is created
+#  (and garbage is collected) is counted. Objects are created once before
+#  measurement so lazy imports and shared caches are not counted.
+
+import gc
+import importlib
+import sys
+import tracemalloc
+
+from SecretColors.data.constants import ALL_PALETTES
+from SecretColors.data.cmaps.packed import DATASETS
+
+# Data modules loaded lazily by the library
+DATA_MODULES = [
+    "SecretColors.data.palettes.ibm",
+    "SecretColors.data.palettes.material",
+    "SecretColors.data.palettes.brewer",
+    "SecretColors.data.palettes.clarity",
+    "SecretColors.data.palettes.tableau",
+    "SecretColors.data.names.w3",
+    "SecretColors.data.names.x11",
+    "SecretColors.data.rgb_xyz",
+    *[module for module, _ in DATASETS.values()],
+]
+
+
+def _traced(function):
+    # Returns (result, retained bytes, retained blocks)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        result = function()
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    size = sum(x.size_diff for x in diff)
+    blocks = sum(x.count_diff for x in diff)
+    return result, size, blocks
+
+
+def measure(factory, count: int = 1) -> dict:
+    """
+    Retained size of the objects created by the factory.
+
+    >>> measure(lambda: Palette("material"))
+    >>> measure(lambda: ColorString("#fb4b53"), count=1000) # Per instance
+
+    :param factory: Function without arguments which creates the object
+    :param count: Number of objects to create (result is per object)
+    :return: Dictionary with 'bytes' and 'blocks' (per object)
+    """
+    factory()  # Lazy imports, caches etc.
+    objects, size, blocks = _traced(lambda: [factory() for _ in range(count)])
+    del objects
+    return {"bytes": size / count, "blocks": blocks / count}
+
+
+def measure_module(name: str) -> dict:
+    """
+    Retained size of a freshly imported module. If the module is already
+    imported, it is imported again and the original module is restored
+    afterwards.
+
+    :param name: Full name of the module
+    :return: Dictionary with 'bytes' and 'blocks'
+    """
+    original = sys.modules.pop(name, None)
+    try:
+        module, size, blocks = _traced(lambda: importlib.import_module(name))
+    finally:
+        if original is not None:
+            sys.modules[name] = original
+            parent, _, child = name.rpartition(".")
+            if parent in sys.modules:
+                setattr(sys.modules[parent], child, original)
+    del module
+    return {"bytes": size, "blocks": blocks}
+
+
+def materialized_palette(name: str):
+    """
+    :param name: Name of the palette
+    :return: Palette with all Color objects and their shade stops created
+    """
+    from SecretColors.models.palette import Palette
+    p = Palette(name)
+    for color in p.colors.values():
+        color.values  # Creates _RawColor stops
+    return p
+
+
+def memory_report(palettes: list = None, modules: list = None) -> dict:
+    """
+    :param palettes: Names of palettes (default: all palettes)
+    :param modules: Names of the data modules (default: DATA_MODULES)
+    :return: Dictionary of item name -> {'bytes', 'blocks'}
+    """
+    from SecretColors.cmaps import BrewerMap
+    from SecretColors.helpers.logging import Log
+    from SecretColors.models.objects import ColorString, ColorTuple
+
+    if palettes is None:
+        palettes = ALL_PALETTES
+    if modules is None:
+        modules = DATA_MODULES
+    report = {}
+    for name in palettes:
+        report[f"palette.{name}"] = measure(
+            lambda: materialized_palette(name))
+    report["object.Log"] = measure(Log, count=1000)
+    report["object.ColorString"] = measure(
+        lambda: ColorString("#fb4b53"), count=1000)
+    report["object.ColorTuple"] = measure(
+        lambda: ColorTuple((0.98, 0.29, 0.32)), count=1000)
+    report["object.BrewerMap"] = measure(BrewerMap, count=100)
+    for module in modules:
+        report[f"module.{module}"] = measure_module(module)
+    return report
+
+
+def format_report(report: dict) -> str:
+    """
+    :param report: Output of :func:`memory_report`
+    :return: Report as a table
+    """
+    lines = [f"{'item':<45} {'bytes':>12} {'blocks':>9}"]
+    for name, value in report.items():
+        lines.append(f"{name:<45} {value['bytes']:12,.0f} "
+                     f"{value['blocks']:9,.1f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_report(memory_report()))
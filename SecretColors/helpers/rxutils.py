@@ -12,10 +12,10 @@
 #
 #  All special RGB to XYZ conversions
 
-from SecretColors.data.rgb_xyz import RX_DATA
-
 
 def _get_matrix(name: str, white: str):
+    # Conversion tables are loaded on the first conversion
+    from SecretColors.data.rgb_xyz import RX_DATA
     name = name.strip().lower()
     white = white.strip().upper()
     if name not in RX_DATA.keys():
@@ -117,3 +117,120 @@ def convert_xyz_to_rgb(x, y, z, *, space, reference, clip=True):
     return _convert_to_rgb(x, y, z,
                            matrix=_get_matrix(space, reference),
                            clip=clip)
+
+
+def white_reference(reference: str = "D65", space: str = None) -> tuple:
+    """
+    CIE-XYZ of the reference white (i.e. RGB 1, 1, 1) of given RGB space
+
+    :param reference: White Illumination Reference (e.g. D65, D50, E, C)
+    :param space: Name of the specific RGB colorspace. If not provided,
+        sRGB (or the first space which has given reference) is used.
+    :return: X, Y, Z (Y = 1)
+    """
+    if space is None:
+        from SecretColors.data.rgb_xyz import RX_DATA
+        white = reference.strip().upper()
+        space = next((k for k in ["srgb", *RX_DATA] if white in RX_DATA[k]),
+                     "srgb")
+    matrix = _get_matrix(space, reference)["xyz"]
+    return tuple(sum(matrix[k]) for k in ["x", "y", "z"])
+
+
+def xyz_to_linear_rgb(x, y, z, *, space, reference):
+    """
+    Same as :func:`convert_xyz_to_rgb` but without validation and clipping.
+    Useful for XYZ values outside 0-1 (e.g. white reference Z).
+
+    :param x: X
+    :param y: Y
+    :param z: Z
+    :param space: Name of the specific RGB colorspace
+    :param reference: White Illumination Reference (e.g. D65)
+    :return: Linear RGB (can be outside 0-1)
+    """
+    matrix = _get_matrix(space, reference)["rgb"]
+    xyz = [x, y, z]
+    return tuple(_apply(matrix[k], xyz, False) for k in ["r", "g", "b"])
+
+
+def _companding(space: str):
+    from SecretColors.data.rgb_xyz import RX_COMPANDING
+    space = space.strip().lower()
+    if space not in RX_COMPANDING:
+        raise AttributeError(f"'{space}' is not available in our current RGB "
+                             f"conversion tables. Available RGB options are "
+                             f"{list(RX_COMPANDING.keys())}")
+    return RX_COMPANDING[space]
+
+
+def native_white(space: str) -> str:
+    """
+    :param space: Name of the specific RGB colorspace
+    :return: Native white reference of the space (e.g. D65 for sRGB)
+    """
+    from SecretColors.data.rgb_xyz import RX_DATA
+    _companding(space)
+    return next(iter(RX_DATA[space.strip().lower()]))
+
+
+def _decode(np, values, companding):
+    # Encoded RGB -> linear RGB (sign is kept for negative values)
+    if companding == "srgb":
+        from SecretColors.helpers.vectorized import srgb_to_linear
+        return np.sign(values) * srgb_to_linear(np.abs(values))
+    if companding == "l_star":
+        v = np.abs(values) * 100
+        linear = np.where(v > 8, ((v + 16) / 116) ** 3, v * 27 / 24389)
+        return np.sign(values) * linear
+    return np.sign(values) * np.abs(values) ** companding
+
+
+def _encode(np, values, companding):
+    # Linear RGB -> encoded RGB
+    if companding == "srgb":
+        from SecretColors.helpers.vectorized import linear_to_srgb
+        return np.sign(values) * linear_to_srgb(np.abs(values))
+    if companding == "l_star":
+        v = np.abs(values)
+        encoded = np.where(v > 216 / 24389, 116 * np.cbrt(v) - 16,
+                           v * 24389 / 27) / 100
+        return np.sign(values) * encoded
+    return np.sign(values) * np.abs(values) ** (1 / companding)
+
+
+def convert_rgb_space(data, src: str = "adobe", dst: str = "srgb",
+                      reference: str = None, *, dst_reference: str = None,
+                      method: str = "bradford", clip: bool = True):
+    """
+    Converts (gamma encoded) RGB colors of one RGB space to another with a
+    single precomposed matrix. Transfer curves are applied on the whole
+    array and values are clipped only at the end.
+
+    >>> convert_rgb_space(pixels, "adobe", "srgb") # (H, W, 3) array
+    >>> convert_rgb_space(colors, "apple", "pro_photo") # D65 -> D50 adapted
+
+    :param data: RGB values (between 0-1) with channels on the last axis,
+        e.g. (3,), (N, 3) or (H, W, 3)
+    :param src: Name of the input RGB space
+    :param dst: Name of the output RGB space
+    :param reference: White reference of the input (default: native white
+        of the input space)
+    :param dst_reference: White reference of the output (default: native
+        white of the output space). Colors are adapted when the whites are
+        different.
+    :param method: Chromatic adaptation method (bradford, von_kries, cat02)
+    :param clip: If True, output is clipped to 0-1
+    :return: float64 NumPy array with the same shape
+    """
+    import numpy as np
+    from SecretColors.helpers.adaptation import apply_matrix, fused_matrix
+
+    reference = reference or native_white(src)
+    dst_reference = dst_reference or native_white(dst)
+    matrix = fused_matrix(src, reference, dst, dst_reference, method)
+    linear = _decode(np, np.asarray(data, dtype=np.float64), _companding(src))
+    values = _encode(np, apply_matrix(linear, matrix), _companding(dst))
+    if clip:
+        np.clip(values, 0, 1, out=values)
+    return values
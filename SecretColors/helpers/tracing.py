@@ -0,0 +1,282 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Opt-in call tracing of the named color and colormap methods (the ones
+#  decorated with `color_docs` and `cmap_docs`, e.g. Palette.red,
+#  BrewerMap.spectral).
+#
+#  By default the decorators only set the docstring and return the original
+#  method (no wrapper). When tracing is enabled (with `enable()` or by setting
+#  SECRET_COLORS_TRACE=1 before import), methods are replaced by wrappers
+#  which record call counts, cumulative and self time and the shapes of the
+#  arguments. Results can be exported as `pstats.Stats` or as Chrome trace
+#  JSON (chrome://tracing, Perfetto).
+
+import os
+import sys
+import threading
+import time
+
+MAX_EVENTS = 100000  # Chrome trace events kept in the memory
+
+_enabled = os.environ.get("SECRET_COLORS_TRACE", "").strip().lower() in [
+    "1", "true", "yes", "on"]
+
+_registered = []  # Original functions
+_wrappers = {}  # Original function -> wrapper
+_stats = {}  # Function key -> _FunctionStats
+_events = []
+_dropped = 0
+_origin = time.perf_counter()
+_local = threading.local()
+_lock = threading.Lock()
+
+
+class _FunctionStats:
+    __slots__ = ("calls", "primitive_calls", "total_time", "cumulative_time",
+                 "callers", "shapes")
+
+    def __init__(self):
+        self.calls = 0
+        self.primitive_calls = 0
+        self.total_time = 0.0  # Self time
+        self.cumulative_time = 0.0
+        self.callers = {}  # Caller key -> [calls, primitive, self, cum]
+        self.shapes = {}  # Argument shape -> calls
+
+
+def _key(func) -> tuple:
+    code = func.__code__
+    return code.co_filename, code.co_firstlineno, func.__qualname__
+
+
+def _shape(value) -> str:
+    name = type(value).__name__
+    shape = getattr(value, "shape", None)
+    if isinstance(shape, tuple):
+        return f"{name}{list(shape)}"
+    if isinstance(value, (list, tuple)):
+        return f"{name}[{len(value)}]"
+    return name
+
+
+def argument_shape(args: tuple, kwargs: dict) -> str:
+    """
+    :param args: Positional arguments (without self)
+    :param kwargs: Keyword arguments
+    :return: Shape of the arguments, e.g. 'float, no_of_colors=int'
+    """
+    parts = [_shape(x) for x in args]
+    parts.extend(f"{k}={_shape(v)}" for k, v in sorted(kwargs.items()))
+    return ", ".join(parts)
+
+
+def _stack() -> list:
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def _record(key, caller, shape, start, elapsed, child, recursive):
+    global _dropped
+    with _lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = _FunctionStats()
+        stats.calls += 1
+        stats.total_time += elapsed - child
+        if not recursive:
+            stats.primitive_calls += 1
+            stats.cumulative_time += elapsed
+        stats.shapes[shape] = stats.shapes.get(shape, 0) + 1
+        if caller is not None:
+            c = stats.callers.setdefault(caller, [0, 0, 0.0, 0.0])
+            c[0] += 1
+            c[2] += elapsed - child
+            if not recursive:
+                c[1] += 1
+                c[3] += elapsed
+        if len(_events) < MAX_EVENTS:
+            _events.append((key[2], start, elapsed, shape,
+                            threading.get_ident()))
+        else:
+            _dropped += 1
+
+
+def _trace(func):
+    key = _key(func)
+
+    def wrap(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        stack = _stack()
+        caller = stack[-1][0] if stack else None
+        recursive = any(x[0] == key for x in stack)
+        frame = [key, 0.0]  # [key, time spent in traced children]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            _record(key, caller, argument_shape(args[1:], kwargs), start,
+                    elapsed, frame[1], recursive)
+
+    for attr in ["__module__", "__name__", "__qualname__", "__doc__"]:
+        setattr(wrap, attr, getattr(func, attr))
+    wrap.__wrapped__ = func
+    wrap.__dict__.update(func.__dict__)
+    return wrap
+
+
+def _owner(func):
+    # Class (or module) in which the function is defined
+    parts = func.__qualname__.split(".")
+    if "<locals>" in parts:
+        return None
+    owner = sys.modules.get(func.__module__)
+    for p in parts[:-1]:
+        owner = getattr(owner, p, None)
+    return owner
+
+
+def register(func):
+    """
+    Registers method for tracing. Used by `color_docs` and `cmap_docs`.
+
+    :param func: Function to trace
+    :return: Same function if tracing is disabled, otherwise a wrapper
+    """
+    _registered.append(func)
+    if _enabled:
+        return _wrappers.setdefault(func, _trace(func))
+    return func
+
+
+def _install(replace: bool):
+    for func in _registered:
+        owner = _owner(func)
+        if owner is None:
+            continue
+        wrapper = _wrappers.setdefault(func, _trace(func))
+        current = owner.__dict__.get(func.__name__) if isinstance(
+            owner, type) else getattr(owner, func.__name__, None)
+        if replace and current is func:
+            setattr(owner, func.__name__, wrapper)
+        elif not replace and current is wrapper:
+            setattr(owner, func.__name__, func)
+
+
+def enable():
+    """Starts tracing of all registered methods"""
+    global _enabled
+    _enabled = True
+    _install(replace=True)
+
+
+def disable():
+    """Stops tracing and restores the original methods (recorded data is
+    kept)
+    """
+    global _enabled
+    _enabled = False
+    _install(replace=False)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Removes all recorded data"""
+    global _dropped, _origin
+    with _lock:
+        _stats.clear()
+        _events.clear()
+        _dropped = 0
+        _origin = time.perf_counter()
+
+
+def stats() -> dict:
+    """
+    :return: Dictionary of method name -> calls, cumulative time, self time
+        and argument shape histogram
+    """
+    with _lock:
+        return {key[2]: {"calls": s.calls,
+                         "cumulative_time": s.cumulative_time,
+                         "self_time": s.total_time,
+                         "shapes": dict(s.shapes)}
+                for key, s in _stats.items()}
+
+
+class _Profile:
+    # Minimal profiler-like object accepted by pstats.Stats
+    def __init__(self, data):
+        self.stats = data
+
+    def create_stats(self):
+        pass
+
+
+def _pstats_data() -> dict:
+    with _lock:
+        return {key: (s.primitive_calls, s.calls, s.total_time,
+                      s.cumulative_time,
+                      {c: tuple(v) for c, v in s.callers.items()})
+                for key, s in _stats.items()}
+
+
+def to_pstats():
+    """
+    >>> tracing.to_pstats().sort_stats("cumulative").print_stats(10)
+
+    :return: `pstats.Stats` object with recorded data
+    """
+    import pstats
+    return pstats.Stats(_Profile(_pstats_data()))
+
+
+def dump_stats(filename: str):
+    """
+    Writes data in the same format as `cProfile` (it can be opened with
+    `pstats`, snakeviz etc.)
+
+    :param filename: Name of the output file
+    """
+    import marshal
+    with open(filename, "wb") as f:
+        marshal.dump(_pstats_data(), f)
+
+
+def to_chrome_trace() -> dict:
+    """
+    :return: Recorded calls as Chrome trace event data. Save it with
+        `json.dump` and open in chrome://tracing or Perfetto.
+    """
+    pid = os.getpid()
+    with _lock:
+        events = [{"name": name, "cat": "SecretColors", "ph": "X",
+                   "ts": (start - _origin) * 1e6, "dur": elapsed * 1e6,
+                   "pid": pid, "tid": tid, "args": {"shape": shape}}
+                  for name, start, elapsed, shape, tid in _events]
+        dropped = _dropped
+    return {"traceEvents": events, "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": dropped}}
+
+
+def write_chrome_trace(filename: str):
+    """
+    :param filename: Name of the output JSON file
+    """
+    import json
+    with open(filename, "w") as f:
+        json.dump(to_chrome_trace(), f)
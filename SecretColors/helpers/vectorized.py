@@ -0,0 +1,420 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Vectorized (NumPy) counterparts of the conversion functions available in
+#  SecretColors.utils. All functions work on arrays where the last axis holds
+#  the color channels, e.g. (3,), (N, 3) or (H, W, 3).
+#
+#  NumPy is an optional dependency of SecretColors. Import this module only
+#  when array input is expected.
+
+import numpy as np
+
+# Linear sRGB -> LMS and LMS' -> OKLab (https://bottosson.github.io/posts/oklab/)
+_OKLAB_M1 = np.array([[0.4122214708, 0.5363325363, 0.0514459929],
+                      [0.2119034982, 0.6806995451, 0.1073969566],
+                      [0.0883024619, 0.2817188376, 0.6299787005]])
+_OKLAB_M2 = np.array([[0.2104542553, 0.7936177850, -0.0040720468],
+                      [1.9779984951, -2.4285922050, 0.4505937099],
+                      [0.0259040371, 0.7827717662, -0.8086757660]])
+_OKLAB_M2_INV = np.array([[1, 0.3963377774, 0.2158037573],
+                          [1, -0.1055613458, -0.0638541728],
+                          [1, -0.0894841775, -1.2914855480]])
+_OKLAB_M1_INV = np.array([[4.0767416621, -3.3077115913, 0.2309699292],
+                          [-1.2684380046, 2.6097574011, -0.3413193965],
+                          [-0.0041960863, -0.7034186147, 1.7076147010]])
+
+
+def as_float_array(values) -> np.ndarray:
+    """
+    :param values: Array-like colors with channels on the last axis
+    :return: float64 array (no copy if already float64)
+    """
+    return np.asarray(values, dtype=np.float64)
+
+
+def _matmul(values: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    return values @ matrix.T
+
+
+def srgb_to_linear(values) -> np.ndarray:
+    """
+    Removes sRGB gamma (vectorized version of `apply_linear_transform`)
+
+    :param values: Gamma encoded values (between 0-1)
+    :return: Linear-light values
+    """
+    values = as_float_array(values)
+    return np.where(values > 0.04045,
+                    np.power((np.maximum(values, 0.04045) + 0.055) / 1.055,
+                             2.4),
+                    values / 12.92)
+
+
+def linear_to_srgb(values) -> np.ndarray:
+    """
+    Applies sRGB gamma (vectorized version of `apply_gamma_transform`)
+
+    :param values: Linear-light values (between 0-1)
+    :return: Gamma encoded values
+    """
+    values = as_float_array(values)
+    return np.where(values > 0.0031308,
+                    1.055 * np.power(np.maximum(values, 0.0031308),
+                                     1 / 2.4) - 0.055,
+                    12.92 * values)
+
+
+def linear_rgb_to_oklab(values) -> np.ndarray:
+    """
+    :param values: Linear sRGB (can be outside 0-1)
+    :return: OKLab values
+    """
+    lms = _matmul(as_float_array(values), _OKLAB_M1)
+    return _matmul(np.cbrt(lms), _OKLAB_M2)
+
+
+def rgb_to_oklab(values) -> np.ndarray:
+    """
+    :param values: RGB (gamma encoded sRGB, between 0-1)
+    :return: OKLab values
+    """
+    return linear_rgb_to_oklab(srgb_to_linear(values))
+
+
+def oklab_to_rgb(values, clip: bool = True) -> np.ndarray:
+    """
+    :param values: OKLab values
+    :param clip: If True, values below 0 and above 1 will be clipped
+    :return: RGB (gamma encoded sRGB)
+    """
+    lms = _matmul(as_float_array(values), _OKLAB_M2_INV) ** 3
+    rgb = _matmul(lms, _OKLAB_M1_INV)
+    if clip:
+        rgb = np.clip(rgb, 0, 1)
+    return np.sign(rgb) * linear_to_srgb(np.abs(rgb))
+
+
+_LAB_EPSILON = 216 / 24389
+_LAB_KAPPA = 24389 / 27
+_xyz_matrices = {}
+_whites = {}
+
+
+def _xyz_matrix(space: str, reference: str, inverse: bool):
+    # RGB -> XYZ or XYZ -> RGB matrix from RX_DATA
+    key = (space, reference, inverse)
+    if key not in _xyz_matrices:
+        from SecretColors.helpers.rxutils import _get_matrix
+        data = _get_matrix(space, reference)
+        if inverse:
+            matrix = np.array([data["rgb"][k] for k in "rgb"])
+        else:
+            matrix = np.array([data["xyz"][k] for k in "xyz"])
+        _xyz_matrices[key] = matrix
+    return _xyz_matrices[key]
+
+
+def _white(reference: str) -> np.ndarray:
+    # Same lookup as the scalar conversions (sRGB or first space which has
+    # given reference)
+    if reference not in _whites:
+        from SecretColors.helpers.rxutils import white_reference
+        _whites[reference] = np.array(white_reference(reference))
+    return _whites[reference]
+
+
+def linear_rgb_to_xyz(values, space: str = "srgb",
+                      reference: str = "D65") -> np.ndarray:
+    """
+    :param values: Linear RGB of given space
+    :param space: Name of the RGB colorspace (as in `RX_DATA`)
+    :param reference: White reference
+    :return: CIE-XYZ (not clipped)
+    """
+    matrix = _xyz_matrix(space, reference, False)
+    return _matmul(as_float_array(values), matrix)
+
+
+def xyz_to_linear_rgb(values, space: str = "srgb",
+                      reference: str = "D65") -> np.ndarray:
+    """
+    :param values: CIE-XYZ
+    :param space: Name of the RGB colorspace (as in `RX_DATA`)
+    :param reference: White reference
+    :return: Linear RGB of given space (not clipped)
+    """
+    matrix = _xyz_matrix(space, reference, True)
+    return _matmul(as_float_array(values), matrix)
+
+
+def xyz_to_lab(values, reference: str = "D65") -> np.ndarray:
+    """
+    Vectorized version of `SecretColors.utils.xyz_to_lab`
+
+    :param values: CIE-XYZ (Y of the reference white is 1)
+    :param reference: White reference
+    :return: CIELAB
+    """
+    white = _white(reference)
+    t = as_float_array(values) / white
+    f = np.where(t > _LAB_EPSILON, np.cbrt(t),
+                 (_LAB_KAPPA * t + 16) / 116)
+    fx, fy, fz = f[..., 0], f[..., 1], f[..., 2]
+    return np.stack([116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)],
+                    axis=-1)
+
+
+def lab_to_xyz(values, reference: str = "D65") -> np.ndarray:
+    """
+    Vectorized version of `SecretColors.utils.lab_to_xyz`
+
+    :param values: CIELAB
+    :param reference: White reference
+    :return: CIE-XYZ (Y of the reference white is 1)
+    """
+    white = _white(reference)
+    values = as_float_array(values)
+    l = values[..., 0]
+    fy = (l + 16) / 116
+    f = np.stack([fy + values[..., 1] / 500, fy, fy - values[..., 2] / 200],
+                 axis=-1)
+    cube = f ** 3
+    t = np.where(cube > _LAB_EPSILON, cube, (116 * f - 16) / _LAB_KAPPA)
+    t[..., 1] = np.where(l > _LAB_KAPPA * _LAB_EPSILON, cube[..., 1],
+                         l / _LAB_KAPPA)
+    return t * white
+
+
+def rgb_to_lab(values, reference: str = "D65") -> np.ndarray:
+    """
+    :param values: RGB (gamma encoded sRGB, between 0-1)
+    :param reference: White reference
+    :return: CIELAB values
+    """
+    xyz = linear_rgb_to_xyz(srgb_to_linear(values), "srgb", reference)
+    return xyz_to_lab(xyz, reference)
+
+
+def lab_to_rgb(values, reference: str = "D65",
+               clip: bool = True) -> np.ndarray:
+    """
+    :param values: CIELAB values
+    :param reference: White reference
+    :param clip: If True, values below 0 and above 1 will be clipped
+    :return: RGB (gamma encoded sRGB)
+    """
+    rgb = xyz_to_linear_rgb(lab_to_xyz(values, reference), "srgb", reference)
+    if clip:
+        rgb = np.clip(rgb, 0, 1)
+    return np.sign(rgb) * linear_to_srgb(np.abs(rgb))
+
+
+def lab_to_lch(values) -> np.ndarray:
+    """
+    :param values: CIELAB or OKLab values
+    :return: Lightness, Chroma, Hue (in degrees, 0-360)
+    """
+    values = as_float_array(values)
+    a, b = values[..., 1], values[..., 2]
+    h = np.degrees(np.arctan2(b, a)) % 360
+    return np.stack([values[..., 0], np.hypot(a, b), h], axis=-1)
+
+
+def lch_to_lab(values) -> np.ndarray:
+    """
+    :param values: LCh values (hue in degrees)
+    :return: Lightness, a, b
+    """
+    values = as_float_array(values)
+    h = np.radians(values[..., 2])
+    c = values[..., 1]
+    return np.stack([values[..., 0], c * np.cos(h), c * np.sin(h)], axis=-1)
+
+
+def rgb_to_lch(values, reference: str = "D65") -> np.ndarray:
+    """
+    :param values: RGB (gamma encoded sRGB, between 0-1)
+    :param reference: White reference
+    :return: CIE-LCh(ab) values
+    """
+    return lab_to_lch(rgb_to_lab(values, reference))
+
+
+def lch_to_rgb(values, reference: str = "D65",
+               clip: bool = True) -> np.ndarray:
+    """
+    :param values: CIE-LCh(ab) values
+    :param reference: White reference
+    :param clip: If True, values below 0 and above 1 will be clipped
+    :return: RGB (gamma encoded sRGB)
+    """
+    return lab_to_rgb(lch_to_lab(values), reference, clip)
+
+
+def rgb_to_oklch(values) -> np.ndarray:
+    """
+    :param values: RGB (gamma encoded sRGB, between 0-1)
+    :return: OKLCh values
+    """
+    return lab_to_lch(rgb_to_oklab(values))
+
+
+def oklch_to_rgb(values, clip: bool = True) -> np.ndarray:
+    """
+    :param values: OKLCh values
+    :param clip: If True, values below 0 and above 1 will be clipped
+    :return: RGB (gamma encoded sRGB)
+    """
+    return oklab_to_rgb(lch_to_lab(values), clip)
+
+
+def hex_to_rgba255(hex_list) -> np.ndarray:
+    """
+    Parses list of hex strings in one go
+
+    :param hex_list: Hex colors (3, 6 or 8 characters, with or without '#')
+    :return: (N, 4) uint8 array (alpha is 255 when not provided)
+    """
+    clean = []
+    for h in hex_list:
+        h = h.strip().lstrip("#")
+        if len(h) == 3:
+            h = "{0}{0}{1}{1}{2}{2}".format(*h)
+        if len(h) == 6:
+            h += "ff"
+        if len(h) != 8:
+            raise ValueError(f"Invalid Hex code '{h}' for conversion")
+        clean.append(h)
+    try:
+        raw = bytes.fromhex("".join(clean))
+    except ValueError:
+        raise ValueError("Provided list contains invalid hex color") from None
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, 4).copy()
+
+
+def rgba255_to_hex(values, alpha: bool = False) -> list:
+    """
+    :param values: (N, 3) or (N, 4) uint8 array
+    :param alpha: If True, alpha will be appended (#rrggbbaa)
+    :return: List of hex strings
+    """
+    values = np.ascontiguousarray(values, dtype=np.uint8)
+    width = 4 if alpha else 3
+    if values.shape[-1] < width:
+        values = np.concatenate(
+            [values, np.full(values.shape[:-1] + (1,), 255, np.uint8)],
+            axis=-1)
+    raw = values[..., :width].reshape(-1, width).tobytes().hex()
+    step = width * 2
+    return ["#" + raw[i:i + step] for i in range(0, len(raw), step)]
+
+
+def pack_rgba255(values) -> np.ndarray:
+    """
+    :param values: (N, 3) or (N, 4) array with values between 0-255
+    :return: (N,) uint32 array of 0xRRGGBBAA values
+    """
+    values = np.asarray(values).astype(np.uint32)
+    packed = (values[..., 0] << 24) | (values[..., 1] << 16) | (
+            values[..., 2] << 8)
+    if values.shape[-1] > 3:
+        return packed | values[..., 3]
+    return packed | np.uint32(0xFF)
+
+
+def unpack_rgba255(packed) -> np.ndarray:
+    """
+    :param packed: uint32 array of 0xRRGGBBAA values
+    :return: (..., 4) uint8 array
+    """
+    packed = np.asarray(packed, dtype=np.uint32)
+    shifts = np.array([24, 16, 8, 0], dtype=np.uint32)
+    return ((packed[..., None] >> shifts) & 0xFF).astype(np.uint8)
+
+
+def rgb_to_hsl(values) -> np.ndarray:
+    """
+    Vectorized version of `SecretColors.utils.rgb_to_hsl`
+
+    :param values: RGB (between 0-1)
+    :return: HSL (all between 0-1)
+    """
+    values = as_float_array(values)
+    r, g, b = values[..., 0], values[..., 1], values[..., 2]
+    max_rgb = values[..., :3].max(axis=-1)
+    min_rgb = values[..., :3].min(axis=-1)
+    delta = max_rgb - min_rgb
+    l = (max_rgb + min_rgb) / 2
+    gray = delta == 0
+    safe = np.where(gray, 1, delta)
+    s = np.where(l < 0.5, delta / np.where(gray, 1, max_rgb + min_rgb),
+                 delta / np.where(gray, 1, 2 - max_rgb - min_rgb))
+    h = np.where(max_rgb == r, ((g - b) / safe) % 6,
+                 np.where(max_rgb == g, (b - r) / safe + 2,
+                          (r - g) / safe + 4)) / 6
+    h = np.where(gray, 0, h)
+    s = np.where(gray, 0, s)
+    return np.stack([h, s, l], axis=-1)
+
+
+def hsl_to_rgb(values) -> np.ndarray:
+    """
+    Vectorized version of `SecretColors.utils.hsl_to_rgb`
+
+    :param values: HSL (between 0-1)
+    :return: RGB (between 0-1)
+    """
+    values = as_float_array(values)
+    h, s, l = values[..., 0], values[..., 1], values[..., 2]
+    q = np.where(l < 0.5, l * (1 + s), l + s - l * s)
+    p = 2 * l - q
+    channels = []
+    for offset in (1 / 3, 0, -1 / 3):
+        t = (h + offset) % 1
+        c = np.where(6 * t < 1, p + (q - p) * 6 * t,
+                     np.where(2 * t < 1, q,
+                              np.where(3 * t < 2, p + (q - p) * (2 / 3 - t) * 6,
+                                       p)))
+        channels.append(c)
+    return np.stack(channels, axis=-1)
+
+
+def rgb_to_cmyk(values) -> np.ndarray:
+    """
+    :param values: RGB (between 0-1)
+    :return: CMYK (all between 0-1); black gives (0, 0, 0, 1)
+    """
+    values = as_float_array(values)
+    k = 1 - values[..., :3].max(axis=-1)
+    scale = np.where(k < 1, 1 - k, 1)
+    cmy = (1 - values[..., :3] - k[..., None]) / scale[..., None]
+    return np.concatenate([cmy, k[..., None]], axis=-1)
+
+
+def cmyk_to_rgb(values) -> np.ndarray:
+    """
+    :param values: CMYK (between 0-1)
+    :return: RGB (between 0-1)
+    """
+    values = as_float_array(values)
+    return (1 - values[..., :3]) * (1 - values[..., 3:4])
+
+
+def rgb_to_rgb255(values) -> np.ndarray:
+    """
+    :param values: RGB (between 0-1)
+    :return: uint8 RGB (between 0-255)
+    """
+    return np.rint(as_float_array(values) * 255).astype(np.uint8)
+
+
+def rgb_to_hex(values) -> list:
+    """
+    :param values: (N, 3) RGB (between 0-1)
+    :return: List of hex strings
+    """
+    return rgba255_to_hex(rgb_to_rgb255(values))
@@ -0,0 +1,274 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Lightweight metrics: named counters, cache statistics and fixed-bucket
+#  latency histograms. Disabled by default; every recording function then
+#  returns immediately. Enable with `metrics.enable()` or by setting
+#  SECRET_COLORS_METRICS=1 environment variable.
+#
+#  Each thread records into its own shard (its lock is never contended on the
+#  hot path). Shards are merged only when metrics are exported; shard of a
+#  finished thread is merged into a shared shard, so their number is bounded
+#  by the number of live threads.
+
+import bisect
+import os
+import threading
+import time
+import weakref
+
+# Default latency buckets (in seconds). Last bucket is +Inf.
+DEFAULT_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2,
+                   5e-2, 1e-1, 5e-1, 1)
+
+_enabled = os.environ.get("SECRET_COLORS_METRICS", "").strip().lower() in [
+    "1", "true", "yes", "on"]
+
+_local = threading.local()
+_shards = []
+_caches = {}
+_buckets = {}
+_lock = threading.Lock()
+
+
+class _Shard:
+    __slots__ = ("counters", "histograms", "lock")
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+
+class _Owner:
+    # Lives only in the thread-local storage; it is collected when its thread
+    # finishes, which retires the shard of that thread
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self, shard):
+        self.shard = shard
+
+
+# Values of the finished threads
+_retired = _Shard()
+_shards.append(_retired)
+
+
+def _merge(target: _Shard, shard: _Shard):
+    with target.lock, shard.lock:
+        for name, value in shard.counters.items():
+            target.counters[name] = target.counters.get(name, 0) + value
+        for name, (bounds, counts, total) in shard.histograms.items():
+            histogram = target.histograms.get(name)
+            if histogram is None:
+                target.histograms[name] = [bounds, list(counts), total]
+                continue
+            histogram[1] = [a + b for a, b in zip(histogram[1], counts)]
+            histogram[2] += total
+
+
+def _retire(shard: _Shard):
+    with _lock:
+        _merge(_retired, shard)
+        _shards.remove(shard)
+
+
+def _shard() -> _Shard:
+    try:
+        return _local.owner.shard
+    except AttributeError:
+        shard = _Shard()
+        owner = _Owner(shard)
+        with _lock:
+            _shards.append(shard)
+        weakref.finalize(owner, _retire, shard)
+        _local.owner = owner
+        return shard
+
+
+def enable():
+    """Starts recording metrics"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stops recording metrics (already recorded values are kept)"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Removes all recorded counters and histograms (e.g. between benchmark
+    runs). Registered caches are kept.
+    """
+    with _lock:
+        for shard in _shards:
+            # Cleared in place; owning threads keep using the same objects
+            with shard.lock:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+
+def incr(name: str, value: int = 1):
+    """
+    :param name: Name of the counter (e.g. 'color.shade.exact')
+    :param value: Increment
+    """
+    if not _enabled:
+        return
+    shard = _shard()
+    with shard.lock:
+        shard.counters[name] = shard.counters.get(name, 0) + value
+
+
+def set_buckets(name: str, buckets: tuple):
+    """
+    :param name: Name of the histogram
+    :param buckets: Sorted upper bounds of the buckets (+Inf is added)
+    """
+    if list(buckets) != sorted(buckets):
+        raise ValueError("Histogram buckets should be sorted")
+    _buckets[name] = tuple(buckets)
+
+
+def observe(name: str, value: float):
+    """
+    :param name: Name of the histogram (e.g. 'cmap.create_seconds')
+    :param value: Observed value (seconds for latency)
+    """
+    if not _enabled:
+        return
+    shard = _shard()
+    with shard.lock:
+        histogram = shard.histograms.get(name)
+        if histogram is None:
+            bounds = _buckets.get(name, DEFAULT_BUCKETS)
+            # [bounds, counts per bucket (+Inf last), sum]
+            histogram = [bounds, [0] * (len(bounds) + 1), 0.0]
+            shard.histograms[name] = histogram
+        histogram[1][bisect.bisect_left(histogram[0], value)] += 1
+        histogram[2] += value
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str):
+    """
+    Context manager which records the elapsed time in given histogram
+
+    >>> with metrics.timer("cmap.create_seconds"):
+    >>>     ...
+
+    :param name: Name of the histogram
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def register_cache(name: str, stats):
+    """
+    :param name: Name of the cache
+    :param stats: Function without arguments which returns dict of numbers
+        (e.g. hits, misses, size). It is called only during export.
+    """
+    _caches[name] = stats
+
+
+def snapshot() -> dict:
+    """
+    :return: All metrics as dictionary with 'counters', 'histograms' and
+        'caches' keys
+    """
+    merged_shard = _Shard()
+    with _lock:
+        for shard in _shards:
+            _merge(merged_shard, shard)
+    counters = merged_shard.counters
+    histograms = {name: {"buckets": list(bounds), "counts": counts,
+                         "sum": total, "count": sum(counts)}
+                  for name, (bounds, counts, total)
+                  in merged_shard.histograms.items()}
+    caches = {name: dict(stats()) for name, stats in _caches.items()}
+    return {"enabled": _enabled,
+            "counters": dict(sorted(counters.items())),
+            "histograms": dict(sorted(histograms.items())),
+            "caches": dict(sorted(caches.items()))}
+
+
+def to_json(**kwargs) -> str:
+    """
+    :param kwargs: Arguments for `json.dumps`
+    :return: :func:`snapshot` as JSON
+    """
+    import json
+    return json.dumps(snapshot(), **kwargs)
+
+
+def _metric_name(prefix: str, *parts) -> str:
+    name = "_".join(x for x in (prefix,) + parts if x)
+    return "".join(c if c.isalnum() or c == "_" else "_" for c in name)
+
+
+def to_prometheus(prefix: str = "secretcolors") -> str:
+    """
+    :param prefix: Prefix of all metric names
+    :return: Metrics in Prometheus text exposition format
+    """
+    data = snapshot()
+    lines = []
+    for name, value in data["counters"].items():
+        metric = _metric_name(prefix, name, "total")
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    for name, stats in data["caches"].items():
+        for key, value in stats.items():
+            metric = _metric_name(prefix, name, key)
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+    for name, hist in data["histograms"].items():
+        metric = _metric_name(prefix, name)
+        lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        bounds = [repr(float(x)) for x in hist["buckets"]] + ["+Inf"]
+        for bound, count in zip(bounds, hist["counts"]):
+            cumulative += count
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f"{metric}_sum {hist['sum']}")
+        lines.append(f"{metric}_count {hist['count']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,224 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Color mixing and blend modes
+#
+#  All calculations are done on floats (0-1). Single colors (hex strings,
+#  ColorString/ColorTuple or RGB tuples) are handled in pure Python. NumPy
+#  arrays with channels on the last axis (e.g. (N, 3)) are handled in a
+#  single vectorized pass.
+#
+#  Blend mode formulas are taken from
+#  https://www.w3.org/TR/compositing-1/#blending
+
+from SecretColors.utils import (hex_to_rgb, apply_linear_transform,
+                                apply_gamma_transform, rgb_to_oklab,
+                                oklab_to_rgb)
+
+SPACE_RGB = "rgb"
+SPACE_LINEAR = "linear"
+SPACE_PERCEPTUAL = "perceptual"
+
+ALL_MIX_SPACES = [SPACE_RGB, SPACE_LINEAR, SPACE_PERCEPTUAL]
+
+BLEND_MULTIPLY = "multiply"
+BLEND_SCREEN = "screen"
+BLEND_OVERLAY = "overlay"
+BLEND_DARKEN = "darken"
+BLEND_LIGHTEN = "lighten"
+
+ALL_BLEND_MODES = [BLEND_MULTIPLY, BLEND_SCREEN, BLEND_OVERLAY,
+                   BLEND_DARKEN, BLEND_LIGHTEN]
+
+
+def _is_array(value) -> bool:
+    return hasattr(value, "__array_interface__")
+
+
+def _to_rgb(color) -> tuple:
+    if hasattr(color, "rgb"):
+        return tuple(color.rgb)
+    if isinstance(color, str):
+        return hex_to_rgb(color)[:3]
+    if isinstance(color, (tuple, list)) and len(color) in [3, 4]:
+        return tuple(color[:3])
+    raise TypeError(f"Expected hex string, ColorOutput or RGB tuple but got "
+                    f"{type(color)}")
+
+
+def _check_space(space: str) -> str:
+    space = space.strip().lower()
+    if space not in ALL_MIX_SPACES:
+        raise ValueError(f"Unknown mixing space '{space}'. Currently "
+                         f"available spaces: {ALL_MIX_SPACES}")
+    return space
+
+
+def _check_mode(mode: str) -> str:
+    mode = mode.strip().lower()
+    if mode not in ALL_BLEND_MODES:
+        raise ValueError(f"Unknown blend mode '{mode}'. Currently "
+                         f"available modes: {ALL_BLEND_MODES}")
+    return mode
+
+
+def _normalize_weights(weights, count: int) -> list:
+    if weights is None:
+        return [1 / count] * count
+    weights = list(weights)
+    if len(weights) != count:
+        raise ValueError(f"Number of weights ({len(weights)}) should be same "
+                         f"as number of colors ({count})")
+    if min(weights) < 0:
+        raise ValueError("Weights can not be negative")
+    total = sum(weights)
+    if total == 0:
+        raise ValueError("Sum of weights should be greater than 0")
+    return [w / total for w in weights]
+
+
+def _forward(rgb: tuple, space: str) -> tuple:
+    if space == SPACE_LINEAR:
+        return tuple(apply_linear_transform(x) for x in rgb)
+    elif space == SPACE_PERCEPTUAL:
+        return rgb_to_oklab(*rgb)
+    return rgb
+
+
+def _backward(values: tuple, space: str) -> tuple:
+    if space == SPACE_LINEAR:
+        return tuple(apply_gamma_transform(min(1, max(0, x)))
+                     for x in values)
+    elif space == SPACE_PERCEPTUAL:
+        return oklab_to_rgb(*values)
+    return tuple(min(1, max(0, x)) for x in values)
+
+
+def _mix_arrays(colors, weights, space):
+    import numpy as np
+    from SecretColors.helpers import vectorized as vc
+
+    colors = vc.as_float_array(colors)[..., :3]
+    if colors.ndim == 0 or colors.shape[0] == 0:
+        raise ValueError("There should be at least one color to mix")
+    weights = np.asarray(_normalize_weights(weights, colors.shape[0]))
+    if space == SPACE_LINEAR:
+        colors = vc.srgb_to_linear(colors)
+    elif space == SPACE_PERCEPTUAL:
+        colors = vc.rgb_to_oklab(colors)
+
+    mixed = np.tensordot(weights, colors, axes=(0, 0))
+
+    if space == SPACE_LINEAR:
+        return vc.linear_to_srgb(np.clip(mixed, 0, 1))
+    elif space == SPACE_PERCEPTUAL:
+        return vc.oklab_to_rgb(mixed)
+    return np.clip(mixed, 0, 1)
+
+
+def mix(colors, weights: list = None, *, space: str = SPACE_RGB):
+    """
+    Mixes any number of colors with optional weights.
+
+    >>> mix(["#ff0000", "#0000ff"]) # (0.5, 0.0, 0.5)
+    >>> mix(["#ff0000", "#0000ff"], [3, 1]) # (0.75, 0.0, 0.25)
+    >>> mix(["#ff0000", "#0000ff"], space="linear") # Physically correct mix
+
+    Available mixing spaces are
+
+    * **rgb** - Plain average of gamma encoded RGB values [*Default*]
+    * **linear** - Average in linear-light sRGB (like mixing light)
+    * **perceptual** - Average in OKLab space (perceptually uniform)
+
+    If `colors` is a NumPy array, first axis is treated as the colors to
+    mix. Shape (K, 3) returns one color (3,) while shape (K, N, 3) mixes K
+    layers of N colors and returns (N, 3) array.
+
+    :param colors: List of hex strings, ColorString/ColorTuple or RGB
+        tuples (between 0-1) OR NumPy array as described above
+    :param weights: Relative weight of each color (default: equal weights)
+    :param space: Space in which colors will be mixed (default: rgb)
+    :return: Red, Green, Blue (between 0-1) or NumPy array
+    """
+    space = _check_space(space)
+    if _is_array(colors):
+        return _mix_arrays(colors, weights, space)
+
+    colors = [_forward(_to_rgb(c), space) for c in colors]
+    if len(colors) == 0:
+        raise ValueError("There should be at least one color to mix")
+    weights = _normalize_weights(weights, len(colors))
+    mixed = tuple(sum(w * c[i] for w, c in zip(weights, colors))
+                  for i in range(3))
+    return _backward(mixed, space)
+
+
+def _blend_channel(base: float, top: float, mode: str) -> float:
+    if mode == BLEND_MULTIPLY:
+        return base * top
+    elif mode == BLEND_SCREEN:
+        return base + top - base * top
+    elif mode == BLEND_OVERLAY:
+        if base <= 0.5:
+            return 2 * base * top
+        return 1 - 2 * (1 - base) * (1 - top)
+    elif mode == BLEND_DARKEN:
+        return min(base, top)
+    else:
+        return max(base, top)
+
+
+def _blend_arrays(base, top, mode, opacity):
+    import numpy as np
+    from SecretColors.helpers import vectorized as vc
+
+    base = vc.as_float_array(base)[..., :3]
+    top = vc.as_float_array(top)[..., :3]
+    if mode == BLEND_MULTIPLY:
+        out = base * top
+    elif mode == BLEND_SCREEN:
+        out = base + top - base * top
+    elif mode == BLEND_OVERLAY:
+        out = np.where(base <= 0.5, 2 * base * top,
+                       1 - 2 * (1 - base) * (1 - top))
+    elif mode == BLEND_DARKEN:
+        out = np.minimum(base, top)
+    else:
+        out = np.maximum(base, top)
+
+    if opacity != 1:
+        out = base + (out - base) * opacity
+    return out
+
+
+def blend(base, top, mode: str = BLEND_MULTIPLY, *, opacity: float = 1):
+    """
+    Blends `top` color over `base` color with standard blend modes
+
+    >>> blend("#ff8000", "#808080") # (0.5, 0.25, 0.0)
+    >>> blend("#ff8000", "#808080", "screen")
+    >>> blend(base_array, top_array, "overlay") # (N, 3) arrays
+
+    Available modes: multiply, screen, overlay, darken, lighten
+
+    :param base: Base (backdrop) color or NumPy array of RGB colors
+    :param top: Top (source) color or NumPy array of RGB colors. Arrays
+        are broadcast against each other.
+    :param mode: Blend mode (default: multiply)
+    :param opacity: Opacity of the top layer (between 0-1)
+    :return: Red, Green, Blue (between 0-1) or NumPy array
+    """
+    mode = _check_mode(mode)
+    if opacity < 0 or opacity > 1:
+        raise ValueError("Opacity should be between 0 to 1")
+
+    if _is_array(base) or _is_array(top):
+        return _blend_arrays(base, top, mode, opacity)
+
+    base = _to_rgb(base)
+    top = _to_rgb(top)
+    return tuple(b + (_blend_channel(b, t, mode) - b) * opacity
+                 for b, t in zip(base, top))
@@ -0,0 +1,156 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Columnar container for many colors. Requires NumPy.
+
+import numpy as np
+
+from SecretColors import metrics
+from SecretColors.helpers import vectorized as vc
+from SecretColors.models.objects import ColorOutput, ColorString
+
+
+def _rows(colors) -> np.ndarray:
+    if isinstance(colors, np.ndarray):
+        return colors
+    colors = list(colors)
+    if len(colors) == 0:
+        return np.zeros((0, 4), dtype=np.float32)
+    if all(isinstance(x, str) and not isinstance(x, ColorOutput)
+           for x in colors):
+        return vc.hex_to_rgba255(colors)
+    rows = []
+    for c in colors:
+        if isinstance(c, ColorOutput):
+            rows.append(c.rgba)
+        elif isinstance(c, str):
+            rows.append(ColorOutput(c).rgba)
+        else:
+            rows.append(tuple(c) if len(c) == 4 else (*c, 1))
+    return np.asarray(rows, dtype=np.float64)
+
+
+class ColorArray(np.ndarray):
+    """
+    Contiguous (N, 4) RGBA array of colors. Values are between 0-1 for
+    floating point dtype (default: float32) and between 0-255 for uint8.
+
+    As this is a NumPy array, it supports the buffer protocol and slicing
+    without copying, and can be passed directly to matplotlib (e.g.
+    ``ListedColormap(ca)`` or ``plt.scatter(x, y, c=ca)``).
+
+    >>> ca = ColorArray(["#fb4b53", "#408bfc", (0, 1, 0)])
+    >>> ca.hex # ['#fb4b53', '#408bfc', '#00ff00']
+    >>> ca[1:].rgb # (2, 3) view, no copy
+    >>> ca.hsl # Vectorized HSL conversion
+    >>> ColorArray(["#fff"], dtype="uint8").rgba255
+    """
+
+    def __new__(cls, colors, dtype=np.float32):
+        dtype = np.dtype(dtype)
+        if dtype not in (np.dtype(np.float32), np.dtype(np.float64),
+                         np.dtype(np.uint8)):
+            raise ValueError(f"ColorArray supports float32, float64 and uint8 "
+                             f"dtypes only. You have provided '{dtype}'")
+        values = _rows(colors)
+        if values.ndim != 2 or values.shape[1] not in [3, 4]:
+            raise ValueError(f"Colors should have shape (N, 3) or (N, 4) but "
+                             f"got {values.shape}")
+        metrics.incr("convert.array_colors", len(values))
+
+        if values.dtype == np.uint8:
+            if dtype.kind == "f":
+                values = values.astype(dtype) / 255
+        elif dtype == np.uint8:
+            values = np.rint(values * 255)
+        elif values.size and (values.min() < 0 or values.max() > 1):
+            raise ValueError("RGB/RGBA values should be between 0-1")
+
+        if values.shape[1] == 3:
+            full = 255 if dtype == np.uint8 else 1
+            alpha = np.full((values.shape[0], 1), full, dtype=dtype)
+            values = np.concatenate([values.astype(dtype), alpha], axis=1)
+        return np.ascontiguousarray(values, dtype=dtype).view(cls)
+
+    def __getitem__(self, item):
+        value = super().__getitem__(item)
+        if isinstance(value, ColorArray) and (
+                value.ndim != 2 or value.shape[1] != 4):
+            return value.view(np.ndarray)
+        return value
+
+    def _is_colors(self) -> bool:
+        return self.ndim == 2 and self.shape[1] == 4
+
+    def __repr__(self):
+        if not self._is_colors():
+            return repr(self.view(np.ndarray))
+        return f"ColorArray({self.hex})"
+
+    def __str__(self):
+        if not self._is_colors():
+            return str(self.view(np.ndarray))
+        return str(self.hex)
+
+    @property
+    def _floats(self) -> np.ndarray:
+        values = self.view(np.ndarray)
+        if self.dtype == np.uint8:
+            return values / 255
+        return values
+
+    @property
+    def rgba(self) -> np.ndarray:
+        """(N, 4) RGBA between 0-1 (view for float dtypes)"""
+        return self._floats
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """(N, 3) RGB between 0-1 (view for float dtypes)"""
+        return self._floats[:, :3]
+
+    @property
+    def alpha(self) -> np.ndarray:
+        """(N,) alpha between 0-1 (view for float dtypes)"""
+        return self._floats[:, 3]
+
+    @property
+    def rgba255(self) -> np.ndarray:
+        """(N, 4) uint8 RGBA between 0-255 (view for uint8 dtype)"""
+        if self.dtype == np.uint8:
+            return self.view(np.ndarray)
+        return vc.rgb_to_rgb255(self._floats)
+
+    @property
+    def rgb255(self) -> np.ndarray:
+        """(N, 3) uint8 RGB between 0-255"""
+        return self.rgba255[:, :3]
+
+    @property
+    def hsl(self) -> np.ndarray:
+        """(N, 3) HSL between 0-1"""
+        return vc.rgb_to_hsl(self.rgb)
+
+    @property
+    def hex(self) -> list:
+        """List of hex strings (alpha is ignored)"""
+        return vc.rgba255_to_hex(self.rgba255[:, :3])
+
+    @property
+    def hexa(self) -> list:
+        """List of hex strings with alpha (#rrggbbaa)"""
+        return vc.rgba255_to_hex(self.rgba255, alpha=True)
+
+    def to_outputs(self) -> list:
+        """
+        :return: List of :class:`~SecretColors.models.objects.ColorString`
+        """
+        output = []
+        for h, a in zip(self.hex, self.alpha.tolist()):
+            cs = ColorString(h)
+            cs.alpha = a
+            output.append(cs)
+        return output
@@ -8,6 +8,7 @@
 
 import collections
 
+from SecretColors import metrics
 from SecretColors.helpers.logging import Log
 from SecretColors.models.objects import ColorString
 from SecretColors.utils import color_in_between
@@ -24,8 +25,8 @@ class _RawColor:
         if log is None:
             log = Log()
         self.log = log
-        self.log.debug(f"RawColor generated with value {self.hex} and shade "
-                       f"{self.shade}")
+        self.log.debug("RawColor generated with value %s and shade %s",
+                       color_hex, shade)
 
     def __gt__(self, other):
         if isinstance(other, _RawColor):
@@ -89,8 +90,8 @@ class Color:
             self.log.error("Shade value should be in between 0-100",
                            exception=ValueError)
 
-        self.log.debug(f"Color {self.name} is generated with {len(values)} "
-                       f"values")
+        self.log.debug("Color %s is generated with %d values", name,
+                       len(values))
 
     def __repr__(self):
         return f"Color({self.name})"
@@ -107,10 +108,10 @@ class Color:
             # Add left color if 0 is not included
             if min(self._shades) > 0:
                 v.append(_RawColor(self.left, 0, self.log))
-                self.log.debug(f"Added left color to {self.name}")
+                self.log.debug("Added left color to %s", self.name)
             # Add right color if 100 is not included
             if max(self._shades) < 100:
-                self.log.debug(f"Added right color to {self.name}")
+                self.log.debug("Added right color to %s", self.name)
                 v.append(_RawColor(self.right, 100, self.log))
             v = sorted(v)
             self._values = v
@@ -120,7 +121,7 @@ class Color:
         return self.shade(self.default)
 
     def shade(self, value: float) -> ColorString:
-        self.log.debug(f"Extracting shade '{value}' from '{self.name}'")
+        self.log.debug("Extracting shade '%s' from '%s'", value, self.name)
 
         if value < 0 or value > 100:
             self.log.error("Shade should be between 0-100",
@@ -128,8 +129,10 @@ class Color:
 
         for i, s in enumerate(self.values):
             if s.shade == value:
+                metrics.incr("color.shade.exact")
                 return ColorString(s.hex)
             if s.shade > value:
+                metrics.incr("color.shade.interpolated")
                 left = self.values[i - 1]
                 right = s
                 idx = (value - left.shade) * 100 / (right.shade - left.shade)
@@ -0,0 +1,196 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Vectorized ColorWheel for many base colors. Requires NumPy.
+
+import numpy as np
+
+from SecretColors.helpers import vectorized as vc
+from SecretColors.models.array import ColorArray
+
+
+def _to_rgb(colors) -> np.ndarray:
+    if isinstance(colors, ColorArray):
+        return colors.rgb.astype(np.float64)
+    if isinstance(colors, np.ndarray):
+        if colors.dtype == np.uint8:
+            return colors[:, :3] / 255
+        return vc.as_float_array(colors)[:, :3]
+    return vc.hex_to_rgba255(list(colors))[:, :3] / 255
+
+
+def _rotate(values: np.ndarray, angle: float) -> np.ndarray:
+    return ((values * 360 + angle) % 360) / 360
+
+
+class ColorWheelBatch:
+    """
+    Same as :class:`~SecretColors.ColorWheel` but holds N base colors at
+    once. Every rotation and harmony is calculated for all colors in a
+    single pass over (N, 3) HSL arrays. Use
+    :func:`SecretColors.ColorWheel.batch` to create it.
+
+    .. code-block:: python
+
+        cb = ColorWheel.batch(["#fa4d56", "#408bfc", "#24a148"])
+        cb.make_darker(30)
+        cb.color  # ColorArray of 3 darker colors
+        cb.triadic()  # List of 3 ColorArrays (one per harmony position)
+        cb.triadic(as_hex=True)  # Same as [ColorWheel(x).triadic() ...]
+
+    """
+
+    def __init__(self, colors):
+        """
+        :param colors: List of hex colors, ColorArray or (N, 3)/(N, 4) RGB
+            array (between 0-1 or uint8)
+        """
+        self._original = vc.rgb_to_hsl(_to_rgb(colors))
+        self.hsl = self._original.copy()
+
+    def __len__(self):
+        return self.hsl.shape[0]
+
+    def __repr__(self):
+        return f"ColorWheelBatch( colors : {len(self)} )"
+
+    def reset(self):
+        """Resets all manipulations to the original colors"""
+        self.hsl = self._original.copy()
+
+    @property
+    def hue(self) -> np.ndarray:
+        return self.hsl[:, 0]
+
+    @property
+    def saturation(self) -> np.ndarray:
+        return self.hsl[:, 1]
+
+    @property
+    def lightness(self) -> np.ndarray:
+        return self.hsl[:, 2]
+
+    @staticmethod
+    def _output(hsl: np.ndarray) -> ColorArray:
+        return ColorArray(np.clip(vc.hsl_to_rgb(hsl), 0, 1))
+
+    @property
+    def color(self) -> ColorArray:
+        """Current colors (with all manipulations)"""
+        return self._output(self.hsl)
+
+    def rotate_hue(self, angle: float):
+        """
+        :param angle: Angle of rotation
+        """
+        self.hsl[:, 0] = _rotate(self.hsl[:, 0], angle)
+
+    def rotate_saturation(self, angle: float):
+        """
+        :param angle: Angle of rotation
+        """
+        self.hsl[:, 1] = _rotate(self.hsl[:, 1], angle)
+
+    def rotate_lightness(self, angle: float):
+        """
+        :param angle: Angle of rotation
+        """
+        self.hsl[:, 2] = _rotate(self.hsl[:, 2], angle)
+
+    def make_darker(self, percentage: float):
+        """
+        :param percentage: Percentage change
+        """
+        self.hsl[:, 2] -= self.hsl[:, 2] * percentage / 100
+
+    def make_lighter(self, percentage: float):
+        """
+        :param percentage: Percentage change
+        """
+        self.hsl[:, 2] += (1 - self.hsl[:, 2]) * percentage / 100
+
+    def apply(self, pipeline):
+        """
+        Applies all operations recorded in the pipeline to all colors
+
+        :param pipeline: :class:`~SecretColors.models.pipeline.WheelPipeline`
+        """
+        self.hsl = pipeline.apply_hsl_array(self.hsl)
+
+    def _hue_list(self, hues: list, is_reversed: bool, as_hex: bool):
+        hsl = np.repeat(self.hsl[None, :, :], len(hues), axis=0)
+        hsl[:, :, 0] = np.stack(hues)
+        rgb = np.clip(vc.hsl_to_rgb(hsl), 0, 1)
+        if is_reversed:
+            rgb = rgb[::-1]
+        if as_hex:
+            hexes = [vc.rgb_to_hex(x) for x in rgb]
+            return [list(x) for x in zip(*hexes)]
+        return [ColorArray(x) for x in rgb]
+
+    def _make_color_list(self, *args, is_reversed: bool, as_hex: bool):
+        hues = [self.hue] + [_rotate(self.hue, a) for a in args]
+        return self._hue_list(hues, is_reversed, as_hex)
+
+    def complementary(self, is_reversed: bool = False, as_hex: bool = False):
+        """
+        :param is_reversed: If True, order of harmony will be reversed
+        :param as_hex: If True, returns N lists of hex colors (same as
+            calling ColorWheel.complementary on each color)
+        :return: List of 2 ColorArrays (or N lists of hex colors)
+        """
+        return self._make_color_list(180, is_reversed=is_reversed,
+                                     as_hex=as_hex)
+
+    def triadic(self, is_reversed: bool = False, as_hex: bool = False):
+        """
+        :param is_reversed: If True, order of harmony will be reversed
+        :param as_hex: If True, returns N lists of hex colors
+        :return: List of 3 ColorArrays (or N lists of hex colors)
+        """
+        return self._make_color_list(120, 240, is_reversed=is_reversed,
+                                     as_hex=as_hex)
+
+    def tetradic(self, is_reversed: bool = False, as_hex: bool = False):
+        """
+        :param is_reversed: If True, order of harmony will be reversed
+        :param as_hex: If True, returns N lists of hex colors
+        :return: List of 4 ColorArrays (or N lists of hex colors)
+        """
+        return self._make_color_list(90, 180, 270, is_reversed=is_reversed,
+                                     as_hex=as_hex)
+
+    def analogous(self, loc="first", is_reversed: bool = False,
+                  as_hex: bool = False):
+        """
+        :param loc: Location of current color in the analogous colors.
+            Available options: [first, middle, last]. (default: first)
+        :param is_reversed: If True, order of harmony will be reversed
+        :param as_hex: If True, returns N lists of hex colors
+        :return: List of 3 ColorArrays (or N lists of hex colors)
+        """
+        factor = 1
+        if loc.strip().lower() in ["last", "l"]:
+            factor = -1
+        a1 = _rotate(self.hue, 30 * factor)
+        a2 = _rotate(self.hue, 60 * factor)
+        if loc.strip().lower() in ["middle", "m"]:
+            hues = [a1, self.hue, _rotate(self.hue, -30)]
+        else:
+            hues = [self.hue, a1, a2]
+        return self._hue_list(hues, is_reversed, as_hex)
+
+    def text_color(self) -> list:
+        """
+        :return: Black or White color (based on the contrast) for each color
+        """
+        linear = vc.srgb_to_linear(
+            vc.rgb_to_rgb255(self.color.rgb) / 255)
+        luminance = linear @ np.array([0.2126, 0.7152, 0.0722])
+        white_ratio = 1.05 / (luminance + 0.05)
+        black_ratio = (luminance + 0.05) / 0.05
+        return np.where(white_ratio > black_ratio, "#ffffff",
+                        "#000000").tolist()
@@ -6,12 +6,16 @@
 #
 # All objects related this project
 
+import re
 from typing import Union
 
-from SecretColors.utils import (hex_to_rgb, rgb_to_hex,
-                                color_in_between, text_color,
+from SecretColors.mixing import mix
+from SecretColors.utils import (hex_to_rgb, rgb_to_hex, text_color,
                                 hsl_to_hex, hex_to_hsl, rgb_to_rgb255,
-                                rgb_to_hsl)
+                                rgb_to_hsl, _sanitize_hex)
+
+# int(x, 16) alone also accepts '0x', '+', '-' and '_'
+_HEX_DIGITS = re.compile(r"[0-9a-f]{6}|[0-9a-f]{8}")
 
 
 def _validate(color: tuple, base):
@@ -92,23 +96,24 @@ class ColorOutput:
                 return self._base[:6]
 
     @staticmethod
-    def _new_hex(c1: str, other) -> str:
-        if isinstance(other, ColorOutput):
-            return color_in_between(c1, other.hex)[0]
-        elif isinstance(other, str):
-            return color_in_between(c1, other)[0]
-        elif isinstance(other, tuple):
-            return color_in_between(c1, rgb_to_hex(*other))[0]
-        else:
+    def _new_hex(c1, other) -> str:
+        if not isinstance(other, (ColorOutput, str, tuple)):
             raise TypeError(f"Expected ColorObject, str or tuple but got "
                             f"{type(other)}")
+        return rgb_to_hex(*mix([c1, other]))
 
     def __add__(self, other):
-        return ColorString(self._new_hex(self.hex, other))
+        return ColorString(self._new_hex(self.rgb, other))
 
     def __radd__(self, other):
         return self.__add__(other)
 
+    def to_int(self) -> "ColorInt":
+        """
+        :return: Packed 32-bit representation (0xRRGGBBAA) of this color
+        """
+        return ColorInt.from_rgba(*self.rgba)
+
 
 class ColorString(ColorOutput, str):
     def __init__(self, base: Union[str, tuple]):
@@ -120,6 +125,123 @@ class ColorTuple(ColorOutput, tuple):
         super().__init__(base)
 
 
+class ColorInt(int):
+    """
+    Color packed in a single 32-bit integer as 0xRRGGBBAA. As this is a
+    subclass of `int`, hashing and comparison are canonical i.e. '#FFF',
+    '#ffffff' and 'ffffff' will always give the same ColorInt.
+
+    >>> ColorInt.from_hex("#fb4b53") # ColorInt(0xfb4b53ff)
+    >>> ColorInt.from_hex("#FFF") == ColorInt.from_hex("ffffff") # True
+    >>> ColorInt.from_rgb(1, 0, 0).hex # '#ff0000'
+    """
+
+    def __new__(cls, value: int):
+        if value < 0 or value > 0xFFFFFFFF:
+            raise ValueError(f"Packed color should be between 0 and "
+                             f"0xFFFFFFFF. You have provided '{value}'")
+        return super().__new__(cls, value)
+
+    @classmethod
+    def from_hex(cls, hex_string: str) -> "ColorInt":
+        """
+        :param hex_string: Hex color (with or without alpha at the end)
+        :return: ColorInt
+        """
+        hex_string = _sanitize_hex(hex_string)
+        if not _HEX_DIGITS.fullmatch(hex_string):
+            raise ValueError(f"{hex_string} is an invalid hex color")
+        value = int(hex_string, 16)
+        if len(hex_string) == 6:
+            value = (value << 8) | 0xFF
+        return cls(value)
+
+    @classmethod
+    def from_rgb255(cls, r: int, g: int, b: int, a: int = 255) -> "ColorInt":
+        """
+        :param r: Red (between 0-255)
+        :param g: Green (between 0-255)
+        :param b: Blue (between 0-255)
+        :param a: Alpha (between 0-255)
+        :return: ColorInt
+        """
+        for v in (r, g, b, a):
+            if v < 0 or v > 255:
+                raise ValueError(f"Value should be between 0 to 255. You "
+                                 f"have provided '{v}'")
+        return cls((int(r) << 24) | (int(g) << 16) | (int(b) << 8) | int(a))
+
+    @classmethod
+    def from_rgba(cls, r: float, g: float, b: float,
+                  a: float = 1) -> "ColorInt":
+        """
+        :param r: Red (between 0-1)
+        :param g: Green (between 0-1)
+        :param b: Blue (between 0-1)
+        :param a: Alpha (between 0-1)
+        :return: ColorInt
+        """
+        _validate((r, g, b, a), (r, g, b, a))
+        return cls.from_rgb255(*(int(round(x * 255)) for x in (r, g, b, a)))
+
+    @classmethod
+    def from_rgb(cls, r: float, g: float, b: float) -> "ColorInt":
+        """
+        :param r: Red (between 0-1)
+        :param g: Green (between 0-1)
+        :param b: Blue (between 0-1)
+        :return: ColorInt (fully opaque)
+        """
+        return cls.from_rgba(r, g, b, 1)
+
+    @classmethod
+    def from_output(cls, color: ColorOutput) -> "ColorInt":
+        """
+        :param color: ColorString or ColorTuple
+        :return: ColorInt
+        """
+        return cls.from_rgba(*color.rgba)
+
+    def __repr__(self):
+        return f"ColorInt(0x{int(self):08x})"
+
+    @property
+    def rgba255(self) -> tuple:
+        return self >> 24, (self >> 16) & 0xFF, (self >> 8) & 0xFF, self & 0xFF
+
+    @property
+    def rgb255(self) -> tuple:
+        return self.rgba255[:3]
+
+    @property
+    def rgba(self) -> tuple:
+        return tuple(x / 255 for x in self.rgba255)
+
+    @property
+    def rgb(self) -> tuple:
+        return self.rgba[:3]
+
+    @property
+    def alpha(self) -> float:
+        return (self & 0xFF) / 255
+
+    @property
+    def hex(self) -> str:
+        return "#{:06x}".format(self >> 8)
+
+    @property
+    def hexa(self) -> str:
+        return "#{:08x}".format(int(self))
+
+    def to_output(self) -> ColorString:
+        """
+        :return: ColorString with alpha value of this color
+        """
+        cs = ColorString(self.hex)
+        cs.alpha = self.alpha
+        return cs
+
+
 class ColorWheel:
     """
     ColorWheel class is more 'scientific' than using
@@ -179,6 +301,48 @@ class ColorWheel:
         """
         self._original_hex = hex_color
         self.hue, self.saturation, self.lightness = hex_to_hsl(hex_color)
+        self._cached_color = (None, None)
+
+    @staticmethod
+    def batch(colors) -> "ColorWheelBatch":
+        """
+        Creates vectorized ColorWheel for many base colors. All rotations
+        and harmonies are then calculated for every color in one go. This
+        requires NumPy.
+
+        >>> cb = ColorWheel.batch(["#fa4d56", "#408bfc"])
+        >>> cb.rotate_hue(30)
+        >>> cb.color # ColorArray with both rotated colors
+        >>> cb.triadic(as_hex=True) # [ColorWheel(x).triadic() for x in ...]
+
+        :param colors: List of hex colors, ColorArray or (N, 3) RGB array
+        :return: :class:`~SecretColors.models.batch.ColorWheelBatch`
+        """
+        from SecretColors.models.batch import ColorWheelBatch
+        return ColorWheelBatch(colors)
+
+    @staticmethod
+    def pipeline() -> "WheelPipeline":
+        """
+        Creates empty recipe of ColorWheel manipulations which can be
+        applied later to any number of colors
+
+        >>> recipe = ColorWheel.pipeline().rotate_hue(30).make_darker(10)
+        >>> recipe.apply(["#fa4d56", "#408bfc"])
+
+        :return: :class:`~SecretColors.models.pipeline.WheelPipeline`
+        """
+        from SecretColors.models.pipeline import WheelPipeline
+        return WheelPipeline()
+
+    def apply(self, pipeline: "WheelPipeline"):
+        """
+        Applies all operations recorded in the pipeline to current color
+
+        :param pipeline: :class:`~SecretColors.models.pipeline.WheelPipeline`
+        """
+        self.hue, self.saturation, self.lightness = pipeline.apply_hsl(
+            self.hue, self.saturation, self.lightness)
 
     def reset(self):
         """Resets all adjustments/manipulation to your original color
@@ -192,7 +356,10 @@ class ColorWheel:
     def color(self) -> str:
         """Returns current color (which has all the manipulations)
         """
-        return hsl_to_hex(self.hue, self.saturation, self.lightness)
+        state = (self.hue, self.saturation, self.lightness)
+        if self._cached_color[0] != state:
+            self._cached_color = (state, hsl_to_hex(*state))
+        return self._cached_color[1]
 
     def __repr__(self):
         return (f"ColorWheel( _original_hex : {self._original_hex}, "
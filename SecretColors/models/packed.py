@@ -0,0 +1,167 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Compact collection of packed (0xRRGGBBAA) colors
+
+from array import array
+from typing import Iterable, Union
+
+from SecretColors.models.objects import ColorInt, ColorOutput
+
+# 'I' is 4 bytes on all mainstream platforms. Fall back to 'L' otherwise.
+_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+
+
+def _as_int(color) -> int:
+    if isinstance(color, int):
+        return ColorInt(color)
+    if isinstance(color, ColorOutput):
+        return ColorInt.from_output(color)
+    if isinstance(color, str):
+        return ColorInt.from_hex(color)
+    if isinstance(color, tuple):
+        return ColorInt.from_rgba(*color)
+    raise TypeError(f"Expected int, hex string, ColorOutput or RGB/RGBA "
+                    f"tuple but got {type(color)}")
+
+
+class ColorIntArray:
+    """
+    Collection of :class:`~SecretColors.models.objects.ColorInt` stored in
+    a contiguous `array('I')` buffer (4 bytes per color). Because colors
+    are stored as canonical integers, membership, deduplication and sorting
+    do not depend on how the hex string was written.
+
+    >>> ca = ColorIntArray(["#fff", "#FFFFFF", "#fb4b53"])
+    >>> len(ca.unique()) # 2
+    >>> "ffffff" in ca # True
+    >>> ca.to_numpy() # Zero-copy uint32 view (needs NumPy)
+    """
+
+    def __init__(self, colors: Iterable = None):
+        self._data = array(_TYPECODE)
+        if colors is not None:
+            self.extend(colors)
+
+    @classmethod
+    def _from_buffer(cls, data: array) -> "ColorIntArray":
+        obj = cls()
+        obj._data = data
+        return obj
+
+    @classmethod
+    def from_numpy(cls, values) -> "ColorIntArray":
+        """
+        :param values: NumPy array of packed uint32 colors OR (N, 3) / (N,
+            4) array of 0-255 values
+        :return: ColorIntArray
+        """
+        import numpy as np
+        from SecretColors.helpers.vectorized import pack_rgba255
+        values = np.asarray(values)
+        if values.ndim == 2:
+            values = pack_rgba255(values)
+        data = array(_TYPECODE)
+        data.frombytes(np.ascontiguousarray(values, dtype=f"u{data.itemsize}")
+                       .tobytes())
+        return cls._from_buffer(data)
+
+    @classmethod
+    def from_hex(cls, hex_list: list) -> "ColorIntArray":
+        """
+        Parses hex strings in bulk (uses NumPy if available)
+
+        :param hex_list: List of hex colors
+        :return: ColorIntArray
+        """
+        try:
+            from SecretColors.helpers.vectorized import hex_to_rgba255
+        except ImportError:
+            return cls(ColorInt.from_hex(x) for x in hex_list)
+        return cls.from_numpy(hex_to_rgba255(hex_list))
+
+    def to_numpy(self):
+        """
+        :return: Unsigned integer (uint32 on all common platforms) NumPy
+            array sharing memory with this collection
+        """
+        import numpy as np
+        # Item size of array('I') / array('L') is platform dependent
+        return np.frombuffer(self._data, dtype=f"u{self._data.itemsize}")
+
+    def append(self, color):
+        self._data.append(_as_int(color))
+
+    def extend(self, colors: Iterable):
+        self._data.extend(_as_int(x) for x in colors)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return (ColorInt(x) for x in self._data)
+
+    def __getitem__(self, item) -> Union[ColorInt, "ColorIntArray"]:
+        if isinstance(item, slice):
+            return self._from_buffer(self._data[item])
+        return ColorInt(self._data[item])
+
+    def __contains__(self, color):
+        try:
+            return _as_int(color) in self._data
+        except (TypeError, ValueError):
+            return False
+
+    def __eq__(self, other):
+        if isinstance(other, ColorIntArray):
+            return self._data == other._data
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ColorIntArray({self.hex})"
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) * self._data.itemsize
+
+    @property
+    def hex(self) -> list:
+        return [ColorInt(x).hex for x in self._data]
+
+    def unique(self) -> "ColorIntArray":
+        """
+        :return: New collection without duplicate colors (first occurrence
+            order is preserved)
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            return self._from_buffer(
+                array(_TYPECODE, dict.fromkeys(self._data)))
+        values = self.to_numpy()
+        _, index = np.unique(values, return_index=True)
+        return self.from_numpy(values[np.sort(index)])
+
+    def sorted(self, reverse: bool = False) -> "ColorIntArray":
+        """
+        :param reverse: If True, descending order
+        :return: New collection sorted by packed value (i.e. by R, G, B, A)
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            return self._from_buffer(
+                array(_TYPECODE, sorted(self._data, reverse=reverse)))
+        values = np.sort(self.to_numpy())
+        if reverse:
+            values = values[::-1]
+        return self.from_numpy(values)
+
+    def to_outputs(self) -> list:
+        """
+        :return: List of ColorString
+        """
+        return [ColorInt(x).to_output() for x in self._data]
@@ -9,12 +9,9 @@
 import random
 from typing import Dict, List
 
+from SecretColors import metrics
+from SecretColors.data import names, palettes
 from SecretColors.data.constants import *
-from SecretColors.data.names.w3 import W3_DATA
-from SecretColors.data.names.x11 import X11_DATA
-from SecretColors.data.palettes import (IBMPalette, MaterialPalette, MaterialAccentPalette,
-                                        ClarityPalette, ColorBrewer,
-                                        ParentPalette, TableauPalette)
 from SecretColors.helpers.decorators import deprecated, color_docs
 from SecretColors.helpers.logging import Log
 from SecretColors.models.base import Color
@@ -22,20 +19,19 @@ from SecretColors.models.objects import ColorString, ColorTuple
 from SecretColors.utils import get_complementary, color_in_between
 
 
-def _get_palette(name: str) -> ParentPalette:
+_PALETTE_CLASSES = {
+    PALETTE_MATERIAL: "MaterialPalette",
+    PALETTE_MATERIAL_ACCENT: "MaterialAccentPalette",
+    PALETTE_CLARITY: "ClarityPalette",
+    PALETTE_BREWER: "ColorBrewer",
+    PALETTE_TABLEAU: "TableauPalette",
+}
+
+
+def _get_palette(name: str) -> "palettes.ParentPalette":
+    # Palette data modules are imported only when they are needed
     name = name.strip().lower()
-    if name == PALETTE_MATERIAL:
-        return MaterialPalette()
-    elif name == PALETTE_MATERIAL_ACCENT:
-        return MaterialAccentPalette()
-    elif name == PALETTE_CLARITY:
-        return ClarityPalette()
-    elif name == PALETTE_BREWER:
-        return ColorBrewer()
-    elif name == PALETTE_TABLEAU:
-        return TableauPalette()
-    else:
-        return IBMPalette()
+    return getattr(palettes, _PALETTE_CLASSES.get(name, "IBMPalette"))()
 
 
 def _validate_object(obj, cls, item_name):
@@ -59,8 +55,8 @@ def _linspace(st, sp, n):
 
 def _param_deprecation(log: Log, item: str, **kwargs):
     if item in kwargs:
-        log.deprecated(f"'{item}' argument is deprecated and it will have no "
-                       f"impact on the workflow.")
+        log.deprecated("'%s' argument is deprecated and it will have no "
+                       "impact on the workflow.", item)
 
 
 class Palette:
@@ -156,19 +152,19 @@ class Palette:
 
         _param_deprecation(self.log, "allow_gray_shades", **kwargs)
 
-        self.log.info(f"New '{name}' palette is initialized successfully.")
+        self.log.info("New '%s' palette is initialized successfully.", name)
         self._palette = None
         self._colors = None
         self._seed = seed
         if self._seed:
-            self.log.info(f"Random seed set for : {seed}")
+            self.log.info("Random seed set for : %s", seed)
             random.seed(self._seed)
 
     def __str__(self):
         return f"Palette({self.name})"
 
     @property
-    def _value(self) -> ParentPalette:
+    def _value(self) -> "palettes.ParentPalette":
         if self._palette is None:
             self._palette = _get_palette(self.name)
         return self._palette
@@ -313,7 +309,7 @@ class Palette:
         """
         self._seed = value
         random.seed(value)
-        self.log.info(f"Random seed set for : {value}")
+        self.log.info("Random seed set for : %s", value)
 
     @property
     def colors(self) -> Dict[str, Color]:
@@ -328,7 +324,7 @@ class Palette:
                 cr.default = self._value.get_core_shade()
                 colors[c] = cr
             self._colors = colors
-            self.log.info(f"All colors from '{self.name}' palette generated")
+            self.log.info("All colors from '%s' palette generated", self.name)
         return self._colors
 
     @deprecated(
@@ -367,9 +363,9 @@ class Palette:
         elif self.color_mode == MODE_RGBA:
             return ColorTuple(value.rgba)
         else:
-            self.log.deprecated(f"Color mode '{self.color_mode}' is not "
-                                f"implemented here. Please contact developer"
-                                f" and report this bug")
+            self.log.deprecated("Color mode '%s' is not implemented here. "
+                                "Please contact developer and report this "
+                                "bug", self.color_mode)
         return value
 
     def _send(self, colors, **kwargs):
@@ -379,6 +375,8 @@ class Palette:
         pc = False
         if "print_colors" in kwargs.keys():
             pc = kwargs["print_colors"]
+        if kwargs.get("as_array"):
+            return self._send_array(colors, alpha, pc)
         if isinstance(colors, ColorString):
             c1 = self._convert(colors, alpha=alpha)
             if pc:
@@ -390,7 +388,23 @@ class Palette:
                 print(c2)
             return c2
 
+    def _send_array(self, colors, alpha, pc):
+        from SecretColors.models.array import ColorArray
+        if isinstance(colors, ColorString):
+            colors = [colors]
+        if alpha is not None:
+            if alpha < 0 or alpha > 1:
+                self.log.error("Alpha value should be between 0 to 1",
+                               exception=ValueError)
+            for c in colors:
+                c.alpha = alpha
+        ca = ColorArray(colors)
+        if pc:
+            print(ca)
+        return ca
+
     def _generate_additional_colors(self):
+        metrics.incr("palette.additional_colors")
         # First get names of all available colors
         previous = len(self.colors.keys())
         for p in [_get_palette(x) for x in ALL_PALETTES]:
@@ -399,23 +413,23 @@ class Palette:
                     cr = Color(c, v, p.get_shades())
                     cr.default = p.get_core_shade()
                     self._colors[c] = cr
-                    self.log.info(
-                        f"Color '{c}' extracted from '{p.get_palette_name()}'")
+                    self.log.info("Color '%s' extracted from '%s'", c,
+                                  p.get_palette_name())
 
-        self.log.info(f"Total of {len(self.colors) - previous} new colors "
-                      f"added to the current color list")
+        self.log.info("Total of %d new colors added to the current color "
+                      "list", len(self.colors) - previous)
 
     def _extract(self, name: str) -> Color:
         name = name.strip()
         if name not in self.colors.keys():
-            self.log.warn(f"Color '{name}' not found in current palette. "
-                          f"Checking if it is present in other available "
-                          f"palettes.")
+            self.log.warn("Color '%s' not found in current palette. Checking "
+                          "if it is present in other available palettes.",
+                          name)
             self._generate_additional_colors()
 
         if name not in self.colors.keys():
             if name in SYNONYM.keys():
-                self.log.info(f"{SYNONYM[name]} is used instead {name}")
+                self.log.info("%s is used instead %s", SYNONYM[name], name)
                 return self.colors[SYNONYM[name]]
 
         # If color is still not present, then it is an error
@@ -458,6 +472,7 @@ class Palette:
                force_list: bool = False,
                print_colors: bool = False,
                seed=None,
+               as_array: bool = False,
                **kwargs):
 
         """
@@ -498,6 +513,8 @@ class Palette:
             the console.
         :param seed: Seed for random number generator (will override the
             global palette seed)
+        :param as_array: If True, colors will be returned as
+            :class:`~SecretColors.models.array.ColorArray` (requires NumPy)
         :param kwargs: Other named arguments
         :return: Str/Tuple/list of random colors depending above options
         """
@@ -534,9 +551,10 @@ class Palette:
         if shade is not None:
             if no_of_colors == 1 and not force_list:
                 return self._send(colors[0].shade(shade), alpha=alpha,
-                                  print_colors=print_colors)
+                                  print_colors=print_colors,
+                                  as_array=as_array)
             return self._send([x.shade(shade) for x in colors], alpha=alpha,
-                              print_colors=print_colors)
+                              print_colors=print_colors, as_array=as_array)
 
         # Select the shade
 
@@ -564,9 +582,10 @@ class Palette:
 
         if no_of_colors == 1 and not force_list:
             return self._send(colors[0].shade(shades[0]), alpha=alpha,
-                              print_colors=print_colors)
+                              print_colors=print_colors, as_array=as_array)
         return self._send([x[0].shade(x[1]) for x in zip(colors, shades)],
-                          alpha=alpha, print_colors=print_colors)
+                          alpha=alpha, print_colors=print_colors,
+                          as_array=as_array)
 
     def random_balanced(self, no_of_colors: int = 1):
         """
@@ -584,6 +603,7 @@ class Palette:
                         alpha: float = 1,
                         print_colors: bool = False,
                         complementary=True,
+                        as_array: bool = False,
                         **kwargs):
 
         """
@@ -600,6 +620,8 @@ class Palette:
         :param print_colors: If True, prints colors on the console
         :param complementary: If True, generates gradient between two
             complementary colors. (default: True)
+        :param as_array: If True, colors will be returned as
+            :class:`~SecretColors.models.array.ColorArray` (requires NumPy)
         :param kwargs: Other named arguments
         :return: List of colors representing gradient
         """
@@ -617,14 +639,15 @@ class Palette:
 
         if no_of_colors < 3:
             return self._send(colors[:no_of_colors], alpha=alpha,
-                              print_colors=print_colors)
+                              print_colors=print_colors, as_array=as_array)
 
         no_of_colors = no_of_colors - 2
         mid_colors = color_in_between(colors[0], colors[1], no_of_colors)
         mid_colors = [ColorString(x) for x in mid_colors]
         mid_colors.insert(0, colors[0])
         mid_colors.append(colors[1])
-        return self._send(mid_colors, alpha=alpha, print_colors=print_colors)
+        return self._send(mid_colors, alpha=alpha, print_colors=print_colors,
+                          as_array=as_array)
 
     @staticmethod
     @deprecated("This method will be removed from Palette class in future. "
@@ -672,7 +695,7 @@ class Palette:
             return self._send(color.shade(shade), **kwargs)
 
     def _named_color(self, name: str, system: str, strict: bool):
-        both = [W3_DATA, X11_DATA]
+        both = [names.W3_DATA, names.X11_DATA]
         if system == "x11":
             both = list(reversed(both))
         if strict:
@@ -695,7 +718,8 @@ class Palette:
             shade: float = None, no_of_colors: int = 1,
             gradient=True, alpha: float = None,
             starting_shade: float = None, ending_shade: float = None,
-            naming: str = "w3", strict_search: bool = False):
+            naming: str = "w3", strict_search: bool = False,
+            as_array: bool = False):
         """
         This is general methode to retrieve the arbitrary color from the
         palette. Following steps will be taken,
@@ -767,6 +791,8 @@ class Palette:
         :param strict_search: If True, name will be searched only in given
             naming system. Enabling this will return the default color from
             given system. Palette colors will be ignored.
+        :param as_array: If True, colors will be returned as
+            :class:`~SecretColors.models.array.ColorArray` (requires NumPy)
         :return: ColorString / ColorTuple according to the palette
             'color_mode'
         """
@@ -786,8 +812,8 @@ class Palette:
                 else:
                     raise KeyError()
             color = self._extract(color_name.lower().strip())
-            self.log.warn(f"Color {color_name} is not available in current "
-                          f"palette, searching in named list")
+            self.log.warn("Color %s is not available in current palette, "
+                          "searching in named list", color_name)
         except KeyError:
             color = self._named_color(color_name,
                                       naming.strip().lower(), strict_search)
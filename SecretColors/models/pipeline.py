@@ -0,0 +1,205 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Recorded (lazy) ColorWheel transformations
+
+import json
+
+from SecretColors.utils import hex_to_hsl, hsl_to_hex
+
+OP_HUE = "rotate_hue"
+OP_SATURATION = "rotate_saturation"
+OP_LIGHTNESS = "rotate_lightness"
+OP_DARKER = "make_darker"
+OP_LIGHTER = "make_lighter"
+
+ALL_OPERATIONS = [OP_HUE, OP_SATURATION, OP_LIGHTNESS, OP_DARKER, OP_LIGHTER]
+
+PIPELINE_VERSION = 1
+
+# Compiled operations
+_ROTATE = "rotate"  # (channel, angle)
+_AFFINE = "affine"  # (channel, scale, offset) i.e. x -> x * scale + offset
+
+_CHANNEL = {OP_HUE: 0, OP_SATURATION: 1, OP_LIGHTNESS: 2, OP_DARKER: 2,
+            OP_LIGHTER: 2}
+
+
+def _compile(operations: list) -> list:
+    # Hue, saturation and lightness operations never affect each other.
+    # Hence each channel is compiled separately (order within the channel is
+    # kept) and consecutive compatible steps are folded into one.
+    compiled = []
+    for channel in range(3):
+        steps = []
+        for name, value in operations:
+            if _CHANNEL[name] != channel:
+                continue
+            if name in [OP_DARKER, OP_LIGHTER]:
+                p = value / 100
+                # darker: l - l*p ; lighter: l + (1-l)*p
+                scale, offset = (1 - p, 0) if name == OP_DARKER else (1 - p, p)
+                if steps and steps[-1][0] == _AFFINE:
+                    _, ch, s0, o0 = steps[-1]
+                    steps[-1] = (_AFFINE, ch, s0 * scale, o0 * scale + offset)
+                else:
+                    steps.append((_AFFINE, channel, scale, offset))
+            else:
+                if steps and steps[-1][0] == _ROTATE:
+                    _, ch, angle = steps[-1]
+                    steps[-1] = (_ROTATE, ch, (angle + value) % 360)
+                else:
+                    steps.append((_ROTATE, channel, value % 360))
+        compiled.extend(steps)
+    return compiled
+
+
+class WheelPipeline:
+    """
+    Records :class:`~SecretColors.ColorWheel` manipulations without
+    applying them. Recorded recipe can be applied to a single color or to
+    thousands of colors in one vectorized pass. Consecutive compatible
+    operations are folded together before applying (e.g. two hue rotations
+    become one rotation).
+
+    .. code-block:: python
+
+        recipe = ColorWheel.pipeline().rotate_hue(30).make_darker(20)
+        recipe.apply_color("#fa4d56")  # Same as doing it with ColorWheel
+        recipe.apply(palette_hex_list)  # ColorArray (requires NumPy)
+        text = recipe.to_json()  # Reuse recipe in other process
+        same = WheelPipeline.from_json(text)
+
+    """
+
+    def __init__(self, operations: list = None):
+        self._operations = []
+        self._compiled = None
+        for name, value in operations or []:
+            self._add(name, value)
+
+    def _add(self, name: str, value: float) -> "WheelPipeline":
+        if name not in ALL_OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}'. Currently "
+                             f"available operations: {ALL_OPERATIONS}")
+        if not isinstance(value, (int, float)):
+            raise TypeError(f"Value for '{name}' should be a number but got "
+                            f"{type(value)}")
+        self._operations.append((name, float(value)))
+        self._compiled = None
+        return self
+
+    def rotate_hue(self, angle: float) -> "WheelPipeline":
+        return self._add(OP_HUE, angle)
+
+    def rotate_saturation(self, angle: float) -> "WheelPipeline":
+        return self._add(OP_SATURATION, angle)
+
+    def rotate_lightness(self, angle: float) -> "WheelPipeline":
+        return self._add(OP_LIGHTNESS, angle)
+
+    def make_darker(self, percentage: float) -> "WheelPipeline":
+        return self._add(OP_DARKER, percentage)
+
+    def make_lighter(self, percentage: float) -> "WheelPipeline":
+        return self._add(OP_LIGHTER, percentage)
+
+    def __len__(self):
+        return len(self._operations)
+
+    def __repr__(self):
+        return f"WheelPipeline({self._operations})"
+
+    def __eq__(self, other):
+        if isinstance(other, WheelPipeline):
+            return self._operations == other._operations
+        return NotImplemented
+
+    @property
+    def operations(self) -> list:
+        """List of recorded (operation, value) pairs"""
+        return list(self._operations)
+
+    @property
+    def compiled(self) -> list:
+        """Folded operations which will be actually applied"""
+        if self._compiled is None:
+            self._compiled = _compile(self._operations)
+        return self._compiled
+
+    def to_dict(self) -> dict:
+        return {"version": PIPELINE_VERSION,
+                "operations": [list(x) for x in self._operations]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WheelPipeline":
+        if data.get("version") != PIPELINE_VERSION:
+            raise ValueError(f"Unsupported pipeline version "
+                             f"'{data.get('version')}'")
+        return cls([tuple(x) for x in data["operations"]])
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text: str) -> "WheelPipeline":
+        return cls.from_dict(json.loads(text))
+
+    def apply_hsl(self, h: float, s: float, l: float) -> tuple:
+        """
+        :param h: Hue (0-1)
+        :param s: Saturation (0-1)
+        :param l: Lightness (0-1)
+        :return: Transformed Hue, Saturation, Lightness
+        """
+        hsl = [h, s, l]
+        for step in self.compiled:
+            if step[0] == _ROTATE:
+                _, ch, angle = step
+                hsl[ch] = ((hsl[ch] * 360 + angle) % 360) / 360
+            else:
+                _, ch, scale, offset = step
+                hsl[ch] = hsl[ch] * scale + offset
+        return tuple(hsl)
+
+    def apply_color(self, hex_color: str) -> str:
+        """
+        :param hex_color: Hex color
+        :return: Transformed hex color
+        """
+        return hsl_to_hex(*self.apply_hsl(*hex_to_hsl(hex_color)))
+
+    def apply_hsl_array(self, hsl):
+        """
+        :param hsl: (..., 3) HSL array. It will NOT be modified.
+        :return: Transformed (..., 3) HSL array
+        """
+        import numpy as np
+        hsl = np.array(hsl, dtype=np.float64)
+        for step in self.compiled:
+            if step[0] == _ROTATE:
+                _, ch, angle = step
+                hsl[..., ch] = ((hsl[..., ch] * 360 + angle) % 360) / 360
+            else:
+                _, ch, scale, offset = step
+                hsl[..., ch] = hsl[..., ch] * scale + offset
+        return hsl
+
+    def apply(self, colors, as_hex: bool = False):
+        """
+        Applies the recipe to all colors in one vectorized pass (requires
+        NumPy)
+
+        :param colors: List of hex colors, ColorArray or (N, 3) RGB array
+        :param as_hex: If True, list of hex colors will be returned
+        :return: :class:`~SecretColors.models.array.ColorArray` or list of hex
+        """
+        from SecretColors.models.batch import ColorWheelBatch
+        batch = ColorWheelBatch(colors)
+        batch.hsl = self.apply_hsl_array(batch.hsl)
+        if as_hex:
+            return batch.color.hex
+        return batch.color
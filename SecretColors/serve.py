@@ -0,0 +1,542 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Local HTTP/JSON service for palettes, colormaps and batch conversions so
+#  that services written in other languages do not need their own copy of
+#  the color data. Only the standard library (asyncio) is used.
+#
+#  python -m SecretColors.serve --port 8642
+#  python -m SecretColors.serve load --port 8642 --path /palette/ibm/get?color=red
+#
+#  Endpoints (all responses are JSON):
+#       GET  /palettes
+#       GET  /palette/<name>/get?color=red&shade=60&no_of_colors=1
+#       GET  /palette/<name>/random?no_of_colors=3&seed=10
+#       GET  /palette/<name>/cycle?no_of_colors=10&version=1&skip_first=0
+#       GET  /cmaps/<dataset>
+#       GET  /cmap/<dataset>/<name>?no_of_colors=256
+#       POST /convert   {"from": "hex", "to": "lab", "values": [...]}
+#
+#  Palette endpoints also accept 'color_mode'. Other query parameters are
+#  limited to ARGUMENTS and 'no_of_colors' to MAX_COLORS. Identical
+#  in-flight requests are computed only once, deterministic responses are
+#  cached with an ETag (If-None-Match gives 304) and large conversion
+#  batches are offloaded to a worker pool.
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from SecretColors import metrics
+from SecretColors.data.constants import ALL_PALETTES
+from SecretColors.helpers.cache import LRUCache
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8642
+
+# Batches with at least these many values are sent to the worker pool
+OFFLOAD_THRESHOLD = 256
+MAX_BODY = 16 * 1024 * 1024
+# Maximum 'no_of_colors' of palette and colormap endpoints
+MAX_COLORS = 4096
+
+# Query parameters accepted by the endpoints ('color_mode' is accepted by
+# all palette endpoints). Everything else is rejected.
+ARGUMENTS = {
+    "get": {"color", "shade", "no_of_colors", "gradient", "alpha",
+            "starting_shade", "ending_shade", "naming", "strict_search"},
+    "random": {"no_of_colors", "shade", "alpha", "starting_shade",
+               "ending_shade", "gradient", "avoid", "reverse", "seed"},
+    "cycle": {"no_of_colors", "version", "skip_first"},
+    "cmap": {"no_of_colors"},
+}
+
+CMAP_CLASSES = {
+    "brewer": ("SecretColors.cmaps.brewer", "BrewerMap"),
+    "tableau": ("SecretColors.cmaps.tableau", "TableauMap"),
+}
+
+
+class RequestError(Exception):
+    """Client error which is sent back with given HTTP status"""
+
+    def __init__(self, message: str, status: int = HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def _number(value: str):
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return value
+
+
+def _arguments(query: str) -> dict:
+    return {k: _number(v) for k, v in parse_qsl(query)}
+
+
+def _check_arguments(args: dict, endpoint: str):
+    allowed = ARGUMENTS[endpoint]
+    unknown = sorted(set(args) - allowed)
+    if unknown:
+        raise RequestError(f"Unsupported parameters {unknown} for "
+                           f"'{endpoint}'. Allowed: {sorted(allowed)}")
+    count = args.get("no_of_colors")
+    if count is not None and (type(count) is not int or
+                              not 1 <= count <= MAX_COLORS):
+        raise RequestError(f"'no_of_colors' should be an integer between "
+                           f"1-{MAX_COLORS}")
+
+
+def _dumps(payload) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _jsonable(value):
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(x) for x in value]
+    return value
+
+
+def convert(source: str, destination: str, values: list) -> list:
+    """
+    Converts list of colors with functions from `SecretColors.utils`.
+    Conversions without a direct function go through 'rgb'.
+
+    >>> convert("hex", "lab", ["#fb4b53"])
+
+    :param source: Input space (e.g. hex, rgb, hsl, lab, oklch)
+    :param destination: Output space
+    :param values: List of hex strings or lists of channel values
+    :return: List of converted values
+    """
+    from SecretColors import utils
+
+    def _function(src, dst):
+        name = f"{src}_to_{dst}"
+        function = getattr(utils, name, None)
+        if function is None or name.startswith("_"):
+            raise RequestError(f"Conversion '{src}' -> '{dst}' is not "
+                               f"supported")
+        return function
+
+    def _apply(function, value):
+        if isinstance(value, str):
+            return function(value)
+        return function(*value)
+
+    source = str(source).strip().lower()
+    destination = str(destination).strip().lower()
+    if source == destination:
+        return list(values)
+    if hasattr(utils, f"{source}_to_{destination}"):
+        steps = [_function(source, destination)]
+    else:
+        steps = [_function(source, "rgb"), _function("rgb", destination)]
+    output = []
+    for value in values:
+        for step in steps:
+            value = _apply(step, value)
+        output.append(_jsonable(value))
+    return output
+
+
+def _write(writer, status: HTTPStatus, response: dict, data: bytes,
+           keep_alive: bool):
+    response["Content-Length"] = str(len(data))
+    response["Connection"] = "keep-alive" if keep_alive else "close"
+    head = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    head.extend(f"{k}: {v}" for k, v in response.items())
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+
+
+class PaletteService:
+    """
+    Request handler and HTTP server. Use :func:`start` inside a running
+    event loop or :func:`run` to block.
+
+    >>> service = PaletteService(workers=4)
+    >>> service.run(port=8642)
+    """
+
+    def __init__(self, *, workers: int = 0, cache_size: int = 1024,
+                 offload_threshold: int = OFFLOAD_THRESHOLD):
+        """
+        :param workers: Number of worker processes for batch conversions. If
+            0, default thread pool of the event loop is used
+        :param cache_size: Number of cached responses
+        :param offload_threshold: Minimum batch size sent to the worker pool
+        """
+        self.workers = workers
+        self.offload_threshold = offload_threshold
+        self.cache = LRUCache(maxsize=cache_size)
+        self._pool = None
+        self._inflight = {}
+        self._palettes = {}
+        self._cmaps = {}
+        self._server = None
+        metrics.register_cache("serve.responses", self.cache.stats)
+
+    # ------------------------------------------------------------ handlers
+
+    def _palette(self, name: str, args: dict):
+        from SecretColors.models.palette import Palette
+        name = name.lower()
+        if name not in ALL_PALETTES:
+            raise RequestError(f"Unknown palette '{name}'. Currently "
+                               f"available: {ALL_PALETTES}",
+                               HTTPStatus.NOT_FOUND)
+        mode = str(args.pop("color_mode", "hex"))
+        key = (name, mode)
+        if key not in self._palettes:
+            self._palettes[key] = Palette(name, color_mode=mode)
+        return self._palettes[key]
+
+    def _cmap(self, dataset: str):
+        import importlib
+        if dataset not in CMAP_CLASSES:
+            raise RequestError(f"Unknown colormap dataset '{dataset}'. "
+                               f"Currently available: {list(CMAP_CLASSES)}",
+                               HTTPStatus.NOT_FOUND)
+        if dataset not in self._cmaps:
+            module, name = CMAP_CLASSES[dataset]
+            cls = getattr(importlib.import_module(module), name)
+            self._cmaps[dataset] = cls()
+        return self._cmaps[dataset]
+
+    def _palette_call(self, name: str, action: str, args: dict):
+        palette = self._palette(name, args)
+        if action not in ["get", "random", "cycle"]:
+            raise RequestError(f"Unknown palette action '{action}'",
+                               HTTPStatus.NOT_FOUND)
+        _check_arguments(args, action)
+        if action == "get":
+            if "color" not in args:
+                raise RequestError("Parameter 'color' is required")
+            return palette.get(str(args.pop("color")), **args)
+        if action == "random":
+            if isinstance(args.get("avoid"), str):
+                args["avoid"] = args["avoid"].split(",")
+            return palette.random(force_list=True, **args)
+        count = args.pop("no_of_colors", 10)
+        cycle = palette.cycle(**args)
+        return [next(cycle) for _ in range(count)]
+
+    async def _convert(self, body: bytes):
+        try:
+            payload = json.loads(body or b"{}")
+            source = payload["from"]
+            destination = payload["to"]
+            values = payload["values"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise RequestError(f"Expected JSON object with 'from', 'to' and "
+                               f"'values' ({e})")
+        if len(values) < self.offload_threshold:
+            return convert(source, destination, values)
+        if self._pool is None and self.workers > 0:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        metrics.incr("serve.offloaded")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, convert, source,
+                                          destination, values)
+
+    async def _compute(self, method: str, target: str, body: bytes):
+        # Returns (result, cacheable)
+        url = urlsplit(target)
+        parts = [x for x in url.path.split("/") if x]
+        args = _arguments(url.query)
+        if method == "POST":
+            if parts == ["convert"]:
+                return await self._convert(body), True
+            raise RequestError("Not found", HTTPStatus.NOT_FOUND)
+        if method != "GET":
+            raise RequestError(f"Method '{method}' is not allowed",
+                               HTTPStatus.METHOD_NOT_ALLOWED)
+        if parts == ["palettes"]:
+            return ALL_PALETTES, True
+        if len(parts) == 3 and parts[0] == "palette":
+            # Random colors without seed should differ on every request
+            cacheable = parts[2] != "random" or "seed" in args
+            return self._palette_call(parts[1], parts[2], args), cacheable
+        if len(parts) == 2 and parts[0] == "cmaps":
+            return self._cmap(parts[1]).get_all, True
+        if len(parts) == 3 and parts[0] == "cmap":
+            cmap = self._cmap(parts[1])
+            if parts[2] not in cmap.get_all:
+                raise RequestError(f"Unknown colormap '{parts[2]}'",
+                                   HTTPStatus.NOT_FOUND)
+            _check_arguments(args, "cmap")
+            count = args.get("no_of_colors", 256)
+            return cmap.resample(parts[2], count), True
+        raise RequestError("Not found", HTTPStatus.NOT_FOUND)
+
+    async def _respond(self, method: str, target: str, body: bytes):
+        # Returns (status, serialized body, cacheable)
+        try:
+            result, cacheable = await self._compute(method, target, body)
+        except RequestError as e:
+            return e.status, _dumps({"error": str(e)}), False
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return HTTPStatus.BAD_REQUEST, _dumps({"error": str(e)}), False
+        except Exception as e:
+            return (HTTPStatus.INTERNAL_SERVER_ERROR, _dumps({"error": str(e)}),
+                    False)
+        try:
+            return HTTPStatus.OK, _dumps({"result": _jsonable(result)}), \
+                   cacheable
+        except (TypeError, ValueError) as e:
+            return (HTTPStatus.INTERNAL_SERVER_ERROR,
+                    _dumps({"error": f"Result can not be serialized ({e})"}),
+                    False)
+
+    async def handle(self, method: str, target: str, body: bytes = b"",
+                     headers: dict = None) -> tuple:
+        """
+        Handles single request (without HTTP parsing)
+
+        :param method: HTTP method
+        :param target: Path with the query string
+        :param body: Request body
+        :param headers: Request headers (lowercase names)
+        :return: Status, response headers and response body
+        """
+        metrics.incr("serve.requests")
+        headers = headers or {}
+        key = (method, target, body)
+        cached = self.cache.get(key)
+        if cached is None:
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.ensure_future(
+                    self._respond(method, target, body))
+                self._inflight[key] = future
+                future.add_done_callback(
+                    lambda _: self._inflight.pop(key, None))
+            else:
+                metrics.incr("serve.coalesced")
+            status, data, cacheable = await asyncio.shield(future)
+            etag = f'"{hashlib.sha1(data).hexdigest()[:20]}"'
+            if cacheable:
+                self.cache.put(key, (status, data, etag))
+            else:
+                etag = None
+        else:
+            status, data, etag = cached
+        response = {"Content-Type": "application/json"}
+        if etag is not None:
+            response["ETag"] = etag
+            response["Cache-Control"] = "no-cache"
+            if headers.get("if-none-match") == etag:
+                metrics.incr("serve.not_modified")
+                return HTTPStatus.NOT_MODIFIED, response, b""
+        return status, response, data
+
+    # ---------------------------------------------------------------- HTTP
+
+    async def _connection(self, reader: asyncio.StreamReader,
+                          writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                headers = {}
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                    while True:
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError(f"Invalid Content-Length {length}")
+                except ValueError as e:
+                    # Body can not be framed; respond and close
+                    data = _dumps({"error": f"Malformed request ({e})"})
+                    _write(writer, HTTPStatus.BAD_REQUEST,
+                           {"Content-Type": "application/json"}, data, False)
+                    await writer.drain()
+                    break
+                if length > MAX_BODY:
+                    status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                    response, data = {}, b""
+                    headers["connection"] = "close"
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    with metrics.timer("serve.request_seconds"):
+                        status, response, data = await self.handle(
+                            method.upper(), target, body, headers)
+                keep_alive = (version == "HTTP/1.1" and
+                              headers.get("connection", "") != "close")
+                _write(writer, status, response, data, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST,
+                    port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """
+        :param host: Host name
+        :param port: Port (0 selects a free port)
+        :return: Running asyncio server
+        """
+        self._server = await asyncio.start_server(self._connection, host,
+                                                  port)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def run(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        async def _main():
+            server = await self.start(host, port)
+            print(f"Serving SecretColors on http://{host}:{self.port}")
+            try:
+                await server.serve_forever()
+            finally:
+                await self.close()
+
+        try:
+            asyncio.run(_main())
+        except KeyboardInterrupt:
+            pass
+
+
+# ------------------------------------------------------------- load generator
+
+def _percentile(values: list, percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def load(paths: list, *, host: str = DEFAULT_HOST,
+               port: int = DEFAULT_PORT, requests: int = 1000,
+               concurrency: int = 16) -> dict:
+    """
+    Simple load generator. Each of the `concurrency` keep-alive connections
+    sends requests one after another (cycling through `paths`).
+
+    :param paths: List of GET paths (with query)
+    :param host: Host of the service
+    :param port: Port of the service
+    :param requests: Total number of requests
+    :param concurrency: Number of parallel connections
+    :return: Dictionary with requests, errors, seconds, rps and latency
+        percentiles (p50, p99 in milliseconds)
+    """
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def _worker():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for i in counter:
+                path = paths[i % len(paths)]
+                started = time.perf_counter()
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n"
+                             .encode("latin-1"))
+                await writer.drain()
+                status = int((await reader.readline()).split()[1])
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                latencies.append(time.perf_counter() - started)
+                if status >= 400:
+                    errors += 1
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*[_worker() for _ in range(concurrency)])
+    seconds = time.perf_counter() - started
+    return {"requests": len(latencies),
+            "errors": errors,
+            "seconds": seconds,
+            "rps": len(latencies) / seconds if seconds else 0.0,
+            "p50": _percentile(latencies, 50) * 1000,
+            "p99": _percentile(latencies, 99) * 1000}
+
+
+def format_load(result: dict) -> str:
+    """
+    :param result: Output of :func:`load`
+    :return: Short report
+    """
+    return (f"{result['requests']} requests ({result['errors']} errors) in "
+            f"{result['seconds']:.2f} s: {result['rps']:,.0f} req/s, "
+            f"p50 {result['p50']:.2f} ms, p99 {result['p99']:.2f} ms")
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m SecretColors.serve",
+        description="Local HTTP/JSON service for SecretColors")
+    parser.add_argument("command", nargs="?", default="run",
+                        choices=["run", "load"],
+                        help="Run the service (default) or load generator")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Worker processes for batch conversions")
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--path", action="append",
+                        help="Path for load generator (can be repeated)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args(argv)
+    if args.command == "load":
+        paths = args.path or ["/palette/ibm/get?color=red"]
+        result = asyncio.run(load(paths, host=args.host, port=args.port,
+                                  requests=args.requests,
+                                  concurrency=args.concurrency))
+        print(format_load(result))
+        return 1 if result["errors"] else 0
+    PaletteService(workers=args.workers,
+                   cache_size=args.cache_size).run(args.host, args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
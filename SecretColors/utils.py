@@ -15,7 +15,9 @@
 
 import math
 from typing import Tuple
+from SecretColors import metrics
 from SecretColors.helpers.rxutils import convert_rgb_to_xyz, convert_xyz_to_rgb
+from SecretColors.helpers.rxutils import white_reference, xyz_to_linear_rgb
 
 
 def _validate(*args):
@@ -326,6 +328,7 @@ def rgb255_to_hex(r: int, g: int, b: int) -> str:
 
 def rgb_to_hex(r: float, g: float, b: float) -> str:
     _validate(r, g, b)
+    metrics.incr("convert.rgb_to_hex")
     return rgb255_to_hex(*rgb_to_rgb255(r, g, b))
 
 
@@ -376,6 +379,7 @@ def hex_to_rgb(hex_string: str):
     :return: Red, Green, Blue (between 0-1)
     """
     hex_string = _sanitize_hex(hex_string)
+    metrics.incr("convert.hex_to_rgb")
     c = []
     for x in range(0, len(hex_string), 2):
         try:
@@ -418,7 +422,7 @@ def apply_gamma_transform(value):
     :return: Transformed values
     """
     if value > 0.0031308:
-        return (pow(1.055 * value, (1 / 2.4))) - 0.055
+        return 1.055 * pow(value, (1 / 2.4)) - 0.055
     else:
         return 12.92 * value
 
@@ -545,6 +549,227 @@ def xyz_to_adobe_rgb(x, y, z, *, reference="D65", clip=True):
                               reference=reference, clip=clip)
 
 
+def _cbrt(value):
+    return math.copysign(pow(abs(value), 1 / 3), value)
+
+
+def rgb_to_oklab(r, g, b):
+    """
+    Converts RGB (0-1, gamma encoded sRGB) to OKLab
+
+    Conversion formula taken from
+    https://bottosson.github.io/posts/oklab/
+
+    :param r: Red
+    :param g: Green
+    :param b: Blue
+    :return: Lightness (0-1), a, b (roughly between -0.4 to 0.4)
+    """
+    _validate(r, g, b)
+    r, g, b = rgb_to_srgb(r, g, b)
+
+    l = _cbrt(0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b)
+    m = _cbrt(0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b)
+    s = _cbrt(0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b)
+
+    return (0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+            1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+            0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s)
+
+
+def oklab_to_rgb(l, a, b, *, clip=True):
+    """
+    Converts OKLab to RGB (0-1, gamma encoded sRGB)
+
+    Conversion formula taken from
+    https://bottosson.github.io/posts/oklab/
+
+    :param l: Lightness
+    :param a: a
+    :param b: b
+    :param clip: If True, values below 0 and above 1 will be clipped
+    :return: Red, Green, Blue
+    """
+    l_ = pow(l + 0.3963377774 * a + 0.2158037573 * b, 3)
+    m_ = pow(l - 0.1055613458 * a - 0.0638541728 * b, 3)
+    s_ = pow(l - 0.0894841775 * a - 1.2914855480 * b, 3)
+
+    rgb = (4.0767416621 * l_ - 3.3077115913 * m_ + 0.2309699292 * s_,
+           -1.2684380046 * l_ + 2.6097574011 * m_ - 0.3413193965 * s_,
+           -0.0041960863 * l_ - 0.7034186147 * m_ + 1.7076147010 * s_)
+
+    if clip:
+        rgb = [min(1, max(0, x)) for x in rgb]
+    return tuple(math.copysign(apply_gamma_transform(abs(x)), x)
+                 for x in rgb)
+
+
+# CIE constants (exact rational values) used in CIELAB conversion
+_LAB_EPSILON = 216 / 24389
+_LAB_KAPPA = 24389 / 27
+
+
+def xyz_to_lab(x, y, z, *, reference="D65"):
+    """
+    Converts CIE-XYZ (Y of the reference white is 1) to CIELAB
+
+    :param x: CIE-X
+    :param y: CIE-Y
+    :param z: CIE-Z
+    :param reference: White reference (default: D65)
+    :return: L (0-100), a, b
+    """
+
+    def _f(t):
+        if t > _LAB_EPSILON:
+            return _cbrt(t)
+        return (_LAB_KAPPA * t + 16) / 116
+
+    wx, wy, wz = white_reference(reference)
+    fx, fy, fz = _f(x / wx), _f(y / wy), _f(z / wz)
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def lab_to_xyz(l, a, b, *, reference="D65"):
+    """
+    Converts CIELAB to CIE-XYZ (Y of the reference white is 1)
+
+    :param l: Lightness (0-100)
+    :param a: a
+    :param b: b
+    :param reference: White reference (default: D65)
+    :return: CIE-X, CIE-Y, CIE-Z
+    """
+    fy = (l + 16) / 116
+    fx = fy + a / 500
+    fz = fy - b / 200
+
+    def _inverse(t):
+        if t ** 3 > _LAB_EPSILON:
+            return t ** 3
+        return (116 * t - 16) / _LAB_KAPPA
+
+    wx, wy, wz = white_reference(reference)
+    if l > _LAB_KAPPA * _LAB_EPSILON:
+        y = fy ** 3
+    else:
+        y = l / _LAB_KAPPA
+    return _inverse(fx) * wx, y * wy, _inverse(fz) * wz
+
+
+def rgb_to_lab(r, g, b, *, reference="D65"):
+    """
+    Converts RGB (0-1, gamma encoded sRGB) to CIELAB
+
+    :param r: Red
+    :param g: Green
+    :param b: Blue
+    :param reference: White reference (default: D65)
+    :return: L (0-100), a, b
+    """
+    _validate(r, g, b)
+    x, y, z = convert_rgb_to_xyz(*rgb_to_srgb(r, g, b), space="srgb",
+                                 reference=reference, clip=False)
+    return xyz_to_lab(x, y, z, reference=reference)
+
+
+def lab_to_rgb(l, a, b, *, reference="D65", clip=True):
+    """
+    Converts CIELAB to RGB (0-1, gamma encoded sRGB)
+
+    :param l: Lightness (0-100)
+    :param a: a
+    :param b: b
+    :param reference: White reference (default: D65)
+    :param clip: If True, values below 0 and above 1 will be clipped
+    :return: Red, Green, Blue
+    """
+    rgb = xyz_to_linear_rgb(*lab_to_xyz(l, a, b, reference=reference),
+                            space="srgb", reference=reference)
+    if clip:
+        rgb = [min(1, max(0, x)) for x in rgb]
+    return tuple(math.copysign(apply_gamma_transform(abs(x)), x)
+                 for x in rgb)
+
+
+def lab_to_lch(l, a, b):
+    """
+    Converts Lab (CIELAB or OKLab) to its cylindrical form (LCh)
+
+    :param l: Lightness
+    :param a: a
+    :param b: b
+    :return: Lightness, Chroma, Hue (in degrees, 0-360)
+    """
+    h = math.degrees(math.atan2(b, a)) % 360
+    return l, math.hypot(a, b), h
+
+
+def lch_to_lab(l, c, h):
+    """
+    Converts LCh to Lab (CIELAB or OKLab)
+
+    :param l: Lightness
+    :param c: Chroma
+    :param h: Hue (in degrees)
+    :return: Lightness, a, b
+    """
+    h = math.radians(h)
+    return l, c * math.cos(h), c * math.sin(h)
+
+
+def rgb_to_lch(r, g, b, *, reference="D65"):
+    """
+    Converts RGB (0-1, gamma encoded sRGB) to CIE-LCh(ab)
+
+    :param r: Red
+    :param g: Green
+    :param b: Blue
+    :param reference: White reference (default: D65)
+    :return: Lightness (0-100), Chroma, Hue (in degrees)
+    """
+    return lab_to_lch(*rgb_to_lab(r, g, b, reference=reference))
+
+
+def lch_to_rgb(l, c, h, *, reference="D65", clip=True):
+    """
+    Converts CIE-LCh(ab) to RGB (0-1, gamma encoded sRGB)
+
+    :param l: Lightness (0-100)
+    :param c: Chroma
+    :param h: Hue (in degrees)
+    :param reference: White reference (default: D65)
+    :param clip: If True, values below 0 and above 1 will be clipped
+    :return: Red, Green, Blue
+    """
+    return lab_to_rgb(*lch_to_lab(l, c, h), reference=reference, clip=clip)
+
+
+def rgb_to_oklch(r, g, b):
+    """
+    Converts RGB (0-1, gamma encoded sRGB) to OKLCh
+
+    :param r: Red
+    :param g: Green
+    :param b: Blue
+    :return: Lightness (0-1), Chroma, Hue (in degrees)
+    """
+    return lab_to_lch(*rgb_to_oklab(r, g, b))
+
+
+def oklch_to_rgb(l, c, h, *, clip=True):
+    """
+    Converts OKLCh to RGB (0-1, gamma encoded sRGB)
+
+    :param l: Lightness (0-1)
+    :param c: Chroma
+    :param h: Hue (in degrees)
+    :param clip: If True, values below 0 and above 1 will be clipped
+    :return: Red, Green, Blue
+    """
+    return oklab_to_rgb(*lch_to_lab(l, c, h), clip=clip)
+
+
 def relative_luminance(hex_color: str):
     """
     Relative luminance according to WCAG 2.0 standard
@@ -598,8 +823,8 @@ def color_in_between(c1, c2, no_of_colors=1) -> list:
     """
     Creates color between two colors in RGB ColorSpace
 
-    >>> color_in_between("#fb4b53", "#408bfc") # ['#9d6aa7']
-    >>> color_in_between("#fb4b53", "#408bfc", 3) # ['#cc5a7d', '#9d6aa7', '#6e7ad1']
+    >>> color_in_between("#fb4b53", "#408bfc") # ['#9e6ba8']
+    >>> color_in_between("#fb4b53", "#408bfc", 3) # ['#cc5b7d', '#9d6ba8', '#6f7bd2']
 
     :param c1: Hex of first color
     :param c2: Hex of second color
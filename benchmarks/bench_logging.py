@@ -0,0 +1,48 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Overhead of the (disabled) logging in Color.shade. Compares the default
+#  Log object with an object whose methods do nothing at all.
+#
+#  python -m benchmarks.bench_logging
+
+import timeit
+
+from SecretColors.helpers.logging import Log
+from SecretColors.models.base import Color
+
+
+class _NoLog:
+    def debug(self, *args):
+        pass
+
+    info = warn = debug
+
+
+def _color(log) -> Color:
+    color = Color("red", ["#ffd7d9", "#fb4b53", "#750e13"], [10, 50, 90],
+                  log=log)
+    color.values  # Build the shade table before timing
+    return color
+
+
+def main(number: int = 20000, repeat: int = 7):
+    rows = [("Log() (disabled)", _color(Log())),
+            ("no-op logger", _color(_NoLog()))]
+    timings = {}
+    for name, color in rows:
+        best = min(timeit.repeat(lambda: color.shade(50), number=number,
+                                 repeat=repeat))
+        timings[name] = best / number * 1e9
+        print(f"{name:>18} : {timings[name]:8.1f} ns per shade(50)")
+    base = timings["no-op logger"]
+    overhead = timings["Log() (disabled)"] - base
+    print(f"{'overhead':>18} : {overhead:8.1f} ns "
+          f"({overhead / base * 100:.1f} %)")
+
+
+if __name__ == "__main__":
+    main()
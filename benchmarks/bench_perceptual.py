@@ -0,0 +1,45 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Throughput of the vectorized perceptual color space conversions
+#  (CIELAB, LCh, OKLab, OKLCh) on large arrays.
+#
+#  python -m benchmarks.bench_perceptual [number_of_colors]
+
+import sys
+import time
+
+import numpy as np
+
+from SecretColors.helpers import vectorized as vc
+
+CONVERSIONS = [
+    ("rgb_to_lab", "rgb"), ("lab_to_rgb", "lab"),
+    ("rgb_to_lch", "rgb"), ("lch_to_rgb", "lch"),
+    ("rgb_to_oklab", "rgb"), ("oklab_to_rgb", "oklab"),
+    ("rgb_to_oklch", "rgb"), ("oklch_to_rgb", "oklch"),
+]
+
+
+def main(size: int = 1_000_000, repeat: int = 3):
+    rgb = np.random.default_rng(0).random((size, 3))
+    inputs = {"rgb": rgb, "lab": vc.rgb_to_lab(rgb),
+              "lch": vc.rgb_to_lch(rgb), "oklab": vc.rgb_to_oklab(rgb),
+              "oklch": vc.rgb_to_oklch(rgb)}
+    print(f"{size:,} colors")
+    for name, source in CONVERSIONS:
+        func = getattr(vc, name)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(inputs[source])
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>14} : {best * 1e3:8.1f} ms "
+              f"({size / best / 1e6:6.1f} M colors/s)")
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:2]])
@@ -0,0 +1,65 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Throughput and peak memory of the chunked value -> color pipeline.
+#
+#  python -m benchmarks.bench_streaming [number_of_values]
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from SecretColors.cmaps import BrewerMap
+
+
+def run(size: int, chunk_size: int, output: str):
+    cmap = BrewerMap().spectral()
+    with tempfile.TemporaryDirectory() as folder:
+        source = os.path.join(folder, "values.npy")
+        values = np.lib.format.open_memmap(source, mode="w+",
+                                           dtype=np.float64, shape=(size,))
+        values[:] = np.random.default_rng(0).random(size)
+        values.flush()
+        del values
+
+        def once():
+            if output == "file":
+                cmap.apply_to_file(source, os.path.join(folder, "colors.npy"),
+                                   chunk_size=chunk_size)
+            else:
+                for _ in cmap.stream(source, output=output,
+                                     chunk_size=chunk_size):
+                    pass
+
+        start = time.perf_counter()
+        once()
+        elapsed = time.perf_counter() - start
+        # Separate run: tracemalloc slows down allocation of Python objects
+        tracemalloc.start()
+        once()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"{output:>6} | chunk {chunk_size:>9,} | "
+          f"{size / elapsed / 1e6:8.2f} M values/s | "
+          f"peak {peak / 2 ** 20:8.2f} MiB")
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    print(f"Values: {size:,} ({size * 8 / 2 ** 20:.0f} MiB on disk)")
+    for chunk_size in [1 << 16, 1 << 20]:
+        for output in ["rgba", "bytes", "hex", "file"]:
+            if output == "hex" and chunk_size > 1 << 16:
+                continue
+            run(size, chunk_size, output)
+
+
+if __name__ == "__main__":
+    main()
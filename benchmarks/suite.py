@@ -0,0 +1,506 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Benchmark suite of the hot paths: scalar and batch conversions, Color.shade,
+#  Palette.get/random/cycle, ColorOutput and construction of every
+#  BrewerMap/TableauMap colormap.
+#
+#  python -m benchmarks.suite                  # Run and print timings
+#  python -m benchmarks.suite --save           # Save baseline of this machine
+#  python -m benchmarks.suite --compare        # Compare with saved baseline
+#  python -m benchmarks.suite --compare base.json --threshold 0.1 \
+#       --threshold-for cmap.=0.3 --filter utils.
+#
+#  Baselines are saved in benchmarks/baselines/<machine tag>.json. Timings
+#  are only comparable on the same machine; hence comparison uses baseline
+#  of the current machine by default. Exit code is 1 if any benchmark is
+#  slower than baseline by more than the threshold.
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+BASELINE_FOLDER = os.path.join(os.path.dirname(__file__), "baselines")
+DEFAULT_THRESHOLD = 0.2  # 20 % slower is a regression
+FORMAT_VERSION = 1
+
+_BENCHMARKS = {}  # Name -> setup function returning callable
+
+
+def benchmark(name: str):
+    """
+    Registers benchmark. Decorated function does the setup and returns the
+    callable which will be timed (or None to skip, e.g. NumPy missing).
+
+    :param name: Name of the benchmark (dotted, e.g. 'utils.hex_to_rgb')
+    """
+
+    def decorator(setup):
+        _BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def _numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+# ---------------------------------------------------------------- utils
+
+_SCALAR = {
+    "utils.hex_to_rgb": ("hex_to_rgb", ("#fb4b53",)),
+    "utils.rgb_to_hex": ("rgb_to_hex", (0.98, 0.29, 0.32)),
+    "utils.rgb_to_hsl": ("rgb_to_hsl", (0.98, 0.29, 0.32)),
+    "utils.hsl_to_rgb": ("hsl_to_rgb", (0.99, 0.95, 0.64)),
+    "utils.rgb_to_hsv": ("rgb_to_hsv", (0.98, 0.29, 0.32)),
+    "utils.hsv_to_rgb": ("hsv_to_rgb", (0.99, 0.7, 0.98)),
+    "utils.rgb_to_xyz": ("rgb_to_xyz", (0.98, 0.29, 0.32)),
+    "utils.xyz_to_rgb": ("xyz_to_rgb", (0.4, 0.25, 0.12)),
+    "utils.rgb_to_oklab": ("rgb_to_oklab", (0.98, 0.29, 0.32)),
+    "utils.oklab_to_rgb": ("oklab_to_rgb", (0.65, 0.18, 0.07)),
+    "utils.rgb_to_lab": ("rgb_to_lab", (0.98, 0.29, 0.32)),
+    "utils.lab_to_rgb": ("lab_to_rgb", (61.2, 67.6, 35.4)),
+    "utils.rgb_to_oklch": ("rgb_to_oklch", (0.98, 0.29, 0.32)),
+    "utils.color_in_between": ("color_in_between", ("#fb4b53", "#408bfc",
+                                                    10)),
+}
+
+
+def _scalar(function_name, args):
+    def setup():
+        from SecretColors import utils
+        func = getattr(utils, function_name)
+        return lambda: func(*args)
+
+    return setup
+
+
+for _name, (_func, _args) in _SCALAR.items():
+    benchmark(_name)(_scalar(_func, _args))
+
+
+@benchmark("rxutils.rgb_to_xyz.adobe")
+def _rx_to_xyz():
+    from SecretColors.helpers.rxutils import convert_rgb_to_xyz
+    return lambda: convert_rgb_to_xyz(0.98, 0.29, 0.32, space="adobe",
+                                      reference="D65")
+
+
+@benchmark("rxutils.xyz_to_rgb.adobe")
+def _rx_to_rgb():
+    from SecretColors.helpers.rxutils import convert_xyz_to_rgb
+    return lambda: convert_xyz_to_rgb(0.4, 0.25, 0.12, space="adobe",
+                                      reference="D65")
+
+
+# ---------------------------------------------------------------- batch
+
+_BATCH_SIZE = 10000
+
+
+def _batch(function_name, make_input):
+    def setup():
+        np = _numpy()
+        if np is None:
+            return None
+        from SecretColors.helpers import vectorized as vc
+        func = getattr(vc, function_name)
+        values = make_input(np)
+        return lambda: func(values)
+
+    return setup
+
+
+def _random_rgb(np):
+    return np.random.default_rng(0).random((_BATCH_SIZE, 3))
+
+
+def _random_hex(np):
+    from SecretColors.helpers import vectorized as vc
+    return vc.rgb_to_hex(_random_rgb(np))
+
+
+for _name, _input in [("hex_to_rgba255", _random_hex),
+                      ("rgb_to_hex", _random_rgb),
+                      ("rgb_to_hsl", _random_rgb),
+                      ("hsl_to_rgb", _random_rgb),
+                      ("rgb_to_oklab", _random_rgb),
+                      ("rgb_to_lab", _random_rgb),
+                      ("rgb_to_lch", _random_rgb),
+                      ("rgb_to_oklch", _random_rgb),
+                      ("srgb_to_linear", _random_rgb)]:
+    benchmark(f"batch.{_name}[{_BATCH_SIZE}]")(_batch(_name, _input))
+
+
+def _delta_e(metric):
+    def setup():
+        np = _numpy()
+        if np is None:
+            return None
+        from SecretColors.difference import delta_e
+        from SecretColors.helpers import vectorized as vc
+        rgb = _random_rgb(np)
+        lab1, lab2 = vc.rgb_to_lab(rgb), vc.rgb_to_lab(rgb[::-1])
+        return lambda: delta_e(lab1, lab2, metric)
+
+    return setup
+
+
+for _metric in ["cie76", "cie94", "ciede2000"]:
+    benchmark(f"batch.delta_e.{_metric}[{_BATCH_SIZE}]")(_delta_e(_metric))
+
+
+@benchmark(f"batch.convert_rgb_space.adobe_srgb[{_BATCH_SIZE}]")
+def _convert_rgb_space():
+    np = _numpy()
+    if np is None:
+        return None
+    from SecretColors.helpers.rxutils import convert_rgb_space
+    rgb = _random_rgb(np)
+    return lambda: convert_rgb_space(rgb, "adobe", "srgb")
+
+
+def _gamut(strategy):
+    def setup():
+        np = _numpy()
+        if np is None:
+            return None
+        from SecretColors.helpers.gamut import map_to_gamut
+        # Wider than sRGB so that some of the colors are out of gamut
+        rgb = _random_rgb(np) * 1.4 - 0.2
+        return lambda: map_to_gamut(rgb, strategy)
+
+    return setup
+
+
+for _strategy in ("clip", "chroma", "project"):
+    benchmark(f"batch.gamut.{_strategy}[{_BATCH_SIZE}]")(_gamut(_strategy))
+
+
+# ---------------------------------------------------------------- models
+
+def _color():
+    from SecretColors.models.palette import Palette
+    color = Palette().colors["red"]
+    color.values  # Build the shade table before timing
+    return color
+
+
+@benchmark("color.shade.exact")
+def _shade_exact():
+    color = _color()
+    exact = color.values[len(color.values) // 2].shade
+    return lambda: color.shade(exact)
+
+
+@benchmark("color.shade.interpolated")
+def _shade_interpolated():
+    color = _color()
+    return lambda: color.shade(33.3)
+
+
+@benchmark("palette.get")
+def _palette_get():
+    from SecretColors.models.palette import Palette
+    p = Palette()
+    return lambda: p.get("blue")
+
+
+@benchmark("palette.get.shade")
+def _palette_get_shade():
+    from SecretColors.models.palette import Palette
+    p = Palette()
+    return lambda: p.get("blue", shade=35)
+
+
+@benchmark("palette.random")
+def _palette_random():
+    from SecretColors.models.palette import Palette
+    p = Palette(seed=1)
+    return lambda: p.random(no_of_colors=5)
+
+
+@benchmark("palette.cycle[20]")
+def _palette_cycle():
+    from SecretColors.models.palette import Palette
+    p = Palette()
+
+    def run():
+        cycle = p.cycle()
+        for _ in range(20):
+            next(cycle)
+
+    return run
+
+
+@benchmark("color_output.new")
+def _color_output():
+    from SecretColors.models.objects import ColorOutput
+    return lambda: ColorOutput("#fb4b53")
+
+
+@benchmark("color_output.hsl")
+def _color_output_hsl():
+    from SecretColors.models.objects import ColorOutput
+    return lambda: ColorOutput("#fb4b53").hsl
+
+
+# ---------------------------------------------------------------- cmaps
+
+def _cmap(cls_name, name):
+    def setup():
+        from SecretColors import cmaps
+        cls = getattr(cmaps, cls_name)
+        if _numpy() is None:
+            return None  # Native colormaps need NumPy
+
+        cm = cls()
+
+        def run():
+            # Measure construction, not the cache lookup
+            cls.clear_cache()
+            return cm.get(name)
+
+        return run
+
+    return setup
+
+
+def _register_cmaps():
+    from SecretColors import cmaps
+    for cls_name in ["BrewerMap", "TableauMap"]:
+        for name in getattr(cmaps, cls_name)().get_all:
+            benchmark(f"cmap.{cls_name}.{name}")(_cmap(cls_name, name))
+
+
+# ---------------------------------------------------------------- runner
+
+def machine_info() -> dict:
+    """
+    :return: Information identifying the current machine and environment
+    """
+    np = _numpy()
+    return {"node": platform.node(),
+            "system": platform.system(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "numpy": np.__version__ if np is not None else None}
+
+
+def machine_tag(info: dict = None) -> str:
+    """
+    :param info: Output of :func:`machine_info` (default: current machine)
+    :return: Short tag used as the baseline filename
+    """
+    info = info or machine_info()
+    digest = hashlib.sha1(json.dumps(info, sort_keys=True).encode(
+        "utf-8")).hexdigest()[:8]
+    py = info["python"].rsplit(".", 1)[0]
+    return f"{info['system']}-{info['machine']}-py{py}-{digest}".lower()
+
+
+def baseline_path(tag: str = None) -> str:
+    return os.path.join(BASELINE_FOLDER, f"{tag or machine_tag()}.json")
+
+
+def measure(func, min_time: float = 0.05, repeat: int = 5) -> dict:
+    """
+    :param func: Function without arguments
+    :param min_time: Minimum duration (in seconds) of one repeat
+    :param repeat: Number of repeats
+    :return: Best and median time per call (in nanoseconds)
+    """
+    func()  # Warm-up (caches, lazy imports)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(
+            2, min(10, int(min_time / elapsed) + 1))
+    timings = [elapsed]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append(time.perf_counter() - start)
+    per_call = [t / number * 1e9 for t in timings]
+    return {"best_ns": min(per_call), "median_ns": statistics.median(
+        per_call), "number": number, "repeat": repeat}
+
+
+def run(filters: list = None, min_time: float = 0.05, repeat: int = 5,
+        verbose: bool = True) -> dict:
+    """
+    :param filters: Run only benchmarks containing any of these substrings
+    :param min_time: Minimum duration (in seconds) of one repeat
+    :param repeat: Number of repeats
+    :param verbose: If True, prints results as they come
+    :return: Results with machine information
+    """
+    if not any(x.startswith("cmap.") for x in _BENCHMARKS):
+        _register_cmaps()
+    results = {}
+    for name, setup in _BENCHMARKS.items():
+        if filters and not any(f in name for f in filters):
+            continue
+        func = setup()
+        if func is None:
+            if verbose:
+                print(f"{name:<45} skipped")
+            continue
+        results[name] = measure(func, min_time=min_time, repeat=repeat)
+        if verbose:
+            print(f"{name:<45} {results[name]['best_ns']:14,.0f} ns")
+    info = machine_info()
+    return {"version": FORMAT_VERSION,
+            "tag": machine_tag(info),
+            "machine": info,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "results": results}
+
+
+def _threshold(name: str, threshold: float, thresholds: dict) -> float:
+    # Longest matching prefix wins
+    matches = [p for p in thresholds if name.startswith(p)]
+    if not matches:
+        return threshold
+    return thresholds[max(matches, key=len)]
+
+
+def compare(current: dict, baseline: dict,
+            threshold: float = DEFAULT_THRESHOLD,
+            thresholds: dict = None) -> list:
+    """
+    :param current: Output of :func:`run`
+    :param baseline: Output of :func:`run` (e.g. loaded from the baseline)
+    :param threshold: Allowed relative slowdown (0.2 means 20 %)
+    :param thresholds: Prefix of benchmark name -> threshold (overrides
+        default threshold)
+    :return: List of (name, baseline ns, current ns, ratio, status) where
+        status is one of 'ok', 'regression', 'improvement', 'new' or
+        'missing'
+    """
+    thresholds = thresholds or {}
+    rows = []
+    old, new = baseline["results"], current["results"]
+    for name in list(old) + [x for x in new if x not in old]:
+        if name not in new:
+            rows.append((name, old[name]["best_ns"], None, None, "missing"))
+            continue
+        if name not in old:
+            rows.append((name, None, new[name]["best_ns"], None, "new"))
+            continue
+        base, now = old[name]["best_ns"], new[name]["best_ns"]
+        ratio = now / base if base else float("inf")
+        limit = _threshold(name, threshold, thresholds)
+        if ratio > 1 + limit:
+            status = "regression"
+        elif ratio < 1 - limit:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((name, base, now, ratio, status))
+    return rows
+
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_comparison(rows: list):
+    print(f"{'benchmark':<45} {'baseline ns':>14} {'current ns':>14} "
+          f"{'ratio':>7}  status")
+    for name, base, now, ratio, status in rows:
+        print(f"{name:<45} {_fmt(base, '14,.0f')} {_fmt(now, '14,.0f')} "
+              f"{_fmt(ratio, '7.2f')}  {status}")
+
+
+def _parse_thresholds(values: list) -> dict:
+    output = {}
+    for v in values or []:
+        prefix, _, limit = v.rpartition("=")
+        if not prefix:
+            raise ValueError(f"Use PREFIX=VALUE for --threshold-for. You "
+                             f"have provided '{v}'")
+        output[prefix] = float(limit)
+    return output
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="SecretColors benchmarks")
+    parser.add_argument("--filter", action="append",
+                        help="Run only benchmarks containing this substring")
+    parser.add_argument("--quick", action="store_true",
+                        help="Shorter (less precise) measurements")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--save", action="store_true",
+                        help="Save results as baseline of this machine")
+    parser.add_argument("--compare", nargs="?", const="",
+                        help="Compare with baseline (default: baseline of "
+                             "this machine)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative slowdown (default: 0.2)")
+    parser.add_argument("--threshold-for", action="append",
+                        help="Threshold for benchmarks starting with PREFIX "
+                             "(PREFIX=VALUE)")
+    args = parser.parse_args(argv)
+    thresholds = _parse_thresholds(args.threshold_for)
+
+    baseline = None
+    if args.compare is not None:
+        path = args.compare or baseline_path()
+        if not os.path.exists(path):
+            print(f"Baseline '{path}' not found. Create it with --save",
+                  file=sys.stderr)
+            return 2
+        with open(path) as f:
+            baseline = json.load(f)
+        if baseline.get("tag") != machine_tag():
+            print(f"Warning: baseline is from '{baseline.get('tag')}' and "
+                  f"this machine is '{machine_tag()}'", file=sys.stderr)
+
+    if args.quick:
+        current = run(args.filter, min_time=0.01, repeat=3)
+    else:
+        current = run(args.filter)
+
+    for path in [args.output, baseline_path() if args.save else None]:
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(current, f, indent=2)
+            print(f"Results written to {path}")
+
+    if baseline is not None:
+        rows = compare(current, baseline, args.threshold, thresholds)
+        print()
+        print_comparison(rows)
+        if any(r[4] == "regression" for r in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,7 @@ setuptools.setup(
     long_description=long_description,
     url="https://github.com/secretBiology/SecretColors",
     packages=setuptools.find_packages(),
+    package_data={"SecretColors": ["data/cmaps/*.bin"]},
     license='MIT License',
     classifiers=[
         "Programming Language :: Python :: 3.8",
@@ -0,0 +1,120 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests chromatic adaptation
+
+import pytest
+
+from SecretColors.helpers.adaptation import (adaptation_matrix, adapt,
+                                             fused_matrix, mat_inv, mat_mul,
+                                             rgb_to_xyz_matrix, ALL_METHODS)
+from SecretColors.helpers.rxutils import white_reference
+
+# Bradford D50 -> D65 from http://www.brucelindbloom.com
+BRADFORD_D50_D65 = ((0.9555766, -0.0230393, 0.0631636),
+                    (-0.0282895, 1.0099416, 0.0210077),
+                    (0.0122982, -0.0204830, 1.3299098))
+
+
+def _approx(m1, m2, tol):
+    return all(x == pytest.approx(y, abs=tol)
+               for r1, r2 in zip(m1, m2) for x, y in zip(r1, r2))
+
+
+def test_adaptation_matrix():
+    assert _approx(adaptation_matrix("D50", "D65"), BRADFORD_D50_D65, 1e-6)
+    identity = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+    assert _approx(adaptation_matrix("d65", "D65", "cat02"), identity, 0)
+    for method in ALL_METHODS:
+        forward = adaptation_matrix("D65", "D50", method)
+        backward = adaptation_matrix("D50", "D65", method)
+        assert _approx(mat_mul(forward, backward), identity, 1e-9)
+        # White is mapped to white
+        assert adapt(*white_reference("D65"), source="D65",
+                     destination="D50", method=method) == pytest.approx(
+            white_reference("D50"), abs=1e-6)
+    assert adapt(0.5, 0.5, 0.5, source="E", destination="C") != (0.5,) * 3
+    assert adaptation_matrix("D50", "D65") is adaptation_matrix("D50", "D65")
+    with pytest.raises(ValueError):
+        adaptation_matrix("D50", "D65", "cmccat")
+    with pytest.raises(ValueError):
+        mat_inv(((1, 2, 3), (2, 4, 6), (0, 0, 1)))
+
+
+def test_fused_matrix():
+    # RX_DATA D50 matrices are Bradford adapted versions of D65 ones
+    for space in ["srgb", "adobe", "apple"]:
+        adapted = mat_mul(adaptation_matrix("D50", "D65"),
+                          rgb_to_xyz_matrix(space, "D50"))
+        assert _approx(adapted, rgb_to_xyz_matrix(space, "D65"), 1e-5)
+        identity = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+        assert _approx(fused_matrix(space, "D50", space, "D65"), identity,
+                       1e-5)
+
+
+def test_arrays():
+    np = pytest.importorskip("numpy")
+    from SecretColors.helpers.adaptation import adapt_xyz, adapt_linear_rgb
+    xyz = np.random.default_rng(0).random((20, 30, 3))
+    adapted = adapt_xyz(xyz, "D65", "D50", "von_kries")
+    assert adapted.shape == xyz.shape
+    expected = [adapt(*x, source="D65", destination="D50",
+                      method="von_kries") for x in xyz.reshape(-1, 3)]
+    assert adapted.reshape(-1, 3) == pytest.approx(np.array(expected))
+
+    rgb = xyz.reshape(-1, 3)
+    out = adapt_linear_rgb(rgb, "D65", "D50", space="srgb",
+                           destination_space="pro_photo")
+    manual = np.array([adapt(*(np.array(rgb_to_xyz_matrix("srgb", "D65"))
+                               @ x), source="D65", destination="D50")
+                       for x in rgb])
+    manual = manual @ np.linalg.inv(rgb_to_xyz_matrix("pro_photo", "D50")).T
+    assert out == pytest.approx(manual, abs=1e-5)
+
+
+def test_convert_rgb_space():
+    np = pytest.importorskip("numpy")
+    from SecretColors.helpers.rxutils import (convert_rgb_space,
+                                              convert_rgb_to_xyz,
+                                              xyz_to_linear_rgb, native_white)
+    from SecretColors.utils import apply_gamma_transform
+    assert native_white("srgb") == "D65"
+    assert native_white("pro_photo") == "D50"
+
+    rng = np.random.default_rng(0)
+    image = rng.random((6, 7, 3))
+    out = convert_rgb_space(image, "adobe", "srgb")
+    assert out.shape == image.shape
+
+    # Same as the two step conversion without clipping in between
+    for rgb, result in zip(image.reshape(-1, 3), out.reshape(-1, 3)):
+        xyz = convert_rgb_to_xyz(*(rgb ** 2.2), space="adobe",
+                                 reference="D65", clip=False)
+        linear = xyz_to_linear_rgb(*xyz, space="srgb", reference="D65")
+        expected = [apply_gamma_transform(min(1, max(0, x)))
+                    for x in linear]
+        assert result == pytest.approx(np.array(expected), abs=1e-6)
+
+    assert convert_rgb_space([1, 1, 1], "adobe", "srgb") == pytest.approx(
+        np.ones(3), abs=1e-6)
+    red = convert_rgb_space([1, 0, 0], "srgb", "adobe")
+    assert red == pytest.approx(np.array([0.8587, 0, 0]), abs=1e-3)
+
+    # Different whites are adapted in both directions
+    colors = rng.random((100, 3))
+    for src, dst in [("apple", "pro_photo"), ("srgb", "eci"),
+                     ("srgb", "wide_gamut")]:
+        back = convert_rgb_space(convert_rgb_space(colors, src, dst,
+                                                   clip=False), dst, src)
+        assert back == pytest.approx(colors, abs=1e-4)
+    assert convert_rgb_space([1, 1, 1], "srgb", "pro_photo") == \
+           pytest.approx(np.ones(3), abs=1e-6)
+
+    wide = convert_rgb_space([0, 1, 0], "wide_gamut", "srgb", clip=False)
+    assert wide.min() < 0
+    assert convert_rgb_space([0, 1, 0], "wide_gamut", "srgb").min() == 0
+    with pytest.raises(AttributeError):
+        convert_rgb_space(colors, "srgb", "unknown")
@@ -0,0 +1,104 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests ColorArray
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from SecretColors.models.array import ColorArray
+from SecretColors.models.objects import ColorString
+from SecretColors.models.palette import Palette
+from SecretColors.utils import hex_to_hsl
+
+colors = ["#fb4b53", "#408bfc", "#00ff00", "#112233"]
+
+
+def test_construction():
+    ca = ColorArray(colors)
+    assert ca.shape == (4, 4)
+    assert ca.dtype == np.float32
+    assert ca.hex == colors
+    assert ColorArray([(0, 1, 0), ColorString("#fb4b53"), "#000"]).hex == [
+        "#00ff00", "#fb4b53", "#000000"]
+    u = ColorArray(colors, dtype="uint8")
+    assert u.hex == colors
+    assert u.rgb255.tolist() == ca.rgb255.tolist()
+    assert ColorArray(u.rgba255).hex == colors
+    assert ColorArray([]).shape == (0, 4)
+    for bad in [[(2, 0, 0)], np.zeros((3, 5))]:
+        with pytest.raises(ValueError):
+            ColorArray(bad)
+    with pytest.raises(ValueError):
+        ColorArray(colors, dtype="int16")
+
+
+def test_accessors():
+    ca = ColorArray(colors)
+    assert ca.rgb.shape == (4, 3)
+    assert np.shares_memory(ca.rgb, ca)
+    assert ca.alpha.tolist() == [1, 1, 1, 1]
+    for row, h in zip(ca.hsl, colors):
+        assert tuple(row) == pytest.approx(hex_to_hsl(h), abs=1e-6)
+    view = ca[1:3]
+    assert isinstance(view, ColorArray)
+    assert np.shares_memory(view, ca)
+    assert view.hex == colors[1:3]
+    assert not isinstance(ca[0], ColorArray)
+    assert memoryview(ca).shape == (4, 4)
+    assert [x.alpha for x in ca.to_outputs()] == [1, 1, 1, 1]
+
+
+def test_library_outputs():
+    p = Palette()
+    ca = p.get("red", no_of_colors=5, as_array=True, alpha=0.5)
+    assert isinstance(ca, ColorArray)
+    assert ca.hex == p.red(no_of_colors=5)
+    assert ca.alpha.tolist() == [0.5] * 5
+    assert p.random(no_of_colors=3, as_array=True).shape == (3, 4)
+
+    from SecretColors.cmaps import BrewerMap
+    bm = BrewerMap(None)
+    assert bm.get_colors("Spectral", 9, as_array=True).hex == \
+           bm.get_colors("Spectral", 9)
+
+
+def test_matplotlib():
+    mpl = pytest.importorskip("matplotlib")
+    import matplotlib.colors
+    ca = ColorArray(colors)
+    rgba = matplotlib.colors.to_rgba_array(ca)
+    assert np.allclose(rgba, ca.rgba)
+    cmap = matplotlib.colors.ListedColormap(ca)
+    assert matplotlib.colors.to_hex(cmap(0)) == colors[0]
+
+
+def test_color_wheel_batch():
+    from SecretColors.models.objects import ColorWheel
+    rng = np.random.default_rng(3)
+    bases = ["#%06x" % x for x in rng.integers(0, 0xffffff, 300)]
+    batch = ColorWheel.batch(bases)
+    wheels = [ColorWheel(x) for x in bases]
+    for step in [("rotate_hue", -75), ("make_darker", 20),
+                 ("rotate_saturation", 40), ("make_lighter", 35),
+                 ("rotate_lightness", 10)]:
+        getattr(batch, step[0])(step[1])
+        for w in wheels:
+            getattr(w, step[0])(step[1])
+
+    assert batch.color.hex == [w.color for w in wheels]
+    assert batch.text_color() == [w.text_color() for w in wheels]
+    for name in ["complementary", "triadic", "tetradic"]:
+        expected = [getattr(w, name)(True) for w in wheels]
+        assert getattr(batch, name)(True, as_hex=True) == expected
+    for loc in ["first", "middle", "last"]:
+        expected = [w.analogous(loc) for w in wheels]
+        assert batch.analogous(loc, as_hex=True) == expected
+    triadic = batch.triadic()
+    assert len(triadic) == 3 and all(x.shape == (300, 4) for x in triadic)
+    batch.reset()
+    assert batch.color.hex == bases
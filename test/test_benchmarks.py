@@ -0,0 +1,50 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests benchmark suite runner and baseline comparison
+
+import json
+
+from benchmarks import suite
+
+
+def _result(**timings):
+    return {"results": {k: {"best_ns": v} for k, v in timings.items()}}
+
+
+def test_compare():
+    baseline = _result(a=100, b=100, c=100, d=100)
+    current = _result(a=110, b=130, c=50, e=10)
+    rows = {r[0]: r[4] for r in suite.compare(current, baseline, 0.2)}
+    assert rows == {"a": "ok", "b": "regression", "c": "improvement",
+                    "d": "missing", "e": "new"}
+
+    rows = {r[0]: r[4] for r in suite.compare(current, baseline, 0.2,
+                                              {"b": 0.5})}
+    assert rows["b"] == "ok"
+
+
+def test_machine_tag():
+    info = suite.machine_info()
+    assert suite.machine_tag(info) == suite.machine_tag()
+    other = dict(info, cpu_count=(info["cpu_count"] or 0) + 1)
+    assert suite.machine_tag(other) != suite.machine_tag(info)
+
+
+def test_run_and_gate(tmp_path, capsys):
+    base = tmp_path / "base.json"
+    args = ["--filter", "utils.hex_to_rgb", "--quick"]
+    assert suite.main(args + ["--output", str(base)]) == 0
+    data = json.loads(base.read_text())
+    assert list(data["results"]) == ["utils.hex_to_rgb"]
+    assert data["tag"] == suite.machine_tag()
+
+    # Baseline which is impossibly fast
+    data["results"]["utils.hex_to_rgb"]["best_ns"] = 1e-3
+    base.write_text(json.dumps(data))
+    assert suite.main(args + ["--compare", str(base)]) == 1
+    assert "regression" in capsys.readouterr().out
+    assert suite.main(args + ["--compare", str(tmp_path / "x.json")]) == 2
@@ -0,0 +1,109 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests bulk conversion and command line interface
+
+import io
+import json
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from SecretColors import utils
+from SecretColors.__main__ import main
+from SecretColors.helpers.bulk import convert_chunk, convert_stream
+
+
+def test_convert_chunk():
+    output, errors = convert_chunk(["#ff0000", "#zzz", "0f0"], "hex", "hsl")
+    assert output == [(0.0, 1.0, 0.5), None, (0.333333, 1.0, 0.5)]
+    assert [i for i, _ in errors] == [1]
+    output, errors = convert_chunk(["255 0 0", [0, 0, 300], "1,2"],
+                                   "rgb255", "hex")
+    assert output == ["#ff0000", None, None]
+    assert len(errors) == 2
+    with pytest.raises(ValueError):
+        convert_chunk([], "hex", "unknown")
+
+
+def test_cmyk():
+    r, g, b = 0.2, 0.5, 0.7
+    expected = utils.cmy_to_cmyk(*utils.rgb_to_cmy(r, g, b))
+    output, _ = convert_chunk([[r, g, b], "0,0,0"], "rgb", "cmyk")
+    assert output[0] == pytest.approx(expected, abs=1e-6)
+    assert output[1] == (0.0, 0.0, 0.0, 1.0)
+    back, _ = convert_chunk(output, "cmyk", "rgb")
+    assert back[0] == pytest.approx((r, g, b), abs=1e-6)
+
+
+def test_lines_with_errors():
+    source = io.StringIO("#ff0000\nnot-a-color\n\n#0000ff\n")
+    output, errors = io.StringIO(), io.StringIO()
+    summary = convert_stream(source, output, "hex", "rgb255",
+                             error_stream=errors, chunk_size=1)
+    assert summary == {"converted": 2, "invalid": 1}
+    assert output.getvalue() == "255,0,0\n0,0,255\n"
+    assert errors.getvalue().startswith("2\t")
+
+
+def test_csv_and_jsonl():
+    source = io.StringIO("id,color\n1,#ffffff\n2,#000000\n")
+    output = io.StringIO()
+    convert_stream(source, output, "hex", "hsl", fmt="csv", column="color")
+    assert output.getvalue().splitlines() == [
+        "id,color,color_hsl", '1,#ffffff,"0.0,0.0,1.0"',
+        '2,#000000,"0.0,0.0,0.0"']
+    with pytest.raises(ValueError):
+        convert_stream(io.StringIO("a,b\n"), output, "hex", "hsl",
+                       fmt="csv", column="color")
+
+    source = io.StringIO('{"c": [1, 0, 0]}\n[0, 0, 1]\n{"d": 1}\n')
+    output = io.StringIO()
+    summary = convert_stream(source, output, "rgb", "hex", fmt="jsonl",
+                             column="c", output_column="hex")
+    assert summary == {"converted": 2, "invalid": 1}
+    lines = [json.loads(x) for x in output.getvalue().splitlines()]
+    assert lines == [{"c": [1, 0, 0], "hex": "#ff0000"}, "#0000ff"]
+
+
+def test_workers_keep_order():
+    values = [f"#{i:06x}" for i in range(0, 1 << 24, 4099)]
+    text = "\n".join(values) + "\n"
+    serial, parallel = io.StringIO(), io.StringIO()
+    convert_stream(io.StringIO(text), serial, "hex", "lab", chunk_size=97)
+    convert_stream(io.StringIO(text), parallel, "hex", "lab", chunk_size=97,
+                   workers=2)
+    assert serial.getvalue() == parallel.getvalue()
+    assert len(serial.getvalue().splitlines()) == len(values)
+
+
+def test_cli(tmp_path, capsys):
+    source = tmp_path / "colors.txt"
+    source.write_text("#ff0000\nbad-row\n")
+    output = tmp_path / "out.txt"
+    errors = tmp_path / "errors.tsv"
+    assert main(["convert", "--from", "hex", "--to", "rgb", "--input",
+                 str(source), "--output", str(output), "--errors",
+                 str(errors)]) == 0
+    assert output.read_text() == "1.0,0.0,0.0\n"
+    assert "bad-row" in errors.read_text()
+    assert "1 invalid" in capsys.readouterr().err
+    assert main(["convert", "--from", "hex", "--to", "rgb", "--format",
+                 "csv", "--input", str(source)]) == 2
+
+
+def test_cli_without_numpy(monkeypatch, capsys):
+    from SecretColors import helpers
+    monkeypatch.setitem(sys.modules, "SecretColors.helpers.bulk", None)
+    monkeypatch.delattr(helpers, "bulk")
+    with pytest.raises(SystemExit) as e:
+        main(["--help"])
+    assert e.value.code == 0
+    assert "convert" in capsys.readouterr().out
+    assert main(["convert", "--from", "hex", "--to", "rgb"]) == 2
+    assert "requires NumPy" in capsys.readouterr().err
@@ -0,0 +1,152 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests chunked (streaming) value -> color mapping
+
+import tracemalloc
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from SecretColors.cmaps import BrewerMap
+from SecretColors.difference import delta_e
+from SecretColors.helpers import vectorized as vc
+from SecretColors.helpers.chunked import compute_limits, iter_chunks, \
+    stream_colors, run_pipeline, delta_e_stage, aligned_chunk_rows
+
+cmap = BrewerMap().spectral()
+
+
+def test_limits():
+    data = np.concatenate([np.arange(1000.0), [np.nan]])
+    assert compute_limits(data, chunk_size=7) == (0, 999)
+    assert compute_limits([data[:500], data[500:]]) == (0, 999)
+    assert compute_limits(data - 10, positive_only=True) == (1, 989)
+    low, high = compute_limits(data, (0.1, 0.9), chunk_size=33)
+    assert (low, high) == tuple(np.nanquantile(data, (0.1, 0.9)))
+    big = np.random.default_rng(1).random(200000)
+    low, high = compute_limits(big, (0.05, 0.95), chunk_size=10000,
+                               sample_size=20000, seed=7)
+    assert abs(low - 0.05) < 0.01 and abs(high - 0.95) < 0.01
+    with pytest.raises(ValueError):
+        compute_limits([np.array([np.nan])])
+
+
+def test_fortran_order_chunks(tmp_path):
+    data = np.asfortranarray(np.arange(600.0).reshape(20, 30))
+    path = tmp_path / "fortran.npy"
+    np.save(path, data)
+    chunks = list(iter_chunks(path, chunk_size=70))
+    assert [len(x) for x in chunks] == [60] * 10
+    assert np.array_equal(np.concatenate(chunks), np.arange(600.0))
+    assert compute_limits(path, chunk_size=7) == (0, 599)
+    image = np.asfortranarray(np.random.default_rng(3).random((4, 5, 3)))
+    with pytest.raises(ValueError):
+        run_pipeline(image, np.empty((4, 5, 3)), ["rgb_to_lab"])
+
+
+def test_stream_same_as_apply(tmp_path):
+    data = np.random.default_rng(2).normal(size=(50, 40))
+    data[3, 4] = np.nan
+    expected = cmap.apply(data)
+    path = tmp_path / "values.npy"
+    np.save(path, data)
+
+    chunks = list(cmap.stream(path, chunk_size=300))
+    assert len(chunks) == 7
+    assert np.array_equal(np.concatenate(chunks), expected.reshape(-1, 4))
+
+    hexes = sum(cmap.stream(data, output="hex", chunk_size=512), [])
+    assert len(hexes) == data.size
+
+    out = cmap.apply_to_file(path, tmp_path / "colors.npy", chunk_size=128)
+    assert out.shape == (50, 40, 4) and out.dtype == np.uint8
+    assert np.array_equal(np.load(tmp_path / "colors.npy"),
+                          cmap.apply(data, bytes=True))
+
+    # One-shot iterators need limits
+    with pytest.raises(ValueError):
+        list(cmap.stream(iter([data])))
+    gen = cmap.stream(iter(np.array_split(data.ravel(), 3)),
+                      vmin=np.nanmin(data), vmax=np.nanmax(data))
+    assert np.array_equal(np.concatenate(list(gen)), expected.reshape(-1, 4))
+
+
+def test_stream_matplotlib():
+    matplotlib = pytest.importorskip("matplotlib")
+    mpl = BrewerMap(matplotlib).spectral()
+    data = np.linspace(1, 1000, 5000)
+    colors = np.concatenate(list(stream_colors(mpl, data, norm="log",
+                                               output="bytes",
+                                               chunk_size=999)))
+    assert np.array_equal(colors, cmap.apply(data, norm="log", bytes=True))
+
+
+def test_bounded_memory(tmp_path):
+    path = tmp_path / "large.npy"
+    np.save(path, np.arange(2_000_000, dtype=np.float64))  # ~16 MB
+    chunk = 50_000
+    tracemalloc.start()
+    try:
+        for _ in iter_chunks(path, chunk):
+            pass
+        cmap.apply_to_file(path, tmp_path / "out.npy", chunk_size=chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Few chunk-sized temporaries (8 bytes per value) and no full copy
+    assert peak < 40 * chunk * 8
+
+
+def test_pipeline(tmp_path):
+    rng = np.random.default_rng(3)
+    packed = rng.integers(0, 2 ** 32, size=10_000, dtype=np.uint32)
+    np.save(tmp_path / "packed.npy", packed)
+    stages = ["unpack_rgba255", "rgb255_to_rgb", "srgb_to_linear",
+              "linear_to_xyz", "xyz_to_lab"]
+    lab = vc.rgb_to_lab(vc.unpack_rgba255(packed)[:, :3] / 255)
+    out = run_pipeline(tmp_path / "packed.npy", tmp_path / "lab.npy", stages,
+                       chunk_size=1000)
+    assert out.shape == (10_000, 3)
+    assert np.allclose(np.load(tmp_path / "lab.npy"), lab)
+
+    reference = (50, 20, -30)
+    expected = delta_e(lab, np.array(reference))
+    stages.append(delta_e_stage(np.array(reference)))
+    for workers in [0, 3]:
+        result = np.empty(10_000)
+        run_pipeline(packed, result, stages, chunk_size=700, workers=workers)
+        assert np.allclose(result, expected)
+
+
+def test_pipeline_shapes():
+    image = np.random.default_rng(4).random((30, 40, 3))
+    out = run_pipeline(image, np.empty((30, 40, 3)), ["rgb_to_lab",
+                                                      "lab_to_lch"])
+    assert np.allclose(out, vc.lab_to_lch(vc.rgb_to_lab(image)))
+    assert aligned_chunk_rows(100_000, 4) % 1024 == 0
+    with pytest.raises(ValueError):
+        run_pipeline(image, np.empty((30, 41, 3)), ["rgb_to_lab"])
+    with pytest.raises(ValueError):
+        run_pipeline(image, np.empty((30, 40, 3)), ["unknown"])
+    with pytest.raises(TypeError):
+        run_pipeline([image], np.empty((30, 40, 3)), ["rgb_to_lab"])
+
+
+def test_pipeline_bounded_memory(tmp_path):
+    path = tmp_path / "rgb.npy"
+    np.save(path, np.random.default_rng(5).random((500_000, 3)))  # ~12 MB
+    chunk = 20_000
+    stages = ["srgb_to_linear", "linear_to_xyz", "xyz_to_lab"]
+    tracemalloc.start()
+    try:
+        run_pipeline(path, tmp_path / "lab.npy", stages, chunk_size=chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Chunk (24 bytes per row) x stages with few temporaries
+    assert peak < 10 * len(stages) * chunk * 24
@@ -0,0 +1,251 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests colormap classes
+
+from types import SimpleNamespace
+
+import pytest
+
+from SecretColors.cmaps import BrewerMap, TableauMap, ColorMap
+from SecretColors.cmaps.parent import ColorMapParent
+from SecretColors.models.palette import Palette
+
+
+class _FakeMatplotlib:
+    """Records every colormap construction"""
+
+    def __init__(self):
+        self.created = []
+        self.colors = SimpleNamespace(
+            LinearSegmentedColormap=SimpleNamespace(from_list=self._linear),
+            ListedColormap=self._listed)
+
+    def _linear(self, name, colors):
+        self.created.append(("linear", list(colors)))
+        return self.created[-1]
+
+    def _listed(self, colors):
+        self.created.append(("listed", list(colors)))
+        return self.created[-1]
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    ColorMapParent.clear_cache()
+    yield
+    ColorMapParent.set_cache_size(256)
+    ColorMapParent.clear_cache()
+
+
+def test_colormap_cache():
+    mat = _FakeMatplotlib()
+    bm = BrewerMap(mat)
+    first = bm.spectral()
+    assert bm.spectral() is first
+    assert BrewerMap(mat).get("Spectral") is first
+    assert len(mat.created) == 1
+    assert ColorMapParent.cache_info()["hits"] == 2
+
+    assert bm.spectral(is_reversed=True) is not first
+    assert bm.spectral(no_of_colors=5) is not first
+    assert bm.spectral(is_qualitative=True)[0] == "listed"
+    assert TableauMap(mat).tableau() is not first
+
+    cm = ColorMap(mat)
+    greens = cm.greens()
+    assert cm.greens() is greens
+    assert cm.greens(starting_shade=30) is not greens
+    cm.palette = Palette("material")
+    assert cm.greens() is not greens
+
+    info = ColorMapParent.cache_info()
+    assert info["misses"] == len(mat.created)
+    ColorMapParent.clear_cache()
+    assert ColorMapParent.cache_info()["size"] == 0
+    bm.spectral()
+    assert ColorMapParent.cache_info()["misses"] == 1
+
+
+def test_cache_color_mode():
+    mat = _FakeMatplotlib()
+    opaque = ColorMap(mat).greens()
+    transparent = ColorMap(mat, palette=Palette(color_mode="hexa")).greens()
+    assert transparent is not opaque
+    assert len(mat.created) == 2
+    assert all(len(c) == 7 for c in opaque[1])
+    assert all(len(c) == 9 for c in transparent[1])
+
+
+def test_cache_size():
+    mat = _FakeMatplotlib()
+    bm = BrewerMap(mat)
+    ColorMapParent.set_cache_size(2)
+    for n in [3, 4, 5, 3]:
+        bm.spectral(no_of_colors=n)
+    assert len(mat.created) == 4
+    assert ColorMapParent.cache_info()["evictions"] == 2
+    ColorMapParent.set_cache_size(0)
+    bm.spectral()
+    bm.spectral()
+    assert len(mat.created) == 6
+    with pytest.raises(ValueError):
+        ColorMapParent.set_cache_size(-1)
+
+
+def test_native_colormaps():
+    np = pytest.importorskip("numpy")
+    from SecretColors.cmaps.native import NativeColormap
+    from SecretColors.models.array import ColorArray
+    bm = BrewerMap()
+    cmap = bm.spectral()
+    assert isinstance(cmap, NativeColormap)
+    lut = cmap.lut()
+    assert lut.shape == (256, 4) and lut.dtype == np.float32
+    assert not lut.flags.writeable
+    assert cmap.lut(16, "uint8").shape == (16, 4)
+    assert np.allclose(lut[0], ColorArray(cmap.colors[:1]).rgba[0])
+    assert np.allclose(lut[-1], ColorArray(cmap.colors[-1:]).rgba[0])
+
+    data = np.array([[0, 5], [10, np.nan]])
+    rgba = cmap.apply(data)
+    assert rgba.shape == (2, 2, 4)
+    assert np.allclose(rgba[0, 0], lut[0])
+    assert np.allclose(rgba[1, 0], lut[-1])
+    assert rgba[1, 1].tolist() == [0, 0, 0, 0]
+    assert cmap.apply(data, bytes=True).dtype == np.uint8
+    assert np.allclose(cmap.apply([-5, 20], vmin=0, vmax=10), lut[[0, -1]])
+
+    log = cmap.apply([1, 10, 100, -1], norm="log")
+    assert np.allclose(log[1], cmap(0.5))
+    assert log[3].tolist() == [0, 0, 0, 0]
+    sym = cmap.apply([-100, 0, 100], norm="symlog")
+    assert np.allclose(sym[1], cmap(0.5))
+    with pytest.raises(ValueError):
+        cmap.apply(data, norm="power")
+
+    listed = TableauMap().tableau(is_qualitative=True)
+    assert listed.lut().shape == (10, 4)
+    assert ColorMap().greens(is_reversed=True).colors[0] == \
+           ColorMap().greens().colors[-1]
+
+
+def test_native_same_as_matplotlib():
+    np = pytest.importorskip("numpy")
+    matplotlib = pytest.importorskip("matplotlib")
+    import matplotlib.colors
+    values = np.concatenate([np.linspace(-0.2, 1.2, 999), [np.nan]])
+    for native in [BrewerMap().spectral(), BrewerMap().rd_bu(),
+                   TableauMap().tableau(is_qualitative=True)]:
+        mpl = native.to_matplotlib(matplotlib)
+        assert np.allclose(native(values), mpl(values), atol=1e-6)
+        assert np.array_equal(native(values, bytes=True),
+                              mpl(values, bytes=True))
+        data = np.linspace(0.1, 1000, 500)
+        for norm, mpl_norm in [
+            ("linear", matplotlib.colors.Normalize()),
+            ("log", matplotlib.colors.LogNorm()),
+            ("symlog", matplotlib.colors.SymLogNorm(linthresh=1, base=10))]:
+            assert np.allclose(native.apply(data, norm=norm),
+                               mpl(mpl_norm(data)), atol=1e-6)
+
+
+def test_resample():
+    bm = BrewerMap(_FakeMatplotlib())
+    data = bm.data["Spectral"]
+    assert bm.get_colors("Spectral", 9) == data["9"]
+    colors = bm.get_colors("Spectral", 2000)
+    assert len(colors) == 2000
+    assert colors[0] == data["11"][0] and colors[-1] == data["11"][-1]
+    assert bm.get_colors("Spectral", 21)[::2] == data["11"]
+    assert bm.resample("Spectral", 2000) is not colors
+    assert ColorMapParent._resampled.stats()["hits"] > 0
+    assert bm.spectral(no_of_colors=15)[1] == bm.resample("Spectral", 15)
+
+    # Qualitative maps are never interpolated
+    set1 = bm.data["Set1"]["9"]
+    assert bm.get_colors("Set1", 2) == set1[:2]
+    extended = bm.get_colors("Set1", 40)
+    assert extended[:9] == set1
+    assert len(set(extended)) == 40
+    tableau = TableauMap().data["Tableau"]
+    assert TableauMap().get_colors("Tableau", 12) == tableau["20"][:12]
+
+    with pytest.raises(ValueError):
+        bm.get_colors("Spectral", 1)
+    with pytest.raises(ValueError):
+        bm.spectral(no_of_colors=1)
+    with pytest.raises(KeyError):
+        bm.get_colors("NoSuchMap", 5)
+    with pytest.raises(ValueError):
+        ColorMap().resample("Spectral", 5)
+
+
+def test_packed_data(tmp_path, monkeypatch):
+    from SecretColors.data.cmaps import packed
+    for dataset in packed.DATASETS:
+        with open(packed.data_path(dataset), "rb") as f:
+            # Run 'python -m SecretColors.data.cmaps.packed' after editing
+            # the python data
+            assert f.read() == packed.compile_dataset(dataset), dataset
+        store = packed.load(dataset)
+        assert store.to_dict() == {
+            k: {s: (v.lower() if s == "type" else [x.lower() for x in v])
+                for s, v in m.items()}
+            for k, m in packed.source_data(dataset).items()}
+
+    store = packed.load("brewer")
+    assert store.sizes("Spectral") == tuple(range(3, 12))
+    assert store.type("Spectral") == "div"
+    assert store.type_id("Set1") == packed.CMAP_QUALITATIVE
+    assert store.hex("Spectral", 5) == BrewerMap().data["Spectral"]["5"]
+    assert len(store.raw("Spectral", 5)) == 15
+    with pytest.raises(KeyError):
+        store.raw("Spectral", 50)
+    with pytest.raises(KeyError):
+        store.sizes("NoSuchMap")
+
+    assert packed.build(str(tmp_path))[0].endswith("brewer.bin")
+    loaded = packed.PackedCmapData((tmp_path / "brewer.bin").read_bytes())
+    assert loaded.to_dict() == store.to_dict()
+
+    # Empty or missing file: built in the memory from the python data
+    (tmp_path / "brewer.bin").write_bytes(b"")
+    monkeypatch.setattr(packed, "data_path",
+                        lambda x: str(tmp_path / f"{x}.bin"))
+    assert packed._open("brewer").to_dict() == store.to_dict()
+    (tmp_path / "brewer.bin").unlink()
+    assert packed._open("brewer").sizes("Set1") == store.sizes("Set1")
+    with pytest.raises(ValueError):
+        packed.PackedCmapData(b"XXXX" + bytes(16))
+
+    # File which does not match the python data: built from the python data
+    for dataset in packed.DATASETS:
+        with open(packed.source_path(dataset), "rb") as f:
+            (tmp_path / f"{dataset}.py").write_bytes(f.read())
+    source = tmp_path / "brewer.py"
+    monkeypatch.setattr(packed, "source_path",
+                        lambda x: str(tmp_path / f"{x}.py"))
+    packed.build(str(tmp_path))
+    assert packed._open("brewer").digest == packed.source_digest("brewer")
+    source.write_text(source.read_text() + "\n# Edited\n")
+    store = packed._open("brewer")
+    assert store.digest == packed.source_digest("brewer")
+    assert store.to_dict() == packed.load("brewer").to_dict()
+    # Without python source, packed file is trusted
+    source.unlink()
+    assert packed.source_digest("brewer") is None
+    assert packed._open("brewer").to_dict() == store.to_dict()
+
+
+def test_packed_arrays():
+    np = pytest.importorskip("numpy")
+    from SecretColors.data.cmaps import packed
+    rgb = packed.load("tableau").rgb255("Tableau", 10)
+    assert rgb.shape == (10, 3) and rgb.dtype == np.uint8
+    assert not rgb.flags.writeable
+    colors = TableauMap().get_colors("Tableau", 10, as_array=True)
+    assert colors.hex == TableauMap().data["Tableau"]["10"]
@@ -0,0 +1,167 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests color difference (Delta E)
+
+import random
+
+import pytest
+
+from SecretColors.difference import (delta_e, color_difference, top_k,
+                                     within, pairwise_delta_e, iter_pairwise,
+                                     ALL_METRICS)
+from SecretColors.utils import rgb_to_lab
+
+# Sharma, Wu and Dalal (2005) CIEDE2000 test data: Lab1, Lab2, Delta E 2000
+SHARMA_DATA = [
+    ((50.0000, 2.6772, -79.7751), (50.0000, 0.0000, -82.7485), 2.0425),
+    ((50.0000, 3.1571, -77.2803), (50.0000, 0.0000, -82.7485), 2.8615),
+    ((50.0000, 2.8361, -74.0200), (50.0000, 0.0000, -82.7485), 3.4412),
+    ((50.0000, -1.3802, -84.2814), (50.0000, 0.0000, -82.7485), 1.0000),
+    ((50.0000, -1.1848, -84.8006), (50.0000, 0.0000, -82.7485), 1.0000),
+    ((50.0000, -0.9009, -85.5211), (50.0000, 0.0000, -82.7485), 1.0000),
+    ((50.0000, 0.0000, 0.0000), (50.0000, -1.0000, 2.0000), 2.3669),
+    ((50.0000, -1.0000, 2.0000), (50.0000, 0.0000, 0.0000), 2.3669),
+    ((50.0000, 2.4900, -0.0010), (50.0000, -2.4900, 0.0009), 7.1792),
+    ((50.0000, 2.4900, -0.0010), (50.0000, -2.4900, 0.0010), 7.1792),
+    ((50.0000, 2.4900, -0.0010), (50.0000, -2.4900, 0.0011), 7.2195),
+    ((50.0000, 2.4900, -0.0010), (50.0000, -2.4900, 0.0012), 7.2195),
+    ((50.0000, -0.0010, 2.4900), (50.0000, 0.0009, -2.4900), 4.8045),
+    ((50.0000, -0.0010, 2.4900), (50.0000, 0.0010, -2.4900), 4.8045),
+    ((50.0000, -0.0010, 2.4900), (50.0000, 0.0011, -2.4900), 4.7461),
+    ((50.0000, 2.5000, 0.0000), (50.0000, 0.0000, -2.5000), 4.3065),
+    ((50.0000, 2.5000, 0.0000), (73.0000, 25.0000, -18.0000), 27.1492),
+    ((50.0000, 2.5000, 0.0000), (61.0000, -5.0000, 29.0000), 22.8977),
+    ((50.0000, 2.5000, 0.0000), (56.0000, -27.0000, -3.0000), 31.9030),
+    ((50.0000, 2.5000, 0.0000), (58.0000, 24.0000, 15.0000), 19.4535),
+    ((50.0000, 2.5000, 0.0000), (50.0000, 3.1736, 0.5854), 1.0000),
+    ((50.0000, 2.5000, 0.0000), (50.0000, 3.2972, 0.0000), 1.0000),
+    ((50.0000, 2.5000, 0.0000), (50.0000, 1.8634, 0.5757), 1.0000),
+    ((50.0000, 2.5000, 0.0000), (50.0000, 3.2592, 0.3350), 1.0000),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((63.0109, -31.0961, -5.8663), (62.8187, -29.7946, -4.0864), 1.2630),
+    ((61.2901, 3.7196, -5.3901), (61.4292, 2.2480, -4.9620), 1.8731),
+    ((35.0831, -44.1164, 3.7933), (35.0232, -40.0716, 1.5901), 1.8645),
+    ((22.7233, 20.0904, -46.6940), (23.0331, 14.9730, -42.5619), 2.0373),
+    ((36.4612, 47.8580, 18.3852), (36.2715, 50.5065, 21.2231), 1.4146),
+    ((90.8027, -2.0831, 1.4410), (91.1528, -1.6435, 0.0447), 1.4441),
+    ((90.9257, -0.5406, -0.9208), (88.6381, -0.8985, -0.7239), 1.5381),
+    ((6.7747, -0.2908, -2.4247), (5.8714, -0.0985, -2.2286), 0.6377),
+    ((2.0776, 0.0795, -1.1350), (0.9033, -0.0636, -0.5514), 0.9082),
+]
+
+
+def test_sharma_data():
+    for lab1, lab2, expected in SHARMA_DATA:
+        assert delta_e(lab1, lab2) == pytest.approx(expected, abs=1e-4)
+        assert delta_e(lab2, lab1) == pytest.approx(expected, abs=1e-4)
+
+
+def test_sharma_data_vectorized():
+    np = pytest.importorskip("numpy")
+    lab1 = np.array([x[0] for x in SHARMA_DATA])
+    lab2 = np.array([x[1] for x in SHARMA_DATA])
+    expected = np.array([x[2] for x in SHARMA_DATA])
+    assert delta_e(lab1, lab2) == pytest.approx(expected, abs=1e-4)
+    assert delta_e(lab2, lab1) == pytest.approx(expected, abs=1e-4)
+
+
+def test_other_metrics():
+    lab1, lab2 = (50, 2.5, 0), (73, 25, -18)
+    assert delta_e(lab1, lab2, "cie76") == pytest.approx(
+        (23 ** 2 + 22.5 ** 2 + 18 ** 2) ** 0.5)
+    # Graphic arts weights: SL = 1, SC = 1 + 0.045 C1, SH = 1 + 0.015 C1
+    dc = 2.5 - (25 ** 2 + 18 ** 2) ** 0.5
+    dh2 = 22.5 ** 2 + 18 ** 2 - dc ** 2
+    expected = (23 ** 2 + (dc / 1.1125) ** 2 + dh2 / 1.0375 ** 2) ** 0.5
+    assert delta_e(lab1, lab2, "CIE94") == pytest.approx(expected)
+    assert delta_e(lab1, lab1, "cie94") == 0
+    assert color_difference("#ff0000", (1, 0, 0)) == 0
+    assert color_difference("#ff0000", "#00ff00", "cie76") == pytest.approx(
+        delta_e(rgb_to_lab(1, 0, 0), rgb_to_lab(0, 1, 0), "cie76"))
+    with pytest.raises(ValueError):
+        delta_e(lab1, lab2, "cmc")
+    with pytest.raises(TypeError):
+        color_difference(12, "#ff0000")
+
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0)
+    a = rng.random((50, 3)) * [100, 200, 200] - [0, 100, 100]
+    b = rng.random((50, 3)) * [100, 200, 200] - [0, 100, 100]
+    for metric in ALL_METRICS:
+        expected = [delta_e(tuple(x), tuple(y), metric) for x, y in zip(a, b)]
+        assert delta_e(a, b, metric) == pytest.approx(np.array(expected))
+
+
+def test_opposite_hues():
+    np = pytest.importorskip("numpy")
+    pairs = [((20, -120, 40), (60, 120, -40)),
+             ((50, 10, 0), (50, -10, 0)),
+             ((50, 0, 10), (50, 0, -10)),
+             ((50, 3, 4), (50, -3, -4)),
+             ((50, -7, -0.5), (50, 7, 0.5)),
+             # Near-opposite pairs on both sides of 180 degrees
+             ((50, 10, 0), (50, -10, 1e-13)),
+             ((50, 10, 0), (50, -10, -1e-13)),
+             ((50, 3, 4), (50, -3.000001, -4)),
+             ((50, 3, 4), (50, -2.999999, -4))]
+    lab1 = np.array([x[0] for x in pairs], dtype=float)
+    lab2 = np.array([x[1] for x in pairs], dtype=float)
+    for first, second in [(lab1, lab2), (lab2, lab1)]:
+        expected = [delta_e(tuple(x), tuple(y))
+                    for x, y in zip(first, second)]
+        assert delta_e(first, second) == pytest.approx(np.array(expected))
+    assert delta_e(*pairs[0]) == pytest.approx(delta_e(*pairs[0][::-1]))
+
+
+def test_pairwise():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(1)
+    a = rng.random((37, 3)) * [100, 100, 100] - [0, 50, 50]
+    b = rng.random((23, 3)) * [100, 100, 100] - [0, 50, 50]
+    full = delta_e(a[:, None, :], b[None, :, :], "cie94")
+    assert pairwise_delta_e(a, b, "cie94", block_size=5) == pytest.approx(
+        full)
+    out = np.zeros((37, 23))
+    assert pairwise_delta_e(a, b, "cie94", block_size=8, out=out) is out
+    with pytest.raises(ValueError):
+        pairwise_delta_e(a, b, out=np.zeros((2, 2)))
+    blocks = list(iter_pairwise(a, b, block_size=10))
+    assert len(blocks) == 4 * 3
+    assert max(x[2].size for x in blocks) == 100
+
+    index, distance = top_k(a, b, k=3, block_size=4)
+    expected = np.argsort(delta_e(a[:, None], b[None, :]), axis=1)[:, :3]
+    assert (index == expected).all()
+    assert (np.diff(distance, axis=1) >= 0).all()
+
+    # Nearest other color within the same array
+    index, distance = top_k(a, k=1, block_size=6)
+    matrix = pairwise_delta_e(a)
+    np.fill_diagonal(matrix, np.inf)
+    assert (index[:, 0] == matrix.argmin(axis=1)).all()
+    with pytest.raises(ValueError):
+        top_k(a, k=37)
+
+
+def test_within():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(2)
+    a = rng.random((40, 3)) * [100, 60, 60] - [0, 30, 30]
+    matrix = pairwise_delta_e(a)
+    threshold = 15
+    pairs = set()
+    for i, j, d in within(a, threshold=threshold, block_size=7):
+        assert (i < j).all()
+        assert d == pytest.approx(matrix[i, j])
+        pairs.update(zip(i.tolist(), j.tolist()))
+    expected = {(i, j) for i in range(40) for j in range(i + 1, 40)
+                if matrix[i, j] <= threshold}
+    assert pairs == expected
+
+    b = a[:10] + 0.1
+    found = np.concatenate([i for i, _, _ in within(a, b, threshold=1)])
+    assert set(range(10)) <= set(found.tolist())
@@ -0,0 +1,128 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests persistent disk cache
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from SecretColors.cmaps import BrewerMap
+from SecretColors.helpers import diskcache
+from SecretColors.helpers.diskcache import (DiskCache, SOURCES,
+                                            data_version)
+
+
+def test_get_put(tmp_path):
+    cache = DiskCache(tmp_path)
+    assert cache.get("lut", ("a", 1)) is None
+    calls = []
+
+    def _factory():
+        calls.append(1)
+        return np.arange(12, dtype=np.uint8).reshape(4, 3)
+
+    first = cache.get_or_create("lut", ("a", 1), _factory)
+    second = cache.get_or_create("lut", ("a", 1), _factory)
+    assert isinstance(second, np.memmap)
+    assert not second.flags.writeable
+    assert np.array_equal(first, second)
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 1, "misses": 2, "writes": 1,
+                             "errors": 0}
+    # Other versions do not see the entry
+    assert DiskCache(tmp_path, version="other").get("lut", ("a", 1)) is None
+    cache.clear()
+    assert cache.get("lut", ("a", 1)) is None
+
+
+def test_concurrent_writes(tmp_path):
+    value = np.random.default_rng(2).random((1000, 4))
+
+    def _write(_):
+        cache = DiskCache(tmp_path, version="v")
+        return cache.get_or_create("table", "key", lambda: value)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(_write, range(32)))
+    assert all(np.array_equal(x, value) for x in results)
+    files = os.listdir(os.path.dirname(DiskCache(tmp_path, "v").path(
+        "table", "key")))
+    assert len(files) == 1 and files[0].endswith(".npy")
+
+
+def test_corrupt_entry(tmp_path):
+    cache = DiskCache(tmp_path)
+    path = cache.put("lut", "key", np.zeros(3))
+    with open(path, "wb") as f:
+        f.write(b"broken")
+    assert cache.get("lut", "key") is None
+    assert cache.stats()["errors"] == 1
+    value = cache.get_or_create("lut", "key", lambda: np.ones(3))
+    assert np.array_equal(value, np.ones(3))
+
+
+def test_data_version(tmp_path):
+    (tmp_path / "data.py").write_text("DATA = 1\n")
+    version = data_version(str(tmp_path))
+    assert version == data_version(str(tmp_path))
+    (tmp_path / "data.py").write_text("DATA = 2\n")
+    data_version.cache_clear()
+    assert data_version(str(tmp_path)) != version
+
+
+def test_data_version_sources(tmp_path):
+    (tmp_path / "data.py").write_text("DATA = 1\n")
+    version = data_version(str(tmp_path))
+    assert data_version(str(tmp_path), ()) != version
+    assert data_version(str(tmp_path), SOURCES[:1]) != version
+
+
+def test_data_version_stamp(tmp_path, monkeypatch):
+    data, root = tmp_path / "data", str(tmp_path / "cache")
+    data.mkdir()
+    (data / "data.py").write_text("DATA = 1\n")
+    version = data_version(str(data), (), root)
+    assert version == data_version(str(data), ())
+    assert len(os.listdir(os.path.join(root, "versions"))) == 1
+
+    # Unchanged files: stored hash is used without reading them
+    def _fail(files):
+        raise AssertionError("Files should not be hashed")
+
+    data_version.cache_clear()
+    monkeypatch.setattr(diskcache, "_content_hash", _fail)
+    assert data_version(str(data), (), root) == version
+    monkeypatch.undo()
+
+    (data / "data.py").write_text("DATA = 22\n")
+    data_version.cache_clear()
+    assert data_version(str(data), (), root) != version
+
+    # Missing source files are skipped
+    assert data_version(str(data), ("missing.py",), root)
+
+
+def test_library_tables(tmp_path):
+    BrewerMap.clear_cache()
+    expected = BrewerMap().resample("Spectral", 300)
+    lut = BrewerMap().spectral().lut(512)
+    cache = diskcache.enable(tmp_path)
+    try:
+        for _ in range(2):
+            BrewerMap.clear_cache()
+            assert BrewerMap().resample("Spectral", 300) == expected
+            cached = BrewerMap().spectral().lut(512)
+            assert isinstance(cached, np.memmap)
+            assert np.array_equal(cached, lut)
+        assert cache.stats()["writes"] == 2
+        assert cache.stats()["hits"] == 2
+    finally:
+        diskcache.disable()
+        BrewerMap.clear_cache()
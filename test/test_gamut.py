@@ -0,0 +1,93 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests gamut mapping
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from SecretColors.helpers import vectorized as vc
+from SecretColors.helpers.gamut import (map_to_gamut, lab_to_rgb,
+                                        oklab_to_rgb, out_of_gamut,
+                                        ALL_STRATEGIES)
+
+HUES = np.arange(0, 360, 30)
+
+
+def _hue_error(h1, h2):
+    return np.abs((h1 - h2 + 180) % 360 - 180).max()
+
+
+def _vivid_oklch():
+    return np.array([[0.7, 0.4, h] for h in HUES], dtype=float)
+
+
+@pytest.mark.parametrize("strategy", ALL_STRATEGIES)
+def test_in_gamut_untouched(strategy):
+    rgb = np.random.default_rng(7).random((50, 3))
+    mapped, mask = map_to_gamut(rgb, strategy)
+    assert not mask.any()
+    assert np.array_equal(mapped, rgb)
+
+
+@pytest.mark.parametrize("strategy", ALL_STRATEGIES)
+def test_mapped_in_gamut(strategy):
+    rgb = vc.oklch_to_rgb(_vivid_oklch(), clip=False)
+    rgb = np.vstack([rgb, [[0.2, 0.4, 0.6]]])
+    mapped, mask = map_to_gamut(rgb, strategy)
+    assert mask.tolist() == [True] * len(HUES) + [False]
+    assert not out_of_gamut(mapped, 0).any()
+    assert np.array_equal(mapped[-1], rgb[-1])
+
+
+def test_chroma_keeps_hue_and_lightness():
+    lch = _vivid_oklch()
+    mapped, _ = map_to_gamut(vc.oklch_to_rgb(lch, clip=False))
+    back = vc.rgb_to_oklch(mapped)
+    assert np.allclose(back[:, 0], 0.7, atol=1e-4)
+    assert _hue_error(back[:, 2], HUES) < 0.01
+    # Clipping shifts the hue a lot in comparison
+    clipped, _ = map_to_gamut(vc.oklch_to_rgb(lch, clip=False), "clip")
+    assert _hue_error(vc.rgb_to_oklch(clipped)[:, 2], HUES) > 10
+
+
+def test_chroma_lch():
+    lab = vc.lch_to_lab(np.array([[60, 120, h] for h in HUES], dtype=float))
+    mapped, mask = lab_to_rgb(lab, space="lch")
+    assert mask.all()
+    back = vc.lab_to_lch(vc.rgb_to_lab(mapped))
+    assert np.allclose(back[:, 0], 60, atol=1e-3)
+    assert _hue_error(back[:, 2], HUES) < 0.01
+
+
+def test_project_anchor():
+    rgb = vc.oklch_to_rgb(_vivid_oklch(), clip=False)
+    for anchor in ["mid", "luminance", 0.3]:
+        mapped, mask = map_to_gamut(rgb, "project", anchor=anchor)
+        assert mask.all()
+        assert not out_of_gamut(mapped, 0).any()
+    # Point on the boundary between color and the anchor
+    mapped, _ = map_to_gamut([[1.5, 0.5, 0.5]], "project")
+    assert np.allclose(mapped, [[1, 0.5, 0.5]])
+    with pytest.raises(ValueError):
+        map_to_gamut(rgb, "project", anchor=2)
+
+
+def test_shape_and_errors():
+    oklab = vc.lch_to_lab(_vivid_oklch()).reshape(3, 4, 3)
+    mapped, mask = oklab_to_rgb(oklab)
+    assert mapped.shape == (3, 4, 3)
+    assert mask.shape == (3, 4)
+    with pytest.raises(ValueError):
+        map_to_gamut(mapped, "unknown")
+    with pytest.raises(ValueError):
+        map_to_gamut(mapped, space="xyz")
+    # Arguments are validated even when all colors are in gamut
+    for kwargs in [{"anchor": "bogus"}, {"anchor": -0.1}, {"anchor": None},
+                   {"steps": 0}]:
+        with pytest.raises(ValueError):
+            map_to_gamut(mapped, "project", **kwargs)
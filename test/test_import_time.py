@@ -0,0 +1,68 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Import-time budget. Uses `python -X importtime` in a fresh interpreter.
+#  Time budget (in milliseconds) can be changed with
+#  SECRET_COLORS_IMPORT_BUDGET_MS environment variable (e.g. on slow CI).
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Maximum number of SecretColors modules loaded by `import SecretColors`
+MODULE_BUDGET = 3
+# Maximum total self-time (ms) of SecretColors modules
+TIME_BUDGET_MS = float(os.environ.get("SECRET_COLORS_IMPORT_BUDGET_MS", 25))
+
+
+def _import_profile(code: str) -> dict:
+    """
+    :return: Module name -> self time (microseconds) of all modules
+        imported while running `code`
+    """
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    # First run writes the bytecode cache, so that compilation is not timed
+    for _ in range(2):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                                 code], env=env, cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        if self_time.strip().isdigit():
+            modules[name.strip()] = int(self_time)
+    return modules
+
+
+def _own(modules: dict) -> dict:
+    return {k: v for k, v in modules.items()
+            if k.split(".")[0] == "SecretColors"}
+
+
+def test_import_budget():
+    modules = _own(_import_profile("import SecretColors"))
+    assert len(modules) <= MODULE_BUDGET, sorted(modules)
+    assert sum(modules.values()) / 1000 < TIME_BUDGET_MS, modules
+
+
+@pytest.mark.parametrize("code", [
+    "from SecretColors import Palette",
+    "from SecretColors import ColorWheel",
+    "from SecretColors.cmaps import BrewerMap",
+])
+def test_data_loaded_lazily(code):
+    modules = _import_profile(code)
+    assert "numpy" not in modules and "matplotlib" not in modules
+    data = [x for x in modules if x.startswith("SecretColors.data.") and
+            x.count(".") > 2]
+    assert data in [[], ["SecretColors.data.cmaps.packed"]], data
+    assert "SecretColors.data.rgb_xyz" not in modules
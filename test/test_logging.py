@@ -0,0 +1,77 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests logging facade
+
+import logging
+import sys
+
+import pytest
+
+from SecretColors.helpers import logging as sc_logging
+from SecretColors.helpers.logging import Log
+from SecretColors.models.base import Color
+
+
+class _Explosive:
+    def __str__(self):
+        raise AssertionError("Message should not be formatted")
+
+    __repr__ = __str__
+
+
+def test_disabled_log_does_no_work():
+    log = Log()
+    original = sys._getframe
+
+    def _fail(*args):
+        raise AssertionError("Caller should not be searched")
+
+    sys._getframe = _fail
+    try:
+        log.info("%s", _Explosive())
+        log.debug("%s", _Explosive())
+        log.warn("%s", _Explosive())
+        Log(show_log=True, min_log_level=logging.WARNING).info(
+            "%s", _Explosive())
+        Color("red", ["#ff0000"], [50], log=log).shade(30)
+    finally:
+        sys._getframe = original
+    assert not log.is_enabled_for(logging.ERROR)
+
+
+def test_emitted_records(caplog):
+    caplog.set_level(logging.DEBUG, logger=sc_logging.LOGGER_NAME)
+    before = list(logging.getLogger(sc_logging.LOGGER_NAME).handlers)
+    for _ in range(5):
+        log = Log(show_log=True)
+        log.info("Value %d of %s", 3, "red")
+    after = logging.getLogger(sc_logging.LOGGER_NAME).handlers
+    assert len(after) - len(before) <= 1
+    records = [r for r in caplog.records if r.name == sc_logging.LOGGER_NAME]
+    assert len(records) == 5
+    assert records[0].getMessage() == "Value 3 of red"
+    assert records[0].script == "test_logging.py"
+
+    caplog.clear()
+    Log().deprecated("Old %s", "argument")
+    assert [r.getMessage() for r in caplog.records] == ["Old argument"]
+
+    with pytest.raises(KeyError) as e:
+        Log().error("Missing %s", "blue", exception=KeyError)
+    assert "Missing blue" in str(e.value)
+
+
+def test_handler_format():
+    logger = logging.getLogger(sc_logging.LOGGER_NAME)
+    Log(show_log=True).log_object
+    custom = "%(levelname)s | %(message)s"
+    Log(show_log=True, logging_format=custom).log_object
+    Log(show_log=True, logging_format=custom).log_object
+    formats = [h.formatter._fmt for h in logger.handlers
+               if isinstance(h, logging.StreamHandler)]
+    assert formats.count(custom) == 1
+    assert sc_logging.DEFAULT_FORMAT in formats
@@ -0,0 +1,69 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Memory budgets of the library objects. Budgets are about twice the
+#  measured size; raise them only if the extra memory is intended.
+#  Print the full report with `python -m SecretColors.helpers.memory`
+
+import sys
+
+import pytest
+
+from SecretColors.data.constants import ALL_PALETTES
+from SecretColors.helpers import memory
+from SecretColors.models.objects import ColorString
+
+KB = 1024
+
+PALETTE_BUDGET = 80 * KB
+OBJECT_BUDGETS = {
+    "object.Log": 512,
+    "object.ColorString": 1.5 * KB,
+    "object.ColorTuple": 1 * KB,
+    "object.BrewerMap": 2 * KB,
+}
+MODULE_BUDGET = 200 * KB
+ALL_MODULES_BUDGET = 800 * KB
+
+
+@pytest.fixture(scope="module")
+def report():
+    return memory.memory_report()
+
+
+@pytest.mark.parametrize("name", ALL_PALETTES)
+def test_palette_budget(report, name):
+    assert 0 < report[f"palette.{name}"]["bytes"] < PALETTE_BUDGET
+
+
+@pytest.mark.parametrize("name", list(OBJECT_BUDGETS))
+def test_object_budget(report, name):
+    assert report[name]["bytes"] < OBJECT_BUDGETS[name]
+
+
+def test_module_budget(report):
+    modules = {k: v["bytes"] for k, v in report.items()
+               if k.startswith("module.")}
+    assert len(modules) == len(memory.DATA_MODULES)
+    for name, size in modules.items():
+        assert 0 < size < MODULE_BUDGET, name
+    assert sum(modules.values()) < ALL_MODULES_BUDGET
+
+
+def test_measure_module_restores_original():
+    from SecretColors.data.palettes import ibm
+    memory.measure_module("SecretColors.data.palettes.ibm")
+    assert sys.modules["SecretColors.data.palettes.ibm"] is ibm
+    import SecretColors.data.palettes as palettes
+    assert palettes.ibm is ibm
+
+
+def test_measure_is_per_object():
+    single = memory.measure(lambda: ColorString("#fb4b53"))
+    many = memory.measure(lambda: ColorString("#fb4b53"), count=500)
+    assert many["bytes"] == pytest.approx(single["bytes"], rel=0.5)
+    assert "palette.ibm" in memory.format_report(
+        memory.memory_report(palettes=["ibm"], modules=[]))
@@ -0,0 +1,149 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests metrics registry
+
+import json
+import threading
+
+import pytest
+
+from SecretColors import metrics
+from SecretColors.cmaps import BrewerMap
+from SecretColors.models.base import Color
+from SecretColors.models.palette import Palette
+
+
+@pytest.fixture
+def enabled():
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_by_default():
+    metrics.reset()
+    assert not metrics.is_enabled()
+    metrics.incr("test.counter")
+    metrics.observe("test.histogram", 0.1)
+    with metrics.timer("test.timer"):
+        pass
+    data = metrics.snapshot()
+    assert data["counters"] == {}
+    assert data["histograms"] == {}
+
+
+def test_counters_and_histograms(enabled):
+    metrics.incr("test.counter")
+    metrics.incr("test.counter", 4)
+    metrics.set_buckets("test.size", (1, 10, 100))
+    for v in [0.5, 5, 50, 500]:
+        metrics.observe("test.size", v)
+    with metrics.timer("test.timer"):
+        pass
+
+    data = metrics.snapshot()
+    assert data["counters"]["test.counter"] == 5
+    hist = data["histograms"]["test.size"]
+    assert hist["buckets"] == [1, 10, 100]
+    assert hist["counts"] == [1, 1, 1, 1]
+    assert hist["count"] == 4
+    assert hist["sum"] == pytest.approx(555.5)
+    assert data["histograms"]["test.timer"]["count"] == 1
+
+    with pytest.raises(ValueError):
+        metrics.set_buckets("test.size", (10, 1))
+
+    metrics.reset()
+    assert metrics.snapshot()["counters"] == {}
+
+
+def test_threads_are_merged(enabled):
+    def _work():
+        for _ in range(1000):
+            metrics.incr("test.threads")
+
+    threads = [threading.Thread(target=_work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert metrics.snapshot()["counters"]["test.threads"] == 4000
+
+
+def test_finished_threads_are_retired(enabled):
+    def _work():
+        metrics.incr("test.retired")
+        metrics.observe("test.retired_seconds", 0.5)
+
+    before = len(metrics._shards)
+    for _ in range(50):
+        t = threading.Thread(target=_work)
+        t.start()
+        t.join()
+    assert len(metrics._shards) <= before + 1
+    data = metrics.snapshot()
+    assert data["counters"]["test.retired"] == 50
+    assert data["histograms"]["test.retired_seconds"]["count"] == 50
+
+
+def test_reset_keeps_thread_shards(enabled):
+    started, resumed = threading.Event(), threading.Event()
+
+    def _work():
+        metrics.incr("test.reset")
+        started.set()
+        resumed.wait()
+        metrics.incr("test.reset")
+
+    t = threading.Thread(target=_work)
+    t.start()
+    started.wait()
+    metrics.reset()
+    resumed.set()
+    t.join()
+    # Increment after the reset is recorded in the same (cleared) shard
+    assert metrics.snapshot()["counters"]["test.reset"] == 1
+
+
+def test_instrumented_paths(enabled):
+    c = Color("test", ["#ffffff", "#000000"], [10, 20])
+    c.shade(10)
+    c.shade(15)
+    counters = metrics.snapshot()["counters"]
+    assert counters["color.shade.exact"] == 1
+    assert counters["color.shade.interpolated"] == 1
+    assert counters["convert.hex_to_rgb"] > 0
+
+    Palette().get("amber")  # Not in IBM palette
+    assert metrics.snapshot()["counters"]["palette.additional_colors"] == 1
+
+    BrewerMap.clear_cache()
+    BrewerMap().spectral()
+    BrewerMap().spectral()
+    data = metrics.snapshot()
+    assert data["counters"]["cmap.created"] == 1
+    assert data["histograms"]["cmap.create_seconds"]["count"] == 1
+    assert data["caches"]["cmap.cache"]["misses"] == 1
+    assert data["caches"]["cmap.cache"]["hits"] == 1
+
+
+def test_exports(enabled):
+    metrics.incr("test.counter", 2)
+    metrics.observe("test.latency", 2e-6)
+    data = json.loads(metrics.to_json())
+    assert data["counters"]["test.counter"] == 2
+
+    text = metrics.to_prometheus()
+    assert "# TYPE secretcolors_test_counter_total counter" in text
+    assert "secretcolors_test_counter_total 2" in text
+    assert 'secretcolors_test_latency_bucket{le="1e-06"} 0' in text
+    assert 'secretcolors_test_latency_bucket{le="5e-06"} 1' in text
+    assert 'secretcolors_test_latency_bucket{le="+Inf"} 1' in text
+    assert "secretcolors_test_latency_count 1" in text
+    assert "secretcolors_cmap_cache_hits" in text
@@ -0,0 +1,87 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests color mixing and blend modes
+
+import pytest
+
+from SecretColors.mixing import mix, blend, ALL_BLEND_MODES, ALL_MIX_SPACES
+from SecretColors.models.objects import ColorString
+from SecretColors.utils import color_in_between, hex_to_rgb
+
+
+def test_mix_basics():
+    assert mix(["#ff0000", "#0000ff"]) == pytest.approx((0.5, 0, 0.5))
+    assert mix(["#ff0000", "#0000ff"], [3, 1]) == pytest.approx(
+        (0.75, 0, 0.25))
+    assert mix([(0.2, 0.4, 0.6)]) == pytest.approx((0.2, 0.4, 0.6))
+    # Mixing in linear light is brighter than plain average
+    assert mix(["#ff0000", "#00ff00"], space="linear")[0] > 0.7
+    white, black = "#ffffff", "#000000"
+    for space in ALL_MIX_SPACES:
+        assert mix([white, white], space=space) == pytest.approx((1, 1, 1),
+                                                                 abs=1e-6)
+        assert mix([black, black], space=space) == pytest.approx((0, 0, 0),
+                                                                 abs=1e-6)
+
+
+@pytest.mark.parametrize("colors, weights, space", [
+    ([], None, "rgb"),
+    (["#fff", "#000"], [1], "rgb"),
+    (["#fff", "#000"], [-1, 2], "rgb"),
+    (["#fff", "#000"], [0, 0], "rgb"),
+    (["#fff", "#000"], None, "lab2"),
+])
+def test_mix_errors(colors, weights, space):
+    with pytest.raises(ValueError):
+        mix(colors, weights, space=space)
+
+
+def test_blend_modes():
+    base, top = (1, 0.5, 0), (0.5, 0.5, 0.5)
+    assert blend(base, top) == pytest.approx((0.5, 0.25, 0))
+    assert blend(base, top, "screen") == pytest.approx((1, 0.75, 0.5))
+    assert blend(base, top, "overlay") == pytest.approx((1, 0.5, 0))
+    assert blend(base, top, "darken") == pytest.approx((0.5, 0.5, 0))
+    assert blend(base, top, "lighten") == pytest.approx((1, 0.5, 0.5))
+    assert blend(base, top, opacity=0) == pytest.approx(base)
+    with pytest.raises(ValueError):
+        blend(base, top, "dodge")
+
+
+def test_color_addition():
+    c = ColorString("#fb4b53")
+    expected = hex_to_rgb(color_in_between("#fb4b53", "#408bfc")[0])
+    for other in ["#408bfc", ColorString("#408bfc"), hex_to_rgb("#408bfc")]:
+        assert hex_to_rgb(c + other) == pytest.approx(expected, abs=1 / 255)
+    # Same rounding as before (color_in_between)
+    assert c + "#408bfc" == "#9e6ba8"
+    assert c + "#408bfc" == color_in_between("#fb4b53", "#408bfc")[0]
+    with pytest.raises(TypeError):
+        c + 4
+
+
+def test_vectorized_mixing():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(7)
+    first = rng.random((50, 3))
+    second = rng.random((50, 3))
+    for space in ALL_MIX_SPACES:
+        mixed = mix(np.stack([first, second]), [1, 2], space=space)
+        assert mixed.shape == (50, 3)
+        for i in [0, 17, 49]:
+            expected = mix([tuple(first[i]), tuple(second[i])], [1, 2],
+                           space=space)
+            assert tuple(mixed[i]) == pytest.approx(expected, abs=1e-9)
+    with pytest.raises(ValueError):
+        mix(np.empty((0, 3)))
+
+    for mode in ALL_BLEND_MODES:
+        blended = blend(first, second, mode, opacity=0.7)
+        assert blended.shape == (50, 3)
+        expected = blend(tuple(first[3]), tuple(second[3]), mode,
+                         opacity=0.7)
+        assert tuple(blended[3]) == pytest.approx(expected)
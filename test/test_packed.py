@@ -0,0 +1,78 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests packed color representations
+
+import pytest
+
+from SecretColors.models.objects import ColorInt, ColorString, ColorTuple
+from SecretColors.models.packed import ColorIntArray
+
+
+def test_color_int():
+    c = ColorInt.from_hex("#fb4b53")
+    assert c == 0xfb4b53ff
+    assert repr(c) == "ColorInt(0xfb4b53ff)"
+    assert c.hex == "#fb4b53"
+    assert c.hexa == "#fb4b53ff"
+    assert c.rgb255 == (251, 75, 83)
+    assert c.alpha == 1
+    assert ColorInt.from_hex("#FFF") == ColorInt.from_hex("ffffff")
+    assert hash(ColorInt.from_hex("#FFF")) == hash(ColorInt(0xffffffff))
+    assert ColorInt.from_hex("#ff000080").alpha == pytest.approx(0.5,
+                                                                abs=0.01)
+    assert ColorInt.from_rgb(*c.rgb) == c
+    assert ColorString("#fb4b53").to_int() == c
+    assert ColorTuple((0, 0, 0, 0)).to_int() == 0
+    assert ColorInt.from_output(c.to_output()) == c
+    assert c.to_output() == "#fb4b53"
+
+
+@pytest.mark.parametrize("func, value", [
+    (ColorInt, -1),
+    (ColorInt, 0x1FFFFFFFF),
+    (ColorInt.from_hex, "#fffffg"),
+    (ColorInt.from_hex, "#ff"),
+    (ColorInt.from_hex, "0xffff"),
+    (ColorInt.from_hex, "+fffff"),
+    (ColorInt.from_hex, "ff_fff"),
+    (ColorInt.from_hex, "-fffff"),
+    (ColorInt.from_hex, "#ff ff"),
+])
+def test_color_int_errors(func, value):
+    with pytest.raises(ValueError):
+        func(value)
+
+
+def test_color_int_array():
+    ca = ColorIntArray(["#fff", "#FFFFFF", "#fb4b53", (0, 0, 0)])
+    assert len(ca) == 4
+    assert ca.nbytes == 16
+    assert "ffffff" in ca
+    assert "#123456" not in ca
+    assert ca.unique().hex == ["#ffffff", "#fb4b53", "#000000"]
+    assert ca.sorted().hex == ["#000000", "#fb4b53", "#ffffff", "#ffffff"]
+    assert ca.sorted(reverse=True)[0] == 0xffffffff
+    assert isinstance(ca[1], ColorInt)
+    assert ca[1:3].hex == ["#ffffff", "#fb4b53"]
+    ca.append(ColorInt(0x000000ff))
+    assert len(ca.unique()) == 3
+    with pytest.raises(TypeError):
+        ca.append([1, 2])
+
+
+def test_numpy_interop():
+    np = pytest.importorskip("numpy")
+    hexes = ["#%06x" % x for x in range(0, 0xffffff, 9973)]
+    ca = ColorIntArray.from_hex(hexes + hexes)
+    assert ca.hex == hexes + hexes
+    view = ca.to_numpy()
+    assert view.dtype == np.uint32
+    assert view.dtype.itemsize == ca._data.itemsize
+    assert np.shares_memory(view, np.frombuffer(ca._data, dtype=view.dtype))
+    assert ca.unique().hex == hexes
+    assert ca.unique() == ColorIntArray(hexes)
+    assert ColorIntArray.from_numpy(np.array([[255, 0, 0]])).hex == ["#ff0000"]
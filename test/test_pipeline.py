@@ -0,0 +1,74 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests recorded ColorWheel pipelines
+
+import pickle
+import random
+
+import pytest
+
+from SecretColors.models.objects import ColorWheel
+from SecretColors.models.pipeline import WheelPipeline
+from SecretColors.utils import hex_to_rgb
+
+steps = [("rotate_hue", 30), ("make_darker", 20), ("rotate_hue", -75),
+         ("make_lighter", 15), ("rotate_saturation", 40),
+         ("make_darker", 5), ("rotate_lightness", 10), ("rotate_hue", 400)]
+
+
+def _recipe():
+    recipe = ColorWheel.pipeline()
+    for name, value in steps:
+        getattr(recipe, name)(value)
+    return recipe
+
+
+def test_folding():
+    recipe = _recipe()
+    assert len(recipe) == len(steps)
+    # All hue rotations become one, darker/lighter chain becomes one
+    assert len(recipe.compiled) == 4
+    assert recipe.compiled[0] == ("rotate", 0, 355)
+    assert WheelPipeline().compiled == []
+
+
+def test_same_as_color_wheel():
+    recipe = _recipe()
+    for _ in range(200):
+        base = "#%06x" % random.randrange(1 << 24)
+        wheel = ColorWheel(base)
+        for name, value in steps:
+            getattr(wheel, name)(value)
+        assert hex_to_rgb(recipe.apply_color(base)) == pytest.approx(
+            hex_to_rgb(wheel.color), abs=1.01 / 255)
+        other = ColorWheel(base)
+        other.apply(recipe)
+        assert other.color == recipe.apply_color(base)
+
+
+def test_serialization():
+    recipe = _recipe()
+    assert WheelPipeline.from_json(recipe.to_json()) == recipe
+    assert pickle.loads(pickle.dumps(recipe)) == recipe
+    with pytest.raises(ValueError):
+        WheelPipeline.from_dict({"version": 99, "operations": []})
+    with pytest.raises(ValueError):
+        WheelPipeline([("spin", 2)])
+    with pytest.raises(TypeError):
+        WheelPipeline().rotate_hue("20")
+
+
+def test_vectorized_apply():
+    pytest.importorskip("numpy")
+    recipe = _recipe()
+    bases = ["#%06x" % random.randrange(1 << 24) for _ in range(500)]
+    result = recipe.apply(bases, as_hex=True)
+    assert result == [recipe.apply_color(x) for x in bases]
+    assert recipe.apply(bases).shape == (500, 4)
+    batch = ColorWheel.batch(bases)
+    batch.apply(recipe)
+    assert batch.color.hex == result
@@ -0,0 +1,176 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests local palette service
+
+import asyncio
+import json
+
+from SecretColors import metrics
+from SecretColors.models.palette import Palette
+from SecretColors.serve import PaletteService, convert, load
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def _result(response):
+    return json.loads(response[2])["result"]
+
+
+def test_endpoints():
+    async def main():
+        service = PaletteService()
+        get = await service.handle("GET", "/palette/ibm/get?color=red")
+        assert _result(get) == Palette("ibm").get("red")
+        cycle = await service.handle("GET",
+                                     "/palette/ibm/cycle?no_of_colors=4")
+        assert len(_result(cycle)) == 4
+        lut = await service.handle("GET",
+                                   "/cmap/brewer/Spectral?no_of_colors=5")
+        assert _result(lut) == ["#d7191c", "#fdae61", "#ffffbf", "#abdda4",
+                                "#2b83ba"]
+        missing = await service.handle("GET", "/palette/unknown/get?color=red")
+        assert missing[0] == 404 and "ETag" not in missing[1]
+        bad = await service.handle("GET", "/palette/ibm/get")
+        assert bad[0] == 400
+        assert (await service.handle("DELETE", "/palettes"))[0] == 405
+
+    _run(main())
+
+
+def test_etag_and_cache():
+    async def main():
+        service = PaletteService()
+        target = "/palette/ibm/random?no_of_colors=3&seed=10"
+        status, headers, body = await service.handle("GET", target)
+        assert status == 200
+        again = await service.handle("GET", target)
+        assert again[2] == body
+        assert service.cache.stats()["hits"] == 1
+        not_modified = await service.handle(
+            "GET", target, headers={"if-none-match": headers["ETag"]})
+        assert not_modified[0] == 304 and not_modified[2] == b""
+        # Random colors without seed are never cached
+        unseeded = await service.handle("GET", "/palette/ibm/random")
+        assert "ETag" not in unseeded[1]
+        assert len(service.cache) == 1
+
+    _run(main())
+
+
+def test_coalescing():
+    async def main():
+        service = PaletteService()
+        target = "/cmap/tableau/Tableau?no_of_colors=32"
+        responses = await asyncio.gather(
+            *[service.handle("GET", target) for _ in range(10)])
+        assert len({r[2] for r in responses}) == 1
+        assert not service._inflight
+
+    metrics.reset()
+    metrics.enable()
+    try:
+        _run(main())
+        counters = metrics.snapshot()["counters"]
+        assert counters["serve.requests"] == 10
+        assert counters["serve.coalesced"] == 9
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+
+def test_convert():
+    assert convert("hex", "rgb255", ["#ff0000"]) == [[255, 0, 0]]
+    assert convert("hsl", "hex", [[0, 0, 1]]) == ["#ffffff"]
+
+    async def main():
+        for workers in [0, 1]:
+            service = PaletteService(workers=workers, offload_threshold=2)
+            body = json.dumps({"from": "hex", "to": "rgb",
+                               "values": ["#ffffff", "#000000"]}).encode()
+            response = await service.handle("POST", "/convert", body)
+            assert _result(response) == [[1, 1, 1], [0, 0, 0]]
+            await service.close()
+        service = PaletteService()
+        bad = await service.handle("POST", "/convert", b"[]")
+        assert bad[0] == 400
+        body = json.dumps({"from": "hex", "to": "unknown",
+                           "values": ["#ffffff"]}).encode()
+        assert (await service.handle("POST", "/convert", body))[0] == 400
+
+    _run(main())
+
+
+def test_http_and_load():
+    async def main():
+        service = PaletteService()
+        await service.start(port=0)
+        try:
+            result = await load(["/palettes", "/palette/ibm/get?color=blue",
+                                 "/palette/unknown/get?color=blue"],
+                                port=service.port, requests=30,
+                                concurrency=3)
+        finally:
+            await service.close()
+        return result
+
+    result = _run(main())
+    assert result["requests"] == 30
+    assert result["errors"] == 10
+    assert result["p99"] >= result["p50"] > 0
+
+
+def test_rejected_arguments():
+    async def main():
+        service = PaletteService()
+        for target in ["/palette/ibm/get?color=red&as_array=true",
+                       "/palette/ibm/random?print_colors=true",
+                       "/palette/ibm/cycle?no_of_colors=1000000000",
+                       "/palette/ibm/random?no_of_colors=0",
+                       "/cmap/brewer/Spectral?no_of_colors=1000000000"]:
+            status, _, body = await service.handle("GET", target)
+            assert status == 400, target
+            assert "error" in json.loads(body)
+        avoid = await service.handle(
+            "GET", "/palette/ibm/random?no_of_colors=5&avoid=red,blue")
+        assert avoid[0] == 200
+
+        async def _unserializable(*args):
+            return object(), True
+
+        service._compute = _unserializable
+        status, _, body = await service.handle("GET", "/palettes")
+        assert status == 500 and "error" in json.loads(body)
+
+    _run(main())
+
+
+def test_malformed_http():
+    async def _send(port, raw):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        status = (await reader.readline()).split()[1]
+        writer.close()
+        return int(status)
+
+    async def main():
+        service = PaletteService()
+        await service.start(port=0)
+        try:
+            bad_length = await _send(
+                service.port, b"POST /convert HTTP/1.1\r\n"
+                              b"Content-Length: abc\r\n\r\n")
+            bad_line = await _send(service.port, b"GARBAGE\r\n\r\n")
+            good = await _send(service.port,
+                               b"GET /palettes HTTP/1.1\r\n\r\n")
+        finally:
+            await service.close()
+        return bad_length, bad_line, good
+
+    assert _run(main()) == (400, 400, 200)
@@ -0,0 +1,87 @@
+#  Copyright (c) SecretBiology  2020.
+#
+#  Library Name: SecretColors
+#  Author: Rohit Suratekar
+#  Website: https://github.com/secretBiology/SecretColors
+#
+#  Tests opt-in tracing of the named color and colormap methods
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from SecretColors.cmaps import BrewerMap
+from SecretColors.helpers import tracing
+from SecretColors.models.palette import Palette
+
+
+@pytest.fixture
+def traced():
+    tracing.reset()
+    tracing.enable()
+    yield
+    tracing.disable()
+    tracing.reset()
+
+
+def test_no_wrapper_by_default():
+    assert not tracing.is_enabled()
+    assert not hasattr(Palette.red, "__wrapped__")
+    assert not hasattr(BrewerMap.spectral, "__wrapped__")
+    assert "red" in Palette.red.__doc__
+    assert "Spectral" in BrewerMap.spectral.__doc__
+
+
+def test_enable_and_disable(traced):
+    assert hasattr(Palette.red, "__wrapped__")
+    p = Palette()
+    p.red()
+    p.red(shade=20)
+    p.red(no_of_colors=3)
+    BrewerMap().spectral(no_of_colors=5)
+
+    data = tracing.stats()
+    red = data["Palette.red"]
+    assert red["calls"] == 3
+    assert red["shapes"] == {"": 1, "shade=int": 1, "no_of_colors=int": 1}
+    assert red["cumulative_time"] >= red["self_time"] > 0
+    assert data["BrewerMap.spectral"]["calls"] == 1
+
+    tracing.disable()
+    assert not hasattr(Palette.red, "__wrapped__")
+    p.red()
+    assert tracing.stats()["Palette.red"]["calls"] == 3
+
+
+def test_exports(traced, tmp_path):
+    Palette().blue()
+    ps = tracing.to_pstats()
+    assert ps.total_calls == 1
+    path = str(tmp_path / "trace.prof")
+    tracing.dump_stats(path)
+    import pstats
+    assert pstats.Stats(path).total_calls == 1
+
+    trace = tracing.to_chrome_trace()
+    event = trace["traceEvents"][0]
+    assert event["name"] == "Palette.blue"
+    assert event["ph"] == "X"
+    assert event["dur"] > 0
+    path = str(tmp_path / "trace.json")
+    tracing.write_chrome_trace(path)
+    with open(path) as f:
+        assert len(json.load(f)["traceEvents"]) == 1
+
+
+def test_environment_variable():
+    code = ("from SecretColors.models.palette import Palette;"
+            "from SecretColors.helpers import tracing;"
+            "Palette().red();"
+            "print(tracing.stats()['Palette.red']['calls'])")
+    env = dict(os.environ, SECRET_COLORS_TRACE="1")
+    out = subprocess.run([sys.executable, "-c", code], env=env,
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "1"
@@ -7,6 +7,7 @@
 #  Tests the utility classes
 
 from SecretColors.utils import *
+import math
 import random
 
 import pytest
@@ -51,3 +52,79 @@ def test_rgb_conversions():
         # x2_xyz = rgb_to_xyz(*x_rgb)
         # assert x2_xyz == pytest.approx(x_xyz, abs=0.01)
         # assert x_rgb == pytest.approx((r, g, b), abs=0.01)
+
+
+def test_gamma_and_oklab():
+    for _ in range(200):
+        v = random.random()
+        assert apply_gamma_transform(apply_linear_transform(v)) == \
+               pytest.approx(v, abs=1e-9)
+    # Reference values from https://bottosson.github.io/posts/oklab/
+    assert rgb_to_oklab(1, 0, 0) == pytest.approx(
+        (0.627955, 0.224863, 0.125846), abs=1e-5)
+    assert rgb_to_oklab(1, 1, 1) == pytest.approx((1, 0, 0), abs=1e-5)
+    for _ in range(200):
+        rgb = (random.random(), random.random(), random.random())
+        assert oklab_to_rgb(*rgb_to_oklab(*rgb)) == pytest.approx(rgb,
+                                                                  abs=1e-5)
+
+
+# sRGB (D65) -> CIELAB, CIE-LCh(ab) and OKLCh reference values
+# (http://www.brucelindbloom.com and https://bottosson.github.io/posts/oklab/)
+PERCEPTUAL_REFERENCE = [
+    ((1, 1, 1), (100, 0, 0), (1, 0)),
+    ((0, 0, 0), (0, 0, 0), (0, 0)),
+    ((1, 0, 0), (53.2408, 80.0925, 67.2032), (0.627955, 0.257683)),
+    ((0, 1, 0), (87.7347, -86.1827, 83.1793), (0.866440, 0.294827)),
+    ((0, 0, 1), (32.2970, 79.1875, -107.8602), (0.452014, 0.313214)),
+]
+
+
+def test_lab_and_lch():
+    for rgb, lab, oklch in PERCEPTUAL_REFERENCE:
+        assert rgb_to_lab(*rgb) == pytest.approx(lab, abs=1e-3)
+        l, c, h = rgb_to_lch(*rgb)
+        assert (l, c) == pytest.approx(
+            (lab[0], math.hypot(lab[1], lab[2])), abs=1e-3)
+        assert rgb_to_oklch(*rgb)[:2] == pytest.approx(oklch, abs=1e-5)
+    assert rgb_to_lch(1, 0, 0)[2] == pytest.approx(39.999, abs=1e-3)
+    assert rgb_to_oklch(1, 0, 0)[2] == pytest.approx(29.2339, abs=1e-3)
+    # Neutral colors have a = b = 0 in every white reference
+    assert rgb_to_lab(0.5, 0.5, 0.5, reference="D50")[1:] == pytest.approx(
+        (0, 0), abs=1e-4)
+
+    for _ in range(200):
+        rgb = (random.random(), random.random(), random.random())
+        assert lab_to_rgb(*rgb_to_lab(*rgb)) == pytest.approx(rgb, abs=1e-5)
+        assert lch_to_rgb(*rgb_to_lch(*rgb, reference="D50"),
+                          reference="D50") == pytest.approx(rgb, abs=1e-5)
+        assert oklch_to_rgb(*rgb_to_oklch(*rgb)) == pytest.approx(rgb,
+                                                                  abs=1e-5)
+        xyz = lab_to_xyz(*rgb_to_lab(*rgb))
+        assert xyz_to_lab(*xyz) == pytest.approx(rgb_to_lab(*rgb))
+
+
+def test_vectorized_lab_and_lch():
+    np = pytest.importorskip("numpy")
+    from SecretColors.helpers import vectorized as vc
+    rgb = np.random.default_rng(0).random((500, 3))
+    for func in ["rgb_to_lab", "rgb_to_lch", "rgb_to_oklch"]:
+        expected = [globals()[func](*x) for x in rgb]
+        assert getattr(vc, func)(rgb) == pytest.approx(np.array(expected),
+                                                       abs=1e-9)
+    assert vc.lab_to_rgb(vc.rgb_to_lab(rgb, "D50"), "D50") == pytest.approx(
+        rgb, abs=1e-5)
+    assert vc.lch_to_rgb(vc.rgb_to_lch(rgb)) == pytest.approx(rgb, abs=1e-5)
+    assert vc.oklch_to_rgb(vc.rgb_to_oklch(rgb)) == pytest.approx(rgb,
+                                                                  abs=1e-5)
+    image = rgb.reshape(10, 50, 3)
+    assert vc.rgb_to_lab(image).shape == (10, 50, 3)
+    for rgb, lab, _ in PERCEPTUAL_REFERENCE:
+        assert vc.rgb_to_lab(rgb) == pytest.approx(np.array(lab), abs=1e-3)
+    # White references which are not available for sRGB
+    xyz = image.reshape(-1, 3)[:20]
+    for reference in ["E", "C"]:
+        expected = [xyz_to_lab(*x, reference=reference) for x in xyz]
+        lab = vc.xyz_to_lab(xyz, reference)
+        assert lab == pytest.approx(np.array(expected), abs=1e-9)
+        assert vc.lab_to_xyz(lab, reference) == pytest.approx(xyz, abs=1e-9)